@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+"""
+Batch Slither audits for many (chain, address) pairs.
+Each job runs in its own worker process, at most one per core, with a
+wall-clock timeout and an address-space limit. A job runs Slither's built-in
+detectors plus santara_plugin's and writes
+results/<chain>/<address>/analysis.json in the ``slither --json`` format, so
+/api/audit serves it as is. Compilations are kept as crytic-compile zips and
+reused by later runs, and solc versions installed by solc-select are shared
+by every worker. results/index.json summarizes every job and is rewritten as
+each job finishes.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import time
+import traceback
+from datetime import datetime
+from multiprocessing.connection import wait
+
+from audit_store import STORE_PATH, AuditStore, analysis_fingerprint, resolve
+from crawl_checkpoint import write_json_atomic
+
+try:  # POSIX only; without them jobs run without memory limits or install locking
+    import fcntl
+    import resource
+except ImportError:
+    fcntl = resource = None
+
+RESULTS_DIR = "../results"  # Served by /api/audit
+ARTIFACTS_DIR = "../crytic-export/audit-batch"  # Reused compilations, <chain>/<address>.zip
+SUMMARY_FILE = "index.json"  # Batch summary inside RESULTS_DIR
+PLUGIN_PATH = "../santara_plugin"  # Imported from the checkout when the plugin is not installed
+JOB_TIMEOUT = 300  # Seconds per job, like /api/audit
+JOB_MEMORY_MB = 4096  # Address-space limit per worker (0 = unlimited)
+DEFAULT_CHAIN = "base"
+CHAIN_TARGETS = {"base": "base", "ethereum": "mainnet"}  # App chain name -> crytic-compile network
+
+ADDRESS_PATTERN = re.compile(r'^0x[0-9a-fA-F]{40}$')
+
+
+def parse_target(text, default_chain=DEFAULT_CHAIN):
+    """
+    Parse "chain:address", "chain,address", "chain address" or a bare address.
+
+    Args:
+        text (str): One target
+        default_chain (str): Chain used for bare addresses
+
+    Returns:
+        tuple: (chain, address)
+
+    Raises:
+        ValueError: If the chain is unsupported or the address malformed
+    """
+    parts = [part for part in re.split(r'[\s,:]+', text.strip()) if part]
+    chain, address = (default_chain, parts[0]) if len(parts) == 1 else (parts[0].lower(), parts[-1])
+    if chain not in CHAIN_TARGETS:
+        raise ValueError(f"unsupported chain '{chain}' in '{text.strip()}' (expected one of {', '.join(CHAIN_TARGETS)})")
+    if not ADDRESS_PATTERN.match(address):
+        raise ValueError(f"invalid address '{address}'")
+    return chain, address
+
+
+def analysis_path(results_dir, chain, address):
+    return os.path.join(results_dir, chain, address, "analysis.json")
+
+
+def detector_classes():
+    """
+    Slither's detectors plus santara_plugin's, without duplicates.
+
+    Installed plugins are picked up through their entry points; the plugin in
+    this checkout is added when it is not installed.
+    """
+    from slither.__main__ import get_detectors_and_printers
+
+    detectors, _ = get_detectors_and_printers()
+    try:
+        from santara_plugin import make_plugin
+    except ImportError:
+        sys.path.insert(0, os.path.abspath(PLUGIN_PATH))
+        from santara_plugin import make_plugin
+    detectors += make_plugin()[0]
+    return list({detector.ARGUMENT: detector for detector in detectors}.values())
+
+
+def _serialize_solc_installs(lock_path):
+    """
+    crytic-compile installs a missing solc version through solc-select in
+    whichever job needs it first. Two workers installing the same version
+    would overwrite each other's download, so installs take a file lock and
+    re-check what is already installed.
+    """
+    from crytic_compile.compiler import compiler
+
+    install_artifacts = compiler.install_artifacts
+
+    def locked_install(versions):
+        os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+        with open(lock_path, 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            missing = [version for version in versions if version not in compiler.installed_versions()]
+            return install_artifacts(missing) if missing else True
+
+    compiler.install_artifacts = locked_install
+
+
+def run_job(chain, address, options, conn):
+    """
+    Worker process body: compile (or reload) one contract, run the detectors
+    and write its analysis.json. Reports a status dict through ``conn``.
+    """
+    status = {"status": "error"}
+    store = None
+    try:
+        if resource and options["memory_mb"]:
+            limit = options["memory_mb"] * 1024 * 1024
+            resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+        if fcntl:
+            _serialize_solc_installs(os.path.join(options["artifacts_dir"], "solc-install.lock"))
+
+        output = analysis_path(options["results_dir"], chain, address)
+        key = None
+        if options["store"]:
+            # Clones and cross-chain deployments of an already audited contract are served from the store
+            store = AuditStore(options["store"])
+            try:
+                key, source_key = resolve(store, chain, address, options["fingerprint"], options["api_key"])
+            except Exception as e:  # Etherscan trouble only costs the store lookup; compiling will report it
+                status["store_error"] = f"{type(e).__name__}: {e}"
+            analysis = store.get(key, address) if key else None
+            if analysis is not None:
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                write_json_atomic(output, analysis)
+                status.update({"status": "stored", "findings": len(analysis["results"].get("detectors", [])),
+                               "path": output})
+                return
+
+        from crytic_compile import compile_all
+        from crytic_compile.utils.zip import save_to_zip
+        from slither import Slither
+
+        artifact = os.path.join(options["artifacts_dir"], chain, f"{address.lower()}.zip")
+        status["reused_compilation"] = os.path.exists(artifact)
+        start = time.perf_counter()
+        if status["reused_compilation"]:
+            compilations = compile_all(artifact)
+        else:
+            compilations = compile_all(f"{CHAIN_TARGETS[chain]}:{address}",
+                                       etherscan_api_key=options["api_key"],
+                                       export_dir=options["artifacts_dir"])
+            os.makedirs(os.path.dirname(artifact), exist_ok=True)
+            save_to_zip(compilations, f"{artifact}.tmp")
+            os.replace(f"{artifact}.tmp", artifact)
+        status["compile_seconds"] = round(time.perf_counter() - start, 2)
+
+        start = time.perf_counter()
+        findings = []
+        detectors = detector_classes()
+        for compilation in compilations:
+            slither = Slither(compilation)
+            for detector in detectors:
+                slither.register_detector(detector)
+            findings.extend(result for results in slither.run_detectors() if results for result in results)
+        status["analysis_seconds"] = round(time.perf_counter() - start, 2)
+
+        # Same document as ``slither --json``: detectors are only listed when something was found
+        analysis = {"success": True, "error": None, "results": {"detectors": findings} if findings else {}}
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        write_json_atomic(output, analysis)
+        if key:
+            store.put(key, source_key, options["fingerprint"], chain, address, analysis)
+
+        impacts = {}
+        for finding in findings:
+            impacts[finding.get("impact", "Unknown")] = impacts.get(finding.get("impact", "Unknown"), 0) + 1
+        status.update({"status": "ok", "findings": len(findings), "impacts": impacts, "path": output})
+    except MemoryError:
+        status["error"] = f"memory limit of {options['memory_mb']} MB exceeded"
+    except BaseException as e:  # Anything Slither or crytic-compile raises is a failed job, not a failed batch
+        status["error"] = f"{type(e).__name__}: {e}"
+        status["traceback"] = traceback.format_exc(limit=5)
+    finally:
+        if store:
+            store.close()
+        conn.send(status)
+        conn.close()
+
+
+class AuditBatch:
+    """
+    Runs audit jobs in a bounded set of worker processes and keeps
+    results/index.json up to date as they finish.
+    """
+
+    def __init__(self, results_dir=RESULTS_DIR, artifacts_dir=ARTIFACTS_DIR, workers=None,
+                 timeout=JOB_TIMEOUT, memory_mb=JOB_MEMORY_MB, api_key=None, force=False, store=STORE_PATH):
+        """
+        Args:
+            results_dir (str): Root of the results/<chain>/<address> tree
+            artifacts_dir (str): Folder for reusable compilations and etherscan sources
+            workers (int): Concurrent jobs (default: CPU count)
+            timeout (float): Seconds before a job is killed
+            memory_mb (int): Address-space limit per job in MB (0 = unlimited)
+            api_key (str): Etherscan API key (default: ETHERSCAN_API_KEY)
+            force (bool): Re-analyze addresses that already have an analysis.json
+            store (str): Result store database shared across addresses (None = disabled)
+        """
+        self.results_dir = results_dir
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.force = force
+        self.options = {"results_dir": results_dir, "artifacts_dir": artifacts_dir, "memory_mb": memory_mb,
+                        "api_key": api_key or os.environ.get("ETHERSCAN_API_KEY"), "store": store}
+        self.summary_path = os.path.join(results_dir, SUMMARY_FILE)
+        self.summary = self._load_summary()
+        self.counts = {"ok": 0, "stored": 0, "cached": 0, "error": 0, "timeout": 0, "crashed": 0}
+        # Forked workers inherit the already imported modules instead of re-importing Slither
+        methods = multiprocessing.get_all_start_methods()
+        self.context = multiprocessing.get_context("fork" if "fork" in methods else None)
+
+    def _load_summary(self):
+        try:
+            with open(self.summary_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {"jobs": {}}
+
+    def _record(self, chain, address, status):
+        status.pop("traceback", None)
+        status["finished_at"] = datetime.now().isoformat(timespec='seconds')
+        self.summary["jobs"][f"{chain}/{address}"] = status
+        self.summary["updated_at"] = status["finished_at"]
+        self.summary["counts"] = {}
+        for job in self.summary["jobs"].values():
+            self.summary["counts"][job["status"]] = self.summary["counts"].get(job["status"], 0) + 1
+        os.makedirs(self.results_dir, exist_ok=True)
+        write_json_atomic(self.summary_path, self.summary)
+        self.counts[status["status"]] = self.counts.get(status["status"], 0) + 1
+        detail = f"{status.get('findings', 0)} finding(s)" if status["status"] in ("ok", "stored", "cached") \
+            else status.get("error", "")
+        print(f"[{sum(self.counts.values())}/{self.total}] {status['status']:8} {chain}:{address} "
+              f"{status.get('seconds', 0):7.1f}s  {detail}", flush=True)
+
+    def run(self, targets):
+        """
+        Audit every (chain, address) target.
+
+        Args:
+            targets (list): (chain, address) tuples; duplicates are audited once
+
+        Returns:
+            dict: Job counts by status
+        """
+        pending = list(dict.fromkeys(targets))
+        self.total = len(pending)
+        # Import Slither and the plugin once, before forking, and fail early if they are missing
+        self.options["fingerprint"] = analysis_fingerprint(detector_classes())
+        running = {}  # sentinel -> (process, conn, chain, address, start)
+        while pending or running:
+            while pending and len(running) < self.workers:
+                chain, address = pending.pop(0)
+                if not self.force and os.path.exists(analysis_path(self.results_dir, chain, address)):
+                    previous = self.summary["jobs"].get(f"{chain}/{address}", {})
+                    self._record(chain, address, {"status": "cached", "findings": previous.get("findings", 0),
+                                                  "path": analysis_path(self.results_dir, chain, address)})
+                    continue
+                receiver, sender = self.context.Pipe(duplex=False)
+                process = self.context.Process(target=run_job, args=(chain, address, self.options, sender),
+                                               daemon=True)
+                process.start()
+                sender.close()
+                running[process.sentinel] = (process, receiver, chain, address, time.monotonic())
+            if not running:
+                continue
+
+            now = time.monotonic()
+            next_deadline = min(start + self.timeout for _, _, _, _, start in running.values())
+            ready = wait(list(running), timeout=max(0.0, next_deadline - now))
+            now = time.monotonic()
+            for sentinel in list(running):
+                process, receiver, chain, address, start = running[sentinel]
+                if sentinel in ready:
+                    process.join()
+                    status = receiver.recv() if receiver.poll() else {
+                        "status": "crashed", "error": f"worker exited with code {process.exitcode}"}
+                elif now - start >= self.timeout:
+                    process.kill()
+                    process.join()
+                    status = {"status": "timeout", "error": f"killed after {self.timeout:.0f}s"}
+                else:
+                    continue
+                receiver.close()
+                del running[sentinel]
+                status["seconds"] = round(now - start, 2)
+                self._record(chain, address, status)
+        return self.counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run Slither with santara_plugin on many contracts in parallel.')
+    parser.add_argument('targets', nargs='*', help='chain:address pairs (bare addresses use --chain)')
+    parser.add_argument('-f', '--file', help='File with one target per line ("chain:address", "chain,address" or address)')
+    parser.add_argument('--chain', default=DEFAULT_CHAIN, choices=sorted(CHAIN_TARGETS),
+                        help=f'Chain for bare addresses (default: {DEFAULT_CHAIN})')
+    parser.add_argument('-j', '--workers', type=int, default=os.cpu_count() or 1,
+                        help='Concurrent jobs (default: CPU count)')
+    parser.add_argument('--timeout', type=float, default=JOB_TIMEOUT, help=f'Seconds per job (default: {JOB_TIMEOUT})')
+    parser.add_argument('--memory', type=int, default=JOB_MEMORY_MB,
+                        help=f'Memory limit per job in MB, 0 for none (default: {JOB_MEMORY_MB})')
+    parser.add_argument('--results', default=RESULTS_DIR, help=f'Results folder (default: {RESULTS_DIR})')
+    parser.add_argument('--artifacts', default=ARTIFACTS_DIR,
+                        help=f'Folder for reusable compilations (default: {ARTIFACTS_DIR})')
+    parser.add_argument('--force', action='store_true', help='Re-analyze addresses that already have results')
+    parser.add_argument('--store', default=STORE_PATH, help=f'Result store shared by identical contracts (default: {STORE_PATH})')
+    parser.add_argument('--no-store', action='store_true', help='Neither read nor fill the result store')
+    args = parser.parse_args()
+
+    lines = list(args.targets)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            lines += [line for line in f if line.strip() and not line.lstrip().startswith('#')]
+    targets = []
+    for line in lines:
+        try:
+            targets.append(parse_target(line, args.chain))
+        except ValueError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+    if not targets:
+        parser.error('no targets given')
+    if not os.environ.get("ETHERSCAN_API_KEY"):
+        print("Warning: ETHERSCAN_API_KEY is not set; uncached contracts may hit etherscan rate limits", file=sys.stderr)
+
+    start = time.perf_counter()
+    batch = AuditBatch(args.results, args.artifacts, args.workers, args.timeout, args.memory, force=args.force,
+                       store=None if args.no_store else args.store)
+    counts = batch.run(targets)
+    print(f"\nAudited {len(set(targets))} contract(s) in {time.perf_counter() - start:.1f}s: "
+          + ", ".join(f"{count} {status}" for status, count in counts.items() if count))
+    print(f"Summary: {batch.summary_path}")
+    sys.exit(1 if counts["error"] + counts["timeout"] + counts["crashed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store for Slither audit results.
+Results are keyed by a hash of the contract's normalized verified sources and
+compiler settings, combined with a fingerprint of the analysis (Slither and
+crytic-compile versions, the detector set and the santara_plugin version and
+sources). Byte-identical clones, including the same sources deployed on Base
+and mainnet, share one entry. Any change to the plugin or the detector set
+produces new keys, so stale results are never served. An address index maps
+chain/address to its source key, so known addresses are served without
+contacting etherscan.
+"""
+
+import argparse
+import hashlib
+import importlib.metadata
+import json
+import os
+import re
+import sqlite3
+import sys
+import zlib
+
+import requests
+
+STORE_PATH = "../results/audit_store.db"  # Next to the results/<chain>/<address> tree
+ETHERSCAN_API = os.environ.get("ETHERSCAN_API_BASE", "https://api.etherscan.io/v2/api")  # Overridable for local stubs
+CHAIN_IDS = {"base": 8453, "ethereum": 1}  # App chain name -> etherscan chain id
+REQUEST_TIMEOUT = (5, 30)  # Connect/read seconds for source lookups
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    key TEXT PRIMARY KEY,
+    source_key TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    chain TEXT NOT NULL,  -- Address the analysis was produced for
+    address TEXT NOT NULL,
+    findings INTEGER,
+    analysis BLOB NOT NULL,  -- zlib-compressed analysis.json
+    hits INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE TABLE IF NOT EXISTS addresses (
+    chain TEXT NOT NULL,
+    address TEXT NOT NULL COLLATE NOCASE,
+    source_key TEXT NOT NULL,
+    contract_name TEXT,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (chain, address)
+);
+CREATE INDEX IF NOT EXISTS idx_results_source ON results (source_key);
+CREATE INDEX IF NOT EXISTS idx_addresses_source ON addresses (source_key);
+"""
+
+
+def _digest(data):
+    return hashlib.sha256(json.dumps(data, sort_keys=True, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def normalize_sources(source_code):
+    """
+    Turn etherscan's SourceCode field into {path: text} with normalized text.
+
+    Handles a single flattened file, a {path: {content}} map and standard JSON
+    input (optionally wrapped in double braces). Line endings and trailing
+    whitespace are normalized; nothing that moves a line number is touched.
+
+    Args:
+        source_code (str): SourceCode field of a getsourcecode result
+
+    Returns:
+        tuple: ({path: normalized source}, compiler settings from standard JSON input or {})
+    """
+    text = source_code.strip()
+    try:
+        parsed = json.loads(text[1:-1] if text.startswith('{{') else text)
+    except ValueError:
+        parsed = None
+    settings = {}
+    if isinstance(parsed, dict):
+        sources = parsed.get("sources", parsed)
+        settings = {name: value for name, value in parsed.get("settings", {}).items() if name != "outputSelection"}
+        files = {path: entry.get("content", "") if isinstance(entry, dict) else str(entry)
+                 for path, entry in sources.items()}
+    else:
+        files = {"": source_code}
+    return {path: '\n'.join(line.rstrip() for line in re.split(r'\r\n|\r|\n', content)).strip('\n')
+            for path, content in files.items()}, settings
+
+
+def compute_source_key(result):
+    """
+    Hash of what determines a compilation: normalized sources, main contract
+    and compiler settings.
+
+    Args:
+        result (dict): One getsourcecode result (SourceCode, ContractName, CompilerVersion, ...)
+
+    Returns:
+        str: Hex digest shared by every address with the same verified contract
+    """
+    files, settings = normalize_sources(result.get("SourceCode", ""))
+    return _digest({
+        "sources": {path: hashlib.sha256(content.encode('utf-8')).hexdigest() for path, content in files.items()},
+        "contract": result.get("ContractName"),
+        "compiler": result.get("CompilerVersion"),
+        "optimization": result.get("OptimizationUsed"),
+        "runs": result.get("Runs"),
+        "evm_version": result.get("EVMVersion"),
+        "libraries": result.get("Library"),
+        "settings": settings,
+    })
+
+
+def _package_version(name):
+    try:
+        return importlib.metadata.version(name)
+    except importlib.metadata.PackageNotFoundError:
+        return None
+
+
+def analysis_fingerprint(detectors):
+    """
+    Identify everything about the analysis that can change its output.
+
+    The plugin's own .py files are hashed as well as its version, so editing
+    a detector in a development checkout invalidates results without a
+    version bump.
+
+    Args:
+        detectors (list): Detector classes that will run
+
+    Returns:
+        str: Hex digest
+    """
+    plugin_files = {}
+    try:
+        import santara_plugin
+        root = os.path.dirname(santara_plugin.__file__)
+        for folder, _, names in os.walk(root):
+            for name in sorted(names):
+                if name.endswith('.py'):
+                    path = os.path.join(folder, name)
+                    with open(path, 'rb') as f:
+                        plugin_files[os.path.relpath(path, root)] = hashlib.sha256(f.read()).hexdigest()
+    except ImportError:
+        pass
+    return _digest({
+        "slither": _package_version("slither-analyzer"),
+        "crytic_compile": _package_version("crytic-compile"),
+        "plugin": _package_version("santara_plugin"),
+        "plugin_files": plugin_files,
+        "detectors": sorted(detector.ARGUMENT for detector in detectors),
+    })
+
+
+def fetch_source(chain, address, api_key=None, session=None):
+    """
+    Fetch the verified source record of a contract from etherscan.
+
+    Args:
+        chain (str): App chain name ("base" or "ethereum")
+        address (str): Contract address
+        api_key (str): Etherscan API key (default: ETHERSCAN_API_KEY)
+        session (requests.Session): Optional pooled session
+
+    Returns:
+        dict: getsourcecode result, or None if the contract is not verified
+
+    Raises:
+        requests.RequestException: On network errors or an unexpected response
+    """
+    params = {"chainid": CHAIN_IDS[chain], "module": "contract", "action": "getsourcecode", "address": address,
+              "apikey": api_key or os.environ.get("ETHERSCAN_API_KEY", "")}
+    response = (session or requests).get(ETHERSCAN_API, params=params, timeout=REQUEST_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    if not isinstance(data.get("result"), list) or not data["result"]:
+        raise requests.RequestException(f"etherscan: {data.get('result') or data.get('message')}")
+    result = data["result"][0]
+    return result if result.get("SourceCode") else None
+
+
+def combine_key(source_key, fingerprint):
+    """Store key of a contract's sources under one analysis configuration."""
+    return hashlib.sha256(f"{source_key}:{fingerprint}".encode('ascii')).hexdigest()
+
+
+class AuditStore:
+    """
+    SQLite-backed result store shared by concurrent audit workers.
+    """
+
+    def __init__(self, path=STORE_PATH):
+        """
+        Args:
+            path (str): SQLite database file
+        """
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def source_key_for(self, chain, address):
+        """Source key recorded for an address, or None if it was never indexed."""
+        row = self.conn.execute("SELECT source_key FROM addresses WHERE chain = ? AND address = ?",
+                                (chain, address)).fetchone()
+        return row[0] if row else None
+
+    def index_address(self, chain, address, source_key, contract_name=None):
+        """Map an address to the source key of its verified contract."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO addresses (chain, address, source_key, contract_name) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (chain, address) DO UPDATE SET source_key = excluded.source_key, "
+                "contract_name = excluded.contract_name, updated_at = CURRENT_TIMESTAMP",
+                (chain, address, source_key, contract_name))
+
+    def get(self, key, address=None):
+        """
+        Stored analysis for a key.
+
+        Args:
+            key (str): Store key from combine_key
+            address (str): Address the result is served for; paths that name
+                the originally analyzed address are rewritten to it
+
+        Returns:
+            dict: analysis.json document, or None on a miss
+        """
+        row = self.conn.execute("SELECT address, analysis FROM results WHERE key = ?", (key,)).fetchone()
+        if not row:
+            return None
+        with self.conn:
+            self.conn.execute("UPDATE results SET hits = hits + 1 WHERE key = ?", (key,))
+        text = zlib.decompress(row[1]).decode('utf-8')
+        if address and address.lower() != row[0].lower():
+            text = re.sub(re.escape(row[0]), address, text, flags=re.IGNORECASE)
+        return json.loads(text)
+
+    def put(self, key, source_key, fingerprint, chain, address, analysis):
+        """Store the analysis.json document produced for one address."""
+        findings = len(analysis.get("results", {}).get("detectors", []))
+        blob = zlib.compress(json.dumps(analysis, ensure_ascii=False).encode('utf-8'), 6)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, source_key, fingerprint, chain, address, findings, analysis) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, source_key, fingerprint, chain, address, findings, blob))
+
+    def prune(self, fingerprint):
+        """Delete results produced under any other analysis fingerprint; returns the number removed."""
+        with self.conn:
+            return self.conn.execute("DELETE FROM results WHERE fingerprint != ?", (fingerprint,)).rowcount
+
+    def stats(self):
+        results, hits, size = self.conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(hits), 0), COALESCE(SUM(LENGTH(analysis)), 0) FROM results").fetchone()
+        addresses, sources = self.conn.execute(
+            "SELECT COUNT(*), COUNT(DISTINCT source_key) FROM addresses").fetchone()
+        return {"results": results, "hits": hits, "compressed_bytes": size,
+                "addresses": addresses, "distinct_sources": sources}
+
+    def close(self):
+        self.conn.close()
+
+
+def resolve(store, chain, address, fingerprint, api_key=None):
+    """
+    Find the store key for an address, fetching its verified source from
+    etherscan only when the address is not indexed yet.
+
+    Args:
+        store (AuditStore): Open store
+        chain (str): App chain name
+        address (str): Contract address
+        fingerprint (str): analysis_fingerprint of the detectors that will run
+        api_key (str): Etherscan API key
+
+    Returns:
+        tuple: (key, source_key), or (None, None) if the contract is not verified
+    """
+    source_key = store.source_key_for(chain, address)
+    if source_key is None:
+        result = fetch_source(chain, address, api_key)
+        if result is None:
+            return None, None
+        source_key = compute_source_key(result)
+        store.index_address(chain, address, source_key, result.get("ContractName"))
+    return combine_key(source_key, fingerprint), source_key
+
+
+def main():
+    from audit_batch import RESULTS_DIR, analysis_path, detector_classes, parse_target
+    from crawl_checkpoint import write_json_atomic
+
+    parser = argparse.ArgumentParser(description='Content-addressed store of Slither audit results.')
+    parser.add_argument('command', choices=['serve', 'stats', 'prune'],
+                        help='serve: write a stored analysis.json for a target; stats; prune: drop stale results')
+    parser.add_argument('target', nargs='?', help='chain:address (serve only)')
+    parser.add_argument('--store', default=STORE_PATH, help=f'Store database (default: {STORE_PATH})')
+    parser.add_argument('--results', default=RESULTS_DIR, help=f'Results folder (default: {RESULTS_DIR})')
+    args = parser.parse_args()
+
+    store = AuditStore(args.store)
+    fingerprint = analysis_fingerprint(detector_classes())
+    if args.command == 'stats':
+        print(json.dumps(store.stats(), indent=2))
+    elif args.command == 'prune':
+        print(f"Removed {store.prune(fingerprint)} stale result(s)")
+    else:
+        if not args.target:
+            parser.error('serve needs a chain:address target')
+        chain, address = parse_target(args.target)
+        key, _ = resolve(store, chain, address, fingerprint)
+        analysis = store.get(key, address) if key else None
+        if analysis is None:
+            print(f"No stored result for {chain}:{address}", file=sys.stderr)
+            sys.exit(3)
+        output = analysis_path(args.results, chain, address)
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        write_json_atomic(output, analysis)
+        print(f"Served {chain}:{address} from the store: {output}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
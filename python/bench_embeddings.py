@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark for embedding_index.py.
+Fills a temporary crawl_vectors.db with random clustered embeddings and
+compares row-by-row BLOB scoring (the current access pattern) with the
+memory-mapped matrix in exact and IVF mode, including IVF recall.
+"""
+
+import argparse
+import heapq
+import os
+import sqlite3
+import tempfile
+import time
+
+import numpy as np
+
+from crawl_ingest import SCHEMA
+from embedding_index import EmbeddingIndex, normalize
+
+DIM = 384  # Matches the stored all-MiniLM-L6-v2 embeddings
+
+
+def fill_database(conn, rows, rng, clusters=200):
+    """Insert ``rows`` clustered random embeddings, one per chunk."""
+    centers = rng.standard_normal((clusters, DIM)).astype(np.float32)
+    conn.executescript(SCHEMA)
+    with conn:
+        conn.execute("INSERT INTO documents (file_path) VALUES ('bench.md')")
+        for start in range(0, rows, 10000):
+            count = min(10000, rows - start)
+            vectors = centers[rng.integers(0, clusters, count)] + 0.5 * rng.standard_normal((count, DIM)).astype(np.float32)
+            conn.executemany("INSERT INTO chunks (id, document_id, chunk_index, content) VALUES (?, 1, ?, '')",
+                             [(start + i + 1, start + i) for i in range(count)])
+            conn.executemany("INSERT INTO embeddings (chunk_id, embedding) VALUES (?, ?)",
+                             [(start + i + 1, vectors[i].astype(np.float32).tobytes()) for i in range(count)])
+    return centers
+
+
+def row_by_row(conn, query, k):
+    """Deserialize and score every BLOB in Python, keeping a heap of the best k."""
+    query = query / np.linalg.norm(query)
+    best = []
+    for chunk_id, blob in conn.execute("SELECT chunk_id, embedding FROM embeddings"):
+        vector = np.frombuffer(blob, dtype=np.float32)
+        score = float(vector @ query / np.linalg.norm(vector))
+        if len(best) < k:
+            heapq.heappush(best, (score, chunk_id))
+        elif score > best[0][0]:
+            heapq.heapreplace(best, (score, chunk_id))
+    return [chunk_id for _, chunk_id in sorted(best, reverse=True)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark memory-mapped embedding search.')
+    parser.add_argument('--rows', type=int, default=100000, help='Embeddings in the corpus (default: 100000)')
+    parser.add_argument('--queries', type=int, default=64, help='Queries per batch (default: 64)')
+    parser.add_argument('-k', type=int, default=10, help='Results per query (default: 10)')
+    parser.add_argument('--ivf-lists', type=int, default=256, help='IVF clusters (default: 256)')
+    parser.add_argument('--probes', type=int, default=16, help='IVF lists searched per query (default: 16)')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as folder:
+        conn = sqlite3.connect(os.path.join(folder, 'bench.db'))
+        centers = fill_database(conn, args.rows, rng)
+        queries = centers[rng.integers(0, len(centers), args.queries)] + 0.5 * rng.standard_normal((args.queries, DIM)).astype(np.float32)
+
+        start = time.perf_counter()
+        row_by_row(conn, queries[0], args.k)
+        baseline = time.perf_counter() - start
+        print(f"Row-by-row:   {baseline * 1000:10.2f} ms/query")
+
+        index = EmbeddingIndex(os.path.join(folder, 'index'))
+        start = time.perf_counter()
+        index.build(conn)
+        print(f"Build:        {(time.perf_counter() - start) * 1000:10.2f} ms for {len(index)} rows")
+
+        start = time.perf_counter()
+        exact = index.search(queries, args.k)
+        elapsed = (time.perf_counter() - start) / args.queries
+        print(f"Exact matrix: {elapsed * 1000:10.2f} ms/query  ({baseline / elapsed:.0f}x)")
+
+        start = time.perf_counter()
+        index.train_ivf(args.ivf_lists)
+        print(f"IVF train:    {(time.perf_counter() - start) * 1000:10.2f} ms for {args.ivf_lists} lists")
+        start = time.perf_counter()
+        approximate = index.search(queries, args.k, args.probes)
+        elapsed = (time.perf_counter() - start) / args.queries
+        recall = np.mean([len({c for c, _ in a} & {c for c, _ in e}) / len(e) for a, e in zip(approximate, exact)])
+        print(f"IVF matrix:   {elapsed * 1000:10.2f} ms/query  ({baseline / elapsed:.0f}x, recall@{args.k} {recall:.3f})")
+
+        expected = row_by_row(conn, queries[0], args.k)
+        print(f"Exact matches row-by-row: {[c for c, _ in exact[0]] == expected}")
+
+        # Incremental append of new chunks
+        extra = normalize(rng.standard_normal((1000, DIM)))
+        with conn:
+            conn.executemany("INSERT INTO embeddings (chunk_id, embedding) VALUES (?, ?)",
+                             [(args.rows + i + 1, extra[i].tobytes()) for i in range(len(extra))])
+        start = time.perf_counter()
+        appended = index.update(conn)
+        print(f"Append:       {(time.perf_counter() - start) * 1000:10.2f} ms for {appended} rows")
+        hit = index.search(extra[0], 1)[0][0][0]
+        print(f"Appended row found: {hit == args.rows + 1}")
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the crawl frontier.
+Compares the old list-based queue (pop(0) plus a linear membership scan on
+every enqueue) against the deque-backed Frontier as the queue grows.
+"""
+
+import argparse
+import random
+import time
+
+from crawl_frontier import Frontier
+
+SIZES = [1000, 2000, 4000, 8000, 16000]  # Number of distinct URLs enqueued
+LINKS_PER_PAGE = 5  # Discovered links per dequeued page (mostly duplicates)
+LIST_SIZE_LIMIT = 16000  # Largest size the quadratic baseline is run at
+
+
+def make_links(size):
+    """Build a deterministic stream of discovered links with duplicates."""
+    rng = random.Random(size)
+    urls = [f"https://docs.example.com/page/{i}?ref={i % 7}#section" for i in range(size)]
+    stream = []
+    for i in range(size):
+        stream.append(urls[i])
+        stream.extend(rng.choice(urls) for _ in range(LINKS_PER_PAGE - 1))
+    return stream
+
+
+def bench_list(links):
+    """Enqueue and drain using the original list-based frontier."""
+    visited = set()
+    to_visit = []
+    start = time.perf_counter()
+    for link in links:
+        canonical = link.split('#', 1)[0]
+        if canonical not in visited and (canonical, 1) not in to_visit:
+            to_visit.append((canonical, 1))
+    while to_visit:
+        url, _ = to_visit.pop(0)
+        visited.add(url)
+    return time.perf_counter() - start
+
+
+def bench_frontier(links):
+    """Enqueue and drain using the deque-backed Frontier."""
+    frontier = Frontier()
+    start = time.perf_counter()
+    for link in links:
+        frontier.push(link, 1)
+    while frontier:
+        frontier.pop()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark crawl frontier implementations.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Frontier sizes to benchmark')
+    args = parser.parse_args()
+
+    print(f"{'urls':>8} {'ops':>9} {'list us/op':>12} {'frontier us/op':>15}")
+    for size in args.sizes:
+        links = make_links(size)
+        ops = len(links) + size
+        list_time = bench_list(links) if size <= LIST_SIZE_LIMIT else None
+        frontier_time = bench_frontier(links)
+        list_col = f"{list_time / ops * 1e6:12.3f}" if list_time is not None else f"{'skipped':>12}"
+        print(f"{size:>8} {ops:>9} {list_col} {frontier_time / ops * 1e6:15.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Golden-file benchmark for the HTML to Markdown converter.
+Converts a corpus of saved HTML pages with the legacy multi-pass converter
+and the single-pass converter in crawl_markdown.py, checks the outputs are
+identical and reports parse and conversion times.
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+from datetime import datetime
+
+from bs4 import BeautifulSoup
+
+from crawl_markdown import LXML_AVAILABLE, html_to_markdown, resolve_parser
+
+CRAWLED_ON = re.compile(r'^\*\*Crawled on:\*\* .*$', re.MULTILINE)
+SYNTHETIC_PAGES = 50  # Pages generated when no corpus folder is given
+
+
+def legacy_html_to_markdown(soup, url):
+    """The converter WebCrawler used before crawl_markdown (mutates ``soup``)."""
+    title = "Untitled"
+    if soup.title:
+        title = soup.title.get_text().strip()
+    elif soup.find('h1'):
+        title = soup.find('h1').get_text().strip()
+
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    markdown_content = f"# {title}\n\n"
+    markdown_content += f"**Source URL:** {url}\n"
+    markdown_content += f"**Crawled on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    markdown_content += "---\n\n"
+
+    main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile('content|main')) or soup.body
+
+    if main_content:
+        for i, heading in enumerate(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
+            for tag in main_content.find_all(heading):
+                level = '#' * (i + 1)
+                tag.replace_with(f"\n{level} {tag.get_text().strip()}\n\n")
+
+        for p in main_content.find_all('p'):
+            text = p.get_text().strip()
+            if text:
+                p.replace_with(f"{text}\n\n")
+
+        for ul in main_content.find_all(['ul', 'ol']):
+            list_items = []
+            for li in ul.find_all('li'):
+                item_text = li.get_text().strip()
+                if item_text:
+                    prefix = "- " if ul.name == 'ul' else "1. "
+                    list_items.append(f"{prefix}{item_text}")
+            if list_items:
+                ul.replace_with("\n" + "\n".join(list_items) + "\n\n")
+
+        for code in main_content.find_all('code'):
+            code_text = code.get_text()
+            if code.parent.name == 'pre':
+                code.parent.replace_with(f"\n```\n{code_text}\n```\n\n")
+            else:
+                code.replace_with(f"`{code_text}`")
+
+        for blockquote in main_content.find_all('blockquote'):
+            quote_text = blockquote.get_text().strip()
+            if quote_text:
+                blockquote.replace_with(f"\n> {quote_text}\n\n")
+
+        content_text = main_content.get_text()
+        content_text = re.sub(r'\n\s*\n\s*\n', '\n\n', content_text)
+        content_text = re.sub(r'[ \t]+', ' ', content_text)
+        markdown_content += content_text.strip()
+
+    return markdown_content
+
+
+def synthetic_page(rng, index):
+    """Build a documentation-style page exercising every converter rule."""
+    sections = []
+    for s in range(rng.randint(5, 30)):
+        items = ''.join(f"<li>Item {i} with <code>call()</code> and <a href='/x/{i}'>link</a></li>" for i in range(rng.randint(2, 8)))
+        nested = f"<ul><li>outer<ol><li>inner {s}</li></ol></li></ul>" if rng.random() < 0.3 else ""
+        sections.append(f"""
+<h{rng.randint(2, 4)} id="s{s}">Section {s} <small>v{s}</small></h{rng.randint(2, 4)}>
+<p>Paragraph {s} describing <b>reentrancy</b>, <i>tx.origin</i> and <code>selfdestruct</code>.</p>
+<ul>{items}</ul>{nested}
+<pre><code>pragma solidity ^0.8.{s};
+contract C{s} {{ function f() public {{ }} }}</code></pre>
+<blockquote><p>Note {s}: check effects before interactions.</p></blockquote>
+<!-- comment {s} --><table><tr><td>cell {s}</td></tr></table>""")
+    return f"""<!DOCTYPE html><html><head><title>Page {index}</title><style>body{{}}</style></head>
+<body><header><h1>Site</h1></header><nav><ul><li><a href="/docs/">Docs</a></li></ul></nav>
+<main><h1>Page {index}</h1>{''.join(sections)}</main>
+<footer><p>footer</p></footer><script>var x = 1;</script></body></html>"""
+
+
+def load_corpus(folder):
+    """Read every .html file in a folder, sorted by name."""
+    pages = []
+    for name in sorted(os.listdir(folder)):
+        if name.endswith(('.html', '.htm')):
+            with open(os.path.join(folder, name), 'rb') as f:
+                pages.append((name, f.read()))
+    return pages
+
+
+def run(pages, parser, rounds, update_golden, folder):
+    """Convert the corpus with both converters and report timings and mismatches."""
+    timings = {"parse": 0.0, "legacy": 0.0, "single-pass": 0.0}
+    mismatches = []
+    for _ in range(rounds):
+        for name, content in pages:
+            url = f"https://corpus.local/{name}"
+
+            start = time.perf_counter()
+            soup = BeautifulSoup(content, parser)
+            timings["parse"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            new = html_to_markdown(soup, url)
+            timings["single-pass"] += time.perf_counter() - start
+
+            start = time.perf_counter()
+            old = legacy_html_to_markdown(soup, url)
+            timings["legacy"] += time.perf_counter() - start
+
+            golden_path = os.path.join(folder, f"{name}.golden.md") if folder else None
+            if golden_path and update_golden:
+                with open(golden_path, 'w', encoding='utf-8') as f:
+                    f.write(CRAWLED_ON.sub('', old))
+            if golden_path and os.path.exists(golden_path):
+                with open(golden_path, 'r', encoding='utf-8') as f:
+                    old = f.read()
+            if CRAWLED_ON.sub('', new) != CRAWLED_ON.sub('', old):
+                mismatches.append(name)
+    return timings, sorted(set(mismatches))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Golden-file benchmark for html_to_markdown.')
+    parser.add_argument('corpus', nargs='?', help='Folder of saved .html pages (default: synthetic corpus)')
+    parser.add_argument('--parser', default='html.parser', choices=['auto', 'lxml', 'html.parser'],
+                        help='BeautifulSoup backend (default: html.parser)')
+    parser.add_argument('--rounds', type=int, default=3, help='Passes over the corpus (default: 3)')
+    parser.add_argument('--update-golden', action='store_true',
+                        help='Write <page>.golden.md files next to the corpus using the legacy converter')
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = load_corpus(args.corpus)
+    else:
+        rng = random.Random(0)
+        pages = [(f"synthetic_{i}.html", synthetic_page(rng, i).encode()) for i in range(SYNTHETIC_PAGES)]
+    if not pages:
+        print("No .html pages found in corpus")
+        sys.exit(1)
+
+    backend = resolve_parser(args.parser)
+    print(f"Pages: {len(pages)}  Rounds: {args.rounds}  Parser: {backend}  (lxml installed: {LXML_AVAILABLE})")
+    timings, mismatches = run(pages, backend, args.rounds, args.update_golden, args.corpus)
+
+    for stage, seconds in timings.items():
+        print(f"{stage:>12}: {seconds * 1000 / (len(pages) * args.rounds):8.2f} ms/page")
+    print(f"     speedup: {timings['legacy'] / timings['single-pass']:8.2f}x (conversion only)")
+
+    if mismatches:
+        print(f"Output mismatch on {len(mismatches)} page(s): {', '.join(mismatches[:10])}")
+        sys.exit(1)
+    print("Output identical to legacy converter")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Query latency benchmark for crawl_search.py.
+Ingests a synthetic corpus into a temporary crawl_vectors.db, then times BM25
+top-k queries against the FTS5 index and against a linear scan of every chunk
+(the approach search.js takes with its per-file term vectors).
+"""
+
+import argparse
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import time
+
+from crawl_ingest import CrawlIngester
+from crawl_search import CrawlSearcher
+
+VOCABULARY_SIZE = 30000  # Distinct words in the synthetic corpus
+DOMAIN_TERMS = ("reentrancy overflow underflow delegatecall selfdestruct oracle price manipulation "
+                "access control owner signature replay front running gas limit randomness timestamp "
+                "storage proxy upgrade initializer approval allowance transfer ether token balance "
+                "modifier require revert assert loop array mapping event emit fallback receive").split()
+QUERIES = ["reentrancy", "oracle price manipulation", "delegatecall proxy", "signature replay",
+           "integer overflow", "front running", "unchecked transfer", "tx origin owner"]
+
+
+def build_vocabulary(rng):
+    """Word list and cumulative Zipf weights; the domain terms are spread over the frequency ranks."""
+    words = [''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(3, 10))) for _ in range(VOCABULARY_SIZE)]
+    for term in DOMAIN_TERMS:
+        words[rng.randrange(20, 2000)] = term
+    cum_weights, total = [], 0.0
+    for rank in range(VOCABULARY_SIZE):
+        total += 1.0 / (rank + 1)
+        cum_weights.append(total)
+    return words, cum_weights
+
+
+def synthetic_page(rng, index, vocabulary):
+    """Build a crawler-style markdown page with a few paragraphs of Zipf-distributed words."""
+    words, cum_weights = vocabulary
+    paragraphs = [' '.join(rng.choices(words, cum_weights=cum_weights, k=rng.randint(30, 120))) for _ in range(rng.randint(3, 12))]
+    return (f"# Weakness {index}\n\n**Source URL:** https://corpus.local/{index}\n"
+            f"**Crawled on:** 2025-01-01 00:00:00\n\n---\n\n" + '\n\n'.join(paragraphs))
+
+
+def linear_search(conn, query, k):
+    """Score every chunk by raw term frequency in Python, like a full scan of stored vectors."""
+    terms = [term.lower() for term in re.findall(r'\w+', query)]
+    scores = {}
+    for document_id, content in conn.execute("SELECT document_id, content FROM chunks"):
+        words = content.lower().split()
+        score = sum(words.count(term) for term in terms)
+        if score:
+            scores[document_id] = max(scores.get(document_id, 0), score)
+    return sorted(scores.items(), key=lambda item: -item[1])[:k]
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark BM25 search latency on a synthetic corpus.')
+    parser.add_argument('--docs', type=int, default=5000, help='Documents in the corpus (default: 5000)')
+    parser.add_argument('--rounds', type=int, default=20, help='Passes over the query set (default: 20)')
+    parser.add_argument('-k', type=int, default=5, help='Results per query (default: 5)')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    vocabulary = build_vocabulary(rng)
+    with tempfile.TemporaryDirectory() as folder:
+        db_path = os.path.join(folder, 'bench.db')
+        start = time.perf_counter()
+        ingester = CrawlIngester(db_path)
+        for i in range(args.docs):
+            ingester.add_page(f"bench/{i}.md", synthetic_page(rng, i, vocabulary))
+        ingester.close()
+        print(f"Ingested {args.docs} documents ({ingester.stats['chunks_inserted']} chunks) "
+              f"in {time.perf_counter() - start:.1f}s")
+
+        start = time.perf_counter()
+        searcher = CrawlSearcher(db_path)
+        print(f"Built index in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        latencies = []
+        for _ in range(args.rounds):
+            for query in QUERIES:
+                start = time.perf_counter()
+                searcher.search(query, args.k)
+                latencies.append(time.perf_counter() - start)
+        print(f"FTS5 BM25:   p50 {percentile(latencies, 0.5) * 1000:8.2f} ms   "
+              f"p95 {percentile(latencies, 0.95) * 1000:8.2f} ms")
+
+        conn = sqlite3.connect(db_path)
+        latencies = []
+        for query in QUERIES:
+            start = time.perf_counter()
+            linear_search(conn, query, args.k)
+            latencies.append(time.perf_counter() - start)
+        print(f"Linear scan: p50 {percentile(latencies, 0.5) * 1000:8.2f} ms   "
+              f"p95 {percentile(latencies, 0.95) * 1000:8.2f} ms")
+        conn.close()
+
+        # Incremental update: rewrite one document and check it is searchable straight away
+        ingester = CrawlIngester(db_path)
+        ingester.add_page("bench/0.md", synthetic_page(rng, 0, vocabulary) + "\n\nzeroday marker paragraph")
+        ingester.close()
+        hits = searcher.search("zeroday", 1)
+        print(f"Incremental update visible: {bool(hits) and hits[0]['file_path'] == 'bench/0.md'}")
+        searcher.close()
+
+
+if __name__ == "__main__":
+    main()
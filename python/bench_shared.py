@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Benchmark for shared-frontier crawls.
+Serves a generated documentation site from a local HTTP server, crawls it
+with 1..N ``crawler.py --workers`` processes and checks on the server side
+that every page was fetched exactly once and that requests to the host were
+never faster than the crawl delay allows. Reports pages per second for each
+worker count.
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+PAGES = 200  # Pages in the generated site
+LINKS_PER_PAGE = 5  # Links from each page to other pages
+SERVER_LATENCY = 0.05  # Seconds the server takes per response
+WORKER_COUNTS = [1, 2, 4]  # Worker processes per run
+CRAWLER = os.path.join(os.path.dirname(os.path.abspath(__file__)), "crawler.py")
+
+
+def build_site(folder, pages):
+    """Write ``pages`` linked HTML pages below ``folder``/docs/."""
+    docs = os.path.join(folder, "docs")
+    os.makedirs(docs)
+    with open(os.path.join(folder, "index.html"), 'w') as f:
+        f.write('<html><body><a href="/docs/p0.html">docs</a></body></html>')
+    for i in range(pages):
+        links = "".join(f'<li><a href="/docs/p{(i * LINKS_PER_PAGE + k) % pages}.html">page</a></li>'
+                        for k in range(1, LINKS_PER_PAGE + 1))
+        with open(os.path.join(docs, f"p{i}.html"), 'w') as f:
+            f.write(f"<html><head><title>Page {i}</title></head><body><h1>Page {i}</h1>"
+                    f"<p>Text of page {i}. {'Lorem ipsum dolor sit amet. ' * (i % 7 + 1)}</p>"
+                    f"<ul>{links}</ul></body></html>")
+
+
+def start_server(folder, latency):
+    """
+    Serve ``folder`` on a free local port, recording the arrival time of every request.
+
+    Returns:
+        tuple: (server, list of (monotonic time, path))
+    """
+    requests_seen = []
+    lock = threading.Lock()
+
+    class Handler(SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=folder, **kwargs)
+
+        def do_GET(self):
+            with lock:
+                requests_seen.append((time.monotonic(), self.path))
+            time.sleep(latency)
+            super().do_GET()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, requests_seen
+
+
+def run(workers, base_url, delay, max_pages, work_folder, requests_seen):
+    """
+    Crawl the fixture with ``workers`` processes.
+
+    Returns:
+        dict: Elapsed seconds, pages crawled, pages fetched twice and request gaps
+    """
+    requests_seen.clear()
+    output = f"bench_shared_{workers}"
+    command = [sys.executable, CRAWLER, base_url, f"{base_url}docs/", "--output", output,
+               "--workers", str(workers), "--delay", str(delay), "--max-pages", str(max_pages),
+               "--max-depth", "100", "--no-sitemaps", "--ignore-robots", "--no-events"]
+    start = time.perf_counter()
+    # crawler.py writes to ../crawl_result relative to its working directory
+    subprocess.run(command, cwd=os.path.join(work_folder, "run"), stdout=subprocess.DEVNULL, check=True)
+    elapsed = time.perf_counter() - start
+
+    summary_path = os.path.join(work_folder, "crawl_result", output, "_crawl_summary.json")
+    with open(summary_path, 'r', encoding='utf-8') as f:
+        summary = json.load(f)
+    pages = [(at, path) for at, path in requests_seen if path.startswith("/docs/")]
+    fetched = Counter(path for _, path in pages)
+    gaps = [b[0] - a[0] for a, b in zip(pages, pages[1:])]
+    return {
+        "elapsed": elapsed,
+        "pages": summary["pages_crawled"],
+        "refetched": sum(count - 1 for count in fetched.values()),
+        "min_gap": min(gaps) if gaps else 0.0,
+        "mean_gap": sum(gaps) / len(gaps) if gaps else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark shared-frontier crawls against a local fixture site.')
+    parser.add_argument('--pages', type=int, default=PAGES, help='Pages in the generated site')
+    parser.add_argument('--workers', type=int, nargs='+', default=WORKER_COUNTS, help='Worker counts to run')
+    parser.add_argument('--delay', type=float, default=0, help='Per-host delay between requests in seconds')
+    parser.add_argument('--latency', type=float, default=SERVER_LATENCY, help='Server response time in seconds')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_folder:
+        site = os.path.join(work_folder, "site")
+        build_site(site, args.pages)
+        os.makedirs(os.path.join(work_folder, "run"))
+        server, requests_seen = start_server(site, args.latency)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}/"
+        print(f"{args.pages} pages, server latency {args.latency * 1000:.0f} ms, delay {args.delay}s")
+        print(f"{'workers':>8} {'pages':>6} {'seconds':>8} {'pages/s':>8} {'refetched':>10} "
+              f"{'min gap ms':>11} {'mean gap ms':>12}")
+        try:
+            for workers in args.workers:
+                result = run(workers, base_url, args.delay, args.pages + 1, work_folder, requests_seen)
+                print(f"{workers:>8} {result['pages']:>6} {result['elapsed']:8.2f} "
+                      f"{result['pages'] / result['elapsed']:8.1f} {result['refetched']:>10} "
+                      f"{result['min_gap'] * 1000:11.1f} {result['mean_gap'] * 1000:12.1f}")
+        finally:
+            server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
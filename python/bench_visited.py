@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the crawler's visited set.
+Measures memory per URL and time per operation of a Python set of URL
+strings, the in-memory FingerprintSet, and a FingerprintSet whose table is
+capped and spills into a Bloom filter, on long documentation-style URLs.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from crawl_visited import BloomFilter, FingerprintSet
+
+SIZES = [10000, 100000, 1000000]  # Distinct URLs added
+BLOOM_MEMORY_LIMIT = 1 << 16  # In-memory fingerprints of the capped variant
+
+
+def make_url(i):
+    """A long URL with a query string, as found on explorer and docs sites."""
+    return (f"https://docs.example.com/reference/api/v2/contracts/{i:08d}/events"
+            f"?chain=ethereum&page={i % 97}&sort=timestamp&order=desc&utm_source=crawler")
+
+
+def measure(factory, size):
+    """
+    Add ``size`` URLs, then look up as many present and absent ones.
+
+    Returns:
+        tuple: (bytes per URL held, peak bytes per URL, microseconds per add,
+            microseconds per lookup, false positives)
+    """
+    urls = factory()
+    start = time.perf_counter()
+    for i in range(size):
+        urls.add(make_url(i))
+    added = time.perf_counter() - start
+    start = time.perf_counter()
+    for i in range(size):
+        make_url(i) in urls
+    false_positives = sum(make_url(i) in urls for i in range(size, 2 * size))
+    looked_up = time.perf_counter() - start
+    close(urls)
+
+    # Memory is traced in a separate run so tracing overhead does not skew the timings
+    tracemalloc.start()
+    urls = factory()
+    for i in range(size):
+        urls.add(make_url(i))
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    close(urls)
+    return current / size, peak / size, added / size * 1e6, looked_up / (2 * size) * 1e6, false_positives
+
+
+def close(urls):
+    if isinstance(urls, FingerprintSet):
+        urls.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark visited-set implementations.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES, help='Numbers of URLs to add')
+    args = parser.parse_args()
+
+    print(f"URL length: {len(make_url(0))} characters")
+    print(f"{'urls':>8} {'variant':>12} {'bytes/url':>10} {'peak':>8} {'add us':>8} {'lookup us':>10} {'false pos':>10}")
+    with tempfile.TemporaryDirectory() as folder:
+        bloom_path = os.path.join(folder, "bench.bloom")
+        for size in args.sizes:
+            variants = [
+                ("set", set),
+                ("fingerprint", FingerprintSet),
+                ("bloom", lambda: FingerprintSet(BloomFilter(bloom_path, size), memory_limit=BLOOM_MEMORY_LIMIT)),
+            ]
+            for name, factory in variants:
+                per_url, peak, add_us, lookup_us, false_positives = measure(factory, size)
+                print(f"{size:>8} {name:>12} {per_url:10.1f} {peak:8.1f} {add_us:8.2f} {lookup_us:10.2f} "
+                      f"{false_positives:>10}")
+
+
+if __name__ == "__main__":
+    main()
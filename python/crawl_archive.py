@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+Packed, compressed page archive for the web crawler.
+Instead of one markdown file per page, ``crawler.py --archive`` appends every
+page as an independently compressed record (zstd when the ``zstandard``
+package is installed, gzip otherwise) to segment files of at most
+SEGMENT_BYTES. A fixed-width index maps the 64-bit fingerprint of the
+canonical URL and the SHA-256 of the markdown to the record's segment, offset
+and length, so readers get random access to any page through mmap and can
+also stream the whole corpus sequentially. The ``export`` command writes the
+usual ``.md`` tree for tools that read markdown files.
+"""
+
+import argparse
+import gzip
+import json
+import mmap
+import os
+import struct
+import sys
+import threading
+import zlib
+from collections import namedtuple
+
+from crawl_manifest import content_hash
+from crawl_visited import url_fingerprint
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+ARCHIVE_FOLDER = "_archive"  # Archive subfolder inside the crawl output folder
+INDEX_FILE = "index.bin"  # Fixed-width index entries, appended in write order
+SEGMENT_BYTES = 64 * 1024 * 1024  # A new segment is started once the current one is this large
+ZSTD_LEVEL = 10  # zstd compression level
+GZIP_LEVEL = 6  # gzip compression level
+
+CODECS = {"none": 0, "gzip": 1, "zstd": 2}  # Codec name -> id stored in every record
+
+INDEX_MAGIC = b"CRWLIDX1"
+# url fingerprint, sha256 of the markdown, segment, offset, record length, markdown bytes
+INDEX_ENTRY = struct.Struct("<Q32sHQII")
+RECORD_MAGIC = b"CR"
+# magic, codec, url length, filename length, payload length, crc32 of the markdown
+RECORD_HEADER = struct.Struct("<2sBHHII")
+
+ArchivedPage = namedtuple("ArchivedPage", "url filename content_hash markdown")
+IndexEntry = namedtuple("IndexEntry", "fingerprint digest segment offset length size")
+
+
+class ArchiveError(Exception):
+    """A record or index entry is missing, truncated or corrupt."""
+
+
+def resolve_codec(codec):
+    """
+    Pick the compression codec for new records.
+
+    Args:
+        codec (str): "auto", "zstd" or "gzip"
+
+    Returns:
+        str: "zstd" or "gzip"
+    """
+    if codec == "auto":
+        return "zstd" if ZSTD_AVAILABLE else "gzip"
+    if codec == "zstd" and not ZSTD_AVAILABLE:
+        print("- zstandard is not installed, archiving with gzip")
+        return "gzip"
+    return codec
+
+
+def segment_name(segment):
+    return f"pages-{segment:05d}.pack"
+
+
+class PageArchive:
+    """
+    Segmented pack files plus their index.
+
+    A record is the header, the URL, the markdown filename and the compressed
+    markdown. Records are never rewritten: saving a page again appends a new
+    record, and the last index entry for a URL wins. Opening an archive for
+    writing drops index entries and segment bytes left behind by a crash, so
+    the archive always ends with a complete record.
+
+    The crawler writes from its worker threads and reads back unchanged pages
+    for ingestion at the same time, so every call holds one lock.
+    """
+
+    def __init__(self, folder, codec="auto", writable=False, segment_bytes=SEGMENT_BYTES):
+        """
+        Args:
+            folder (str): Archive folder (created when writable)
+            codec (str): Codec for new records: "auto", "zstd" or "gzip"
+            writable (bool): Open for appending pages
+            segment_bytes (int): Size at which a new segment is started
+        """
+        self.folder = folder
+        self.index_path = os.path.join(folder, INDEX_FILE)
+        self.writable = writable
+        self.segment_bytes = segment_bytes
+        self.lock = threading.Lock()
+        self.entries = []  # IndexEntry in write order
+        self.latest = {}  # url fingerprint -> position in self.entries
+        self.maps = {}  # segment -> mmap
+        self.pack = None
+        self.index = None
+        self.segment = 0
+
+        if writable:
+            os.makedirs(folder, exist_ok=True)
+            self.codec = resolve_codec(codec)
+            self.compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL) if self.codec == "zstd" else None
+        elif not os.path.exists(self.index_path):
+            raise ArchiveError(f"no archive index in {folder}")
+        self.load_index()
+        if writable:
+            self.open_for_append()
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            if f.read(len(INDEX_MAGIC)) != INDEX_MAGIC:
+                raise ArchiveError(f"{self.index_path} is not a crawl archive index")
+            data = f.read()
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        for position, fields in enumerate(INDEX_ENTRY.iter_unpack(data[:usable])):
+            entry = IndexEntry(*fields)
+            self.entries.append(entry)
+            self.latest[entry.fingerprint] = position
+
+    def open_for_append(self):
+        """Drop the tail of an interrupted write and open the last segment and the index for appending."""
+        sizes = {}
+        valid = 0
+        for entry in self.entries:
+            if entry.segment not in sizes:
+                path = os.path.join(self.folder, segment_name(entry.segment))
+                sizes[entry.segment] = os.path.getsize(path) if os.path.exists(path) else 0
+            if entry.offset + entry.length > sizes[entry.segment]:
+                break
+            valid += 1
+        if valid < len(self.entries):
+            print(f"- Archive: dropping {len(self.entries) - valid} index entries of an interrupted write")
+            del self.entries[valid:]
+            self.latest = {entry.fingerprint: position for position, entry in enumerate(self.entries)}
+
+        if self.entries:
+            last = self.entries[-1]
+            self.segment, end = last.segment, last.offset + last.length
+        else:
+            self.segment, end = 0, 0
+        path = os.path.join(self.folder, segment_name(self.segment))
+        with open(path, 'ab') as f:
+            f.truncate(end)
+        self.pack = open(path, 'ab')
+
+        with open(self.index_path, 'ab') as f:
+            f.truncate(len(INDEX_MAGIC) + valid * INDEX_ENTRY.size if valid else 0)
+        self.index = open(self.index_path, 'ab')
+        if not valid:
+            self.index.write(INDEX_MAGIC)
+
+    def compress(self, data):
+        if self.codec == "zstd":
+            return self.compressor.compress(data)
+        return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+    @staticmethod
+    def decompress(codec, payload):
+        if codec == CODECS["none"]:
+            return bytes(payload)
+        if codec == CODECS["zstd"]:
+            if not ZSTD_AVAILABLE:
+                raise ArchiveError("record is zstd-compressed but zstandard is not installed")
+            return zstandard.ZstdDecompressor().decompress(payload)
+        if codec == CODECS["gzip"]:
+            return zlib.decompress(payload, 31)
+        raise ArchiveError(f"unknown codec id {codec}")
+
+    def add(self, url, filename, markdown):
+        """
+        Append a page.
+
+        Args:
+            url (str): Canonical URL
+            filename (str): Markdown filename the page is exported under
+            markdown (str): Page markdown
+
+        Returns:
+            int: Compressed record size in bytes
+        """
+        data = markdown.encode('utf-8')
+        url_bytes = url.encode('utf-8')
+        name_bytes = filename.encode('utf-8')
+        payload, codec = self.compress(data), self.codec
+        if len(payload) >= len(data):
+            # Tiny pages do not shrink; store them as they are
+            payload, codec = data, "none"
+        header = RECORD_HEADER.pack(RECORD_MAGIC, CODECS[codec], len(url_bytes), len(name_bytes),
+                                    len(payload), zlib.crc32(data))
+        length = len(header) + len(url_bytes) + len(name_bytes) + len(payload)
+        with self.lock:
+            if self.pack.tell() and self.pack.tell() + length > self.segment_bytes:
+                self.pack.close()
+                self.segment += 1
+                self.pack = open(os.path.join(self.folder, segment_name(self.segment)), 'wb')
+            offset = self.pack.tell()
+            self.pack.write(header + url_bytes + name_bytes + payload)
+            entry = IndexEntry(url_fingerprint(url), bytes.fromhex(content_hash(data)), self.segment,
+                               offset, length, len(data))
+            self.index.write(INDEX_ENTRY.pack(*entry))
+            self.latest[entry.fingerprint] = len(self.entries)
+            self.entries.append(entry)
+        return length
+
+    def flush(self):
+        """Make appended records visible to readers; the index is flushed after the packs it points into."""
+        if not self.writable:
+            return
+        with self.lock:
+            self.pack.flush()
+            self.index.flush()
+
+    def view(self, segment, end):
+        """mmap of a segment covering at least ``end`` bytes."""
+        view = self.maps.get(segment)
+        if view is None or len(view) < end:
+            if view is not None:
+                view.close()
+            if self.writable and segment == self.segment:
+                self.pack.flush()
+            with open(os.path.join(self.folder, segment_name(segment)), 'rb') as f:
+                view = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            if len(view) < end:
+                raise ArchiveError(f"{segment_name(segment)} is truncated")
+            self.maps[segment] = view
+        return view
+
+    def read(self, entry):
+        """
+        Decode the record an index entry points to.
+
+        Returns:
+            ArchivedPage: The stored page
+
+        Raises:
+            ArchiveError: If the record is corrupt
+        """
+        view = self.view(entry.segment, entry.offset + entry.length)
+        record = memoryview(view)[entry.offset:entry.offset + entry.length]
+        try:
+            magic, codec, url_length, name_length, payload_length, crc = RECORD_HEADER.unpack_from(record)
+            if magic != RECORD_MAGIC:
+                raise ArchiveError(f"no record at {segment_name(entry.segment)}:{entry.offset}")
+            start = RECORD_HEADER.size
+            url = str(record[start:start + url_length], 'utf-8')
+            start += url_length
+            filename = str(record[start:start + name_length], 'utf-8')
+            start += name_length
+            data = self.decompress(codec, record[start:start + payload_length])
+        finally:
+            record.release()
+        if zlib.crc32(data) != crc:
+            raise ArchiveError(f"checksum mismatch for {url}")
+        return ArchivedPage(url, filename, entry.digest.hex(), data.decode('utf-8'))
+
+    def get(self, url):
+        """
+        Look up the latest version of a page.
+
+        Args:
+            url (str): Canonical URL
+
+        Returns:
+            ArchivedPage: The page, or None if it is not archived
+        """
+        with self.lock:
+            position = self.latest.get(url_fingerprint(url))
+            if position is None:
+                return None
+            page = self.read(self.entries[position])
+        # A fingerprint collision must not return another page
+        return page if page.url == url else None
+
+    def find(self, page_hash):
+        """
+        Look up a page by the SHA-256 of its markdown.
+
+        Args:
+            page_hash (str): Hex digest
+
+        Returns:
+            ArchivedPage: The most recently archived page with that content, or None
+        """
+        digest = bytes.fromhex(page_hash)
+        with self.lock:
+            for entry in reversed(self.entries):
+                if entry.digest == digest:
+                    return self.read(entry)
+        return None
+
+    def __contains__(self, url):
+        return url_fingerprint(url) in self.latest
+
+    def __len__(self):
+        return len(self.latest)
+
+    def __iter__(self):
+        return self.iter_pages()
+
+    def iter_pages(self, latest_only=True):
+        """
+        Stream the archive in storage order, one segment after another.
+
+        Args:
+            latest_only (bool): Skip records superseded by a later save of the same URL
+
+        Yields:
+            ArchivedPage: Archived pages
+        """
+        for position, entry in enumerate(list(self.entries)):
+            if latest_only and self.latest.get(entry.fingerprint) != position:
+                continue
+            with self.lock:
+                page = self.read(entry)
+            yield page
+
+    def export(self, output_folder):
+        """
+        Write the latest version of every page as ``<output_folder>/<filename>``.
+
+        Args:
+            output_folder (str): Folder for the markdown files
+
+        Returns:
+            int: Files written
+        """
+        os.makedirs(output_folder, exist_ok=True)
+        written = 0
+        for page in self.iter_pages():
+            with open(os.path.join(output_folder, page.filename), 'w', encoding='utf-8') as f:
+                f.write(page.markdown)
+            written += 1
+        return written
+
+    def stats(self):
+        """
+        Sizes for _crawl_summary.json.
+
+        Returns:
+            dict: Page, record and segment counts, bytes stored and the compression ratio
+        """
+        with self.lock:
+            live = [self.entries[position] for position in self.latest.values()]
+            stored = sum(entry.length for entry in self.entries)
+            raw = sum(entry.size for entry in live)
+            live_stored = sum(entry.length for entry in live)
+            return {
+                "folder": self.folder,
+                "codec": self.codec if self.writable else None,
+                "pages": len(live),
+                "records": len(self.entries),
+                "segments": self.entries[-1].segment + 1 if self.entries else 0,
+                "markdown_bytes": raw,
+                "stored_bytes": stored,
+                "compression_ratio": round(raw / live_stored, 2) if live_stored else None,
+            }
+
+    def close(self):
+        with self.lock:
+            for view in self.maps.values():
+                view.close()
+            self.maps = {}
+            if self.pack:
+                self.pack.close()
+                self.index.close()
+                self.pack = self.index = None
+
+
+def archive_folder(path):
+    """Accept either a crawl output folder or its archive subfolder."""
+    nested = os.path.join(path, ARCHIVE_FOLDER)
+    return nested if os.path.exists(os.path.join(nested, INDEX_FILE)) else path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Read crawl archives written by crawler.py --archive.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    export = commands.add_parser('export', help='Write the archived pages as a folder of .md files')
+    export.add_argument('folder', help='Crawl output folder, e.g. ../crawl_result/swc')
+    export.add_argument('--to', help='Destination folder (default: the crawl output folder itself)')
+    stats = commands.add_parser('stats', help='Print page counts and compression ratio')
+    stats.add_argument('folder', help='Crawl output folder')
+    show = commands.add_parser('get', help='Print the markdown of one page')
+    show.add_argument('folder', help='Crawl output folder')
+    show.add_argument('url', help='Canonical page URL')
+    args = parser.parse_args()
+
+    try:
+        archive = PageArchive(archive_folder(args.folder))
+    except ArchiveError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    try:
+        if args.command == 'export':
+            destination = args.to or args.folder
+            print(f"Exported {archive.export(destination)} pages to {destination}")
+        elif args.command == 'stats':
+            print(json.dumps(archive.stats(), indent=2))
+        else:
+            page = archive.get(args.url)
+            if page is None:
+                print(f"Error: {args.url} is not archived")
+                sys.exit(1)
+            print(page.markdown)
+    finally:
+        archive.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Crawl checkpoints for resuming interrupted or time-limited crawls.
+Persists the frontier, counters and the position in the visited-URL log of a
+WebCrawler to a JSON file in its output folder using atomic replace-on-write.
+"""
+
+import json
+import os
+from datetime import datetime
+
+CHECKPOINT_FILE = "_crawl_checkpoint.json"  # Checkpoint filename inside the output folder
+CHECKPOINT_VERSION = 2
+LEGACY_VERSIONS = (1,)  # Older formats load() still accepts (v1 listed the visited URLs inline)
+
+
+def write_json_atomic(path, data):
+    """
+    Write JSON so readers only ever see the old or the new file, never a partial one.
+
+    Args:
+        path (str): Destination file
+        data: JSON-serializable object
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class CrawlCheckpoint:
+    def __init__(self, output_folder, base_url, url_filter_pattern):
+        """
+        Args:
+            output_folder (str): Folder the crawler writes markdown files to
+            base_url (str): Start URL of the crawl the checkpoint belongs to
+            url_filter_pattern (str): Filter pattern of the crawl
+        """
+        self.path = os.path.join(output_folder, CHECKPOINT_FILE)
+        self.base_url = base_url
+        self.url_filter_pattern = url_filter_pattern
+
+    def save(self, pending, visited_log, pages_crawled):
+        """
+        Persist crawl state.
+
+        Args:
+            pending (list): (url, depth) pairs still to crawl, including in-flight pages
+            visited_log (dict): URL log offset and counts from VisitedStore.checkpoint
+            pages_crawled (int): Total pages crawled so far
+        """
+        data = {
+            "version": CHECKPOINT_VERSION,
+            "saved": datetime.now().isoformat(),
+            "base_url": self.base_url,
+            "filter_pattern": self.url_filter_pattern,
+            "pages_crawled": pages_crawled,
+            "pending": [[url, depth] for url, depth in pending],
+            "visited_log": visited_log,
+        }
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            print(f"- Error saving crawl checkpoint: {e}")
+
+    def load(self):
+        """
+        Read the checkpoint if it exists and belongs to this crawl.
+
+        Returns:
+            dict: Checkpoint data, or None if there is nothing to resume
+        """
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"- Ignoring unreadable crawl checkpoint: {e}")
+            return None
+        if data.get("version") != CHECKPOINT_VERSION and data.get("version") not in LEGACY_VERSIONS:
+            return None
+        if data.get("base_url") != self.base_url or data.get("filter_pattern") != self.url_filter_pattern:
+            print("- Ignoring crawl checkpoint from a different base URL or filter pattern")
+            return None
+        return data
+
+    def clear(self):
+        """Remove the checkpoint once the crawl has finished."""
+        if os.path.exists(self.path):
+            os.remove(self.path)
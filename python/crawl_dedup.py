@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Exact and near-duplicate page detection for the web crawler.
+Exact duplicates share a body hash; near duplicates (templated pages,
+pagination, tracking parameters) have 64-bit SimHash fingerprints within a
+small Hamming distance, found through a banded lookup table.
+"""
+
+import hashlib
+import re
+from collections import Counter
+
+from crawl_ingest import split_markdown
+
+SIMHASH_BITS = 64
+SHINGLE_SIZE = 3  # Words per shingle
+NEAR_DUPLICATE_DISTANCE = 3  # Max differing fingerprint bits for a near duplicate
+MIN_SHINGLES = 20  # Shorter pages are only checked for exact duplicates
+BANDS = 4  # Fingerprint bands; must exceed NEAR_DUPLICATE_DISTANCE for lookups to be exact
+
+WORD_PATTERN = re.compile(r'\w+')
+
+
+def simhash(markdown_content):
+    """
+    Fingerprint the body of a converted page.
+
+    The header block (title, source URL, crawl time) is ignored so the same
+    content served under two URLs gets the same fingerprint.
+
+    Args:
+        markdown_content (str): Markdown produced by html_to_markdown
+
+    Returns:
+        int: 64-bit SimHash, or None if the page is too short to compare
+    """
+    words = WORD_PATTERN.findall(split_markdown(markdown_content)["body"].lower())
+    shingles = Counter(' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+    if sum(shingles.values()) < MIN_SHINGLES:
+        return None
+    hashes = [(int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big'), weight)
+              for shingle, weight in shingles.items()]
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        mask = 1 << bit
+        if sum(weight if value & mask else -weight for value, weight in hashes) > 0:
+            fingerprint |= mask
+    return fingerprint
+
+
+class DuplicateDetector:
+    """
+    Registry of the pages kept in a crawl, keyed by content hash and SimHash.
+
+    By the pigeonhole principle two fingerprints within
+    NEAR_DUPLICATE_DISTANCE bits agree exactly on at least one of BANDS
+    bands, so only pages sharing a band value are compared.
+    """
+
+    def __init__(self, max_distance=NEAR_DUPLICATE_DISTANCE):
+        """
+        Args:
+            max_distance (int): Max differing bits for a near duplicate (0 = exact fingerprints only)
+        """
+        self.max_distance = max_distance
+        self.by_hash = {}  # content hash -> url
+        self.pages = {}  # url -> (content hash, fingerprint)
+        self.bands = [{} for _ in range(BANDS)]  # band value -> set of urls
+        self.band_bits = SIMHASH_BITS // BANDS
+
+    def _band_values(self, fingerprint):
+        mask = (1 << self.band_bits) - 1
+        return [(fingerprint >> (band * self.band_bits)) & mask for band in range(BANDS)]
+
+    def find_exact(self, url, page_hash):
+        """Return another kept URL with the same body hash, or None."""
+        original = self.by_hash.get(page_hash)
+        return original if original != url else None
+
+    def find_near(self, url, fingerprint):
+        """Return another kept URL whose fingerprint is within max_distance bits, or None."""
+        if fingerprint is None:
+            return None
+        for band, value in enumerate(self._band_values(fingerprint)):
+            for candidate in self.bands[band].get(value, ()):
+                if candidate == url:
+                    continue
+                if bin(self.pages[candidate][1] ^ fingerprint).count('1') <= self.max_distance:
+                    return candidate
+        return None
+
+    def add(self, url, page_hash, fingerprint=None):
+        """Register a kept page, replacing what was stored for it before."""
+        self.remove(url)
+        self.pages[url] = (page_hash, fingerprint)
+        self.by_hash.setdefault(page_hash, url)
+        if fingerprint is not None:
+            for band, value in enumerate(self._band_values(fingerprint)):
+                self.bands[band].setdefault(value, set()).add(url)
+
+    def remove(self, url):
+        """Forget a page (e.g. because it changed into a duplicate)."""
+        old = self.pages.pop(url, None)
+        if not old:
+            return
+        page_hash, fingerprint = old
+        if self.by_hash.get(page_hash) == url:
+            del self.by_hash[page_hash]
+        if fingerprint is not None:
+            for band, value in enumerate(self._band_values(fingerprint)):
+                self.bands[band].get(value, set()).discard(url)
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+robots.txt and sitemap discovery for the web crawler.
+Parses robots.txt per RFC 9309 (longest match wins, ``*`` and ``$``
+wildcards, Crawl-delay, Sitemap lines) and streams sitemaps and sitemap
+indexes with iterparse, so a sitemap of any size is read in constant memory
+and its URLs can seed the frontier directly.
+"""
+
+import gzip
+import re
+from collections import deque
+from urllib.parse import urljoin, urlparse
+from xml.etree import ElementTree
+
+import requests
+
+ROBOTS_AGENT = "santara-crawler"  # Product token matched against robots.txt User-agent lines
+MAX_SITEMAPS = 100  # Sitemap files (including nested index entries) read per crawl
+MAX_ROBOTS_BYTES = 500 * 1024  # robots.txt content beyond this is ignored (RFC 9309 allows 500 KiB)
+
+
+class RobotsPolicy:
+    """
+    The robots.txt rules that apply to one origin.
+
+    Rules come from the group naming ROBOTS_AGENT, or the ``*`` group when
+    there is none. The longest matching pattern decides, and Allow wins a tie.
+    """
+
+    def __init__(self, text="", agent=ROBOTS_AGENT, disallow_all=False):
+        """
+        Args:
+            text (str): robots.txt content ("" = everything allowed)
+            agent (str): Product token of this crawler
+            disallow_all (bool): Block every path, for an unreachable robots.txt
+        """
+        self.rules = [(False, self.compile('/'), 1)] if disallow_all else []  # (allow, pattern, length)
+        self.crawl_delay = 0
+        self.sitemaps = []
+        self.parse(text, agent.lower())
+
+    def parse(self, text, agent):
+        groups = []  # {"agents", "rules", "crawl_delay"}
+        group = None
+        in_agents = False  # Consecutive User-agent lines share one group
+        for line in text.splitlines():
+            line = line.split('#', 1)[0].strip()
+            if ':' not in line:
+                continue
+            field, value = (part.strip() for part in line.split(':', 1))
+            field = field.lower()
+            if field == 'sitemap':
+                if value:
+                    self.sitemaps.append(value)
+            elif field == 'user-agent':
+                if not in_agents:
+                    group = {"agents": [], "rules": [], "crawl_delay": 0}
+                    groups.append(group)
+                    in_agents = True
+                group["agents"].append(value.lower())
+                continue
+            elif group is None:
+                continue
+            elif field in ('allow', 'disallow'):
+                if value:
+                    group["rules"].append((field == 'allow', self.compile(value), len(value)))
+            elif field == 'crawl-delay':
+                try:
+                    group["crawl_delay"] = float(value)
+                except ValueError:
+                    pass
+            in_agents = False
+
+        # Groups for the exact product token win over the * group
+        matching = [group for group in groups if agent in group["agents"]] or \
+            [group for group in groups if '*' in group["agents"]]
+        for group in matching:
+            self.rules.extend(group["rules"])
+            self.crawl_delay = max(self.crawl_delay, group["crawl_delay"])
+
+    @staticmethod
+    def compile(pattern):
+        """Turn a robots.txt path pattern into a regex anchored at the start of the path."""
+        anchored = pattern.endswith('$')
+        body = re.escape(pattern.rstrip('$')).replace(r'\*', '.*')
+        return re.compile(body + ('$' if anchored else ''))
+
+    def allowed(self, url):
+        """
+        Check whether the rules allow fetching a URL.
+
+        Args:
+            url (str): Absolute URL on this policy's origin
+
+        Returns:
+            bool: True unless the longest matching rule is a Disallow
+        """
+        parsed = urlparse(url)
+        path = (parsed.path or '/') + (f"?{parsed.query}" if parsed.query else '')
+        if path == '/robots.txt':
+            return True
+        best = None
+        for allow, pattern, length in self.rules:
+            if pattern.match(path) and (best is None or length > best[1] or (length == best[1] and allow)):
+                best = (allow, length)
+        return best is None or best[0]
+
+
+def robots_origin(url):
+    """Scheme and host a URL's robots.txt belongs to."""
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}"
+
+
+def fetch_robots(session, origin, timeout):
+    """
+    Download and parse an origin's robots.txt.
+
+    A missing file (4xx) allows everything. A server error or an unreachable
+    host disallows everything, as RFC 9309 requires.
+
+    Args:
+        session (requests.Session): Session to fetch with
+        origin (str): ``scheme://host``
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        RobotsPolicy: Rules for the origin
+    """
+    url = f"{origin}/robots.txt"
+    try:
+        response = session.get(url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"- robots.txt unreachable ({e}); not crawling {origin}")
+        return RobotsPolicy(disallow_all=True)
+    if response.status_code >= 500:
+        print(f"- robots.txt returned {response.status_code}; not crawling {origin}")
+        return RobotsPolicy(disallow_all=True)
+    if response.status_code >= 400:
+        return RobotsPolicy()
+    return RobotsPolicy(response.content[:MAX_ROBOTS_BYTES].decode('utf-8', errors='replace'))
+
+
+def iter_sitemap(session, url, timeout):
+    """
+    Stream the entries of one sitemap or sitemap index.
+
+    The body is parsed while it downloads and every finished entry is cleared
+    from the tree, so memory does not grow with the sitemap. ``.gz`` sitemaps
+    are decompressed on the fly.
+
+    Args:
+        session (requests.Session): Session to fetch with
+        url (str): Sitemap URL
+        timeout (float): Request timeout in seconds
+
+    Yields:
+        tuple: (kind, loc, lastmod) where kind is "url" for a page and
+            "sitemap" for a nested sitemap; lastmod may be None
+    """
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        stream = response.raw
+        if urlparse(url).path.endswith('.gz') and 'gzip' not in response.headers.get('Content-Encoding', ''):
+            stream = gzip.GzipFile(fileobj=stream)
+        root = None
+        for event, element in ElementTree.iterparse(stream, events=('start', 'end')):
+            if root is None:
+                root = element
+            if event != 'end':
+                continue
+            kind = element.tag.rsplit('}', 1)[-1]
+            if kind not in ('url', 'sitemap'):
+                continue
+            fields = {child.tag.rsplit('}', 1)[-1]: (child.text or '').strip() for child in element}
+            if fields.get('loc'):
+                yield kind, urljoin(url, fields['loc']), fields.get('lastmod') or None
+            root.clear()
+
+
+def sitemap_pages(session, sitemaps, timeout, max_sitemaps=MAX_SITEMAPS):
+    """
+    Walk sitemaps and sitemap indexes breadth-first.
+
+    Args:
+        session (requests.Session): Session to fetch with
+        sitemaps (list): Sitemap URLs to start from
+        timeout (float): Request timeout in seconds
+        max_sitemaps (int): Stop after reading this many sitemap files
+
+    Yields:
+        tuple: (page URL, lastmod or None)
+    """
+    queue = deque(sitemaps)
+    seen = set(sitemaps)
+    read = 0
+    while queue and read < max_sitemaps:
+        url = queue.popleft()
+        read += 1
+        try:
+            for kind, loc, lastmod in iter_sitemap(session, url, timeout):
+                if kind == 'url':
+                    yield loc, lastmod
+                elif loc not in seen:
+                    seen.add(loc)
+                    queue.append(loc)
+        except (requests.RequestException, ElementTree.ParseError, OSError, EOFError) as e:
+            print(f"- Skipping sitemap {url}: {e}")
+    if queue:
+        print(f"- Sitemap limit reached, {len(queue)} sitemap(s) not read (MAX_SITEMAPS = {max_sitemaps})")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Bounded page downloads for the web crawler.
+Responses are requested with ``stream=True`` and checked before the body is
+read: non-HTML Content-Types and oversized Content-Lengths are rejected after
+the headers. The body is then read in chunks and decompressed here with a
+per-call output limit, so neither the byte cap nor a decompression bomb can
+make a page cost more than MAX_PAGE_BYTES (plus one chunk) of bandwidth and
+memory. Bodies
+without a usable Content-Type are fed to an incremental HTML parser and
+dropped as soon as they turn out not to be markup.
+"""
+
+import zlib
+from html.parser import HTMLParser
+
+import requests
+import urllib3
+
+MAX_PAGE_BYTES = 5 * 1024 * 1024  # Decoded body size a page may have; larger pages are aborted
+FETCH_CHUNK_SIZE = 64 * 1024  # Bytes read from the socket per step
+MAX_COMPRESSION_RATIO = 100  # Decoded/wire ratio above which a compressed body is treated as a bomb
+RATIO_CHECK_BYTES = 1024 * 1024  # Decoded bytes before the compression ratio is enforced
+SNIFF_BYTES = 4096  # Bytes fed to the markup sniffer for pages without an HTML Content-Type
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")  # Content-Types parsed as pages
+SNIFFED_CONTENT_TYPES = ("", "application/octet-stream", "text/plain")  # Content-Types checked by sniffing
+BODY_STATUSES = range(200, 300)  # Responses whose body is read (error pages and 304s are not)
+
+
+class PageSkipped(requests.RequestException):
+    """A response was abandoned because of its type, size or compression ratio."""
+
+    def __init__(self, reason, message):
+        """
+        Args:
+            reason (str): Short reason used as a metrics counter, e.g. "content_type"
+            message (str): Human-readable explanation
+        """
+        super().__init__(message)
+        self.reason = reason
+
+
+class MarkupSniffer(HTMLParser):
+    """Incremental parser that tells whether the start of a body is HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.tags = 0
+        self.fed = 0
+        self.binary = False
+
+    def feed_bytes(self, data):
+        self.fed += len(data)
+        if b'\x00' in data:
+            self.binary = True
+            return
+        self.feed(data.decode('utf-8', errors='replace'))
+
+    def handle_starttag(self, tag, attrs):
+        self.tags += 1
+
+    def is_markup(self):
+        return not self.binary and self.tags > 0
+
+
+class BodyDecoder:
+    """Content-Encoding decoder that inflates at most FETCH_CHUNK_SIZE bytes per step."""
+
+    def __init__(self, encoding):
+        """
+        Args:
+            encoding (str): Content-Encoding header value ("" for identity)
+
+        Raises:
+            PageSkipped: For an encoding the crawler cannot decode
+        """
+        encoding = encoding.strip().lower()
+        if encoding in ("", "identity"):
+            self.decompressor = None
+        elif encoding in ("gzip", "x-gzip", "deflate"):
+            # 47 = 32 + 15: accept both gzip and zlib headers; raw deflate is retried below
+            self.decompressor = zlib.decompressobj(47)
+            self.deflate = encoding == "deflate"
+        else:
+            raise PageSkipped("encoding", f"unsupported Content-Encoding {encoding}")
+
+    def decode(self, data):
+        """
+        Decode a chunk of wire bytes in bounded steps.
+
+        The caller checks its limits after every step, so a small compressed
+        chunk that inflates to gigabytes is abandoned after one step too many.
+
+        Args:
+            data (bytes): Bytes read from the socket
+
+        Yields:
+            bytes: Decoded pieces of at most FETCH_CHUNK_SIZE bytes
+        """
+        if self.decompressor is None:
+            yield data
+            return
+        while data:
+            try:
+                out = self.decompressor.decompress(data, FETCH_CHUNK_SIZE)
+            except zlib.error:
+                if not self.deflate:
+                    raise
+                # Some servers send raw deflate streams without the zlib header
+                self.decompressor = zlib.decompressobj(-15)
+                out = self.decompressor.decompress(data, FETCH_CHUNK_SIZE)
+            self.deflate = False
+            data = self.decompressor.unconsumed_tail
+            yield out
+
+
+def media_type(response):
+    """Lower-cased Content-Type without parameters ("" if missing)."""
+    return response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+
+
+def read_body(response, max_bytes=MAX_PAGE_BYTES):
+    """
+    Read a streamed response into ``response.content`` within fixed limits.
+
+    Only 2xx bodies are read. The connection is released in every case, and
+    ``response.content`` is always set (empty for skipped pages), so the
+    response can be inspected like a normal one afterwards.
+
+    Args:
+        response (requests.Response): Response requested with ``stream=True``
+        max_bytes (int): Maximum decoded body size
+
+    Raises:
+        PageSkipped: For a non-HTML Content-Type, a body over ``max_bytes``
+            or a compression ratio above MAX_COMPRESSION_RATIO
+        requests.RequestException: On network errors while reading
+    """
+    body = bytearray()
+    try:
+        if response.status_code not in BODY_STATUSES:
+            return
+
+        content_type = media_type(response)
+        sniffer = None
+        if content_type in SNIFFED_CONTENT_TYPES:
+            sniffer = MarkupSniffer()
+        elif content_type not in HTML_CONTENT_TYPES:
+            raise PageSkipped("content_type", f"Content-Type {content_type} is not HTML")
+
+        declared = response.headers.get('Content-Length', '')
+        if declared.isdigit() and int(declared) > max_bytes:
+            raise PageSkipped("too_large", f"Content-Length {int(declared)} exceeds {max_bytes} bytes")
+
+        decoder = BodyDecoder(response.headers.get('Content-Encoding', ''))
+        wire = 0
+        try:
+            for chunk in response.raw.stream(FETCH_CHUNK_SIZE, decode_content=False):
+                wire += len(chunk)
+                for data in decoder.decode(chunk):
+                    body += data
+                    if len(body) > max_bytes:
+                        raise PageSkipped("too_large", f"body exceeds {max_bytes} bytes")
+                    if len(body) > RATIO_CHECK_BYTES and len(body) > wire * MAX_COMPRESSION_RATIO:
+                        raise PageSkipped("compression_ratio", f"compression ratio above {MAX_COMPRESSION_RATIO}:1 "
+                                                               f"({wire} bytes on the wire)")
+                    if sniffer and sniffer.fed < SNIFF_BYTES:
+                        sniffer.feed_bytes(data[:SNIFF_BYTES - sniffer.fed])
+                        if sniffer.fed >= SNIFF_BYTES and not sniffer.is_markup():
+                            raise PageSkipped("content_type",
+                                              f"Content-Type {content_type or 'missing'}, body is not HTML")
+        # Map errors raised while streaming the way Response.iter_content does
+        except zlib.error as e:
+            raise requests.exceptions.ContentDecodingError(f"invalid compressed body: {e}")
+        except urllib3.exceptions.ReadTimeoutError as e:
+            raise requests.exceptions.ConnectionError(e)
+        except urllib3.exceptions.HTTPError as e:
+            raise requests.exceptions.ChunkedEncodingError(e)
+        if sniffer and not sniffer.is_markup():
+            raise PageSkipped("content_type", f"Content-Type {content_type or 'missing'}, body is not HTML")
+    except Exception:
+        # Skipped or failed pages keep no partial body
+        body = bytearray()
+        raise
+    finally:
+        response._content = bytes(body)
+        response._content_consumed = True
+        response.close()
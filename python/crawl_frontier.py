@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Crawl frontier and URL canonicalization shared by the web crawler.
+Provides a deque-backed BFS queue with a companion seen-set so enqueue,
+dequeue and duplicate checks all stay O(1) as the frontier grows. The seen-set
+keeps 64-bit fingerprints (crawl_visited.FingerprintSet), not URL strings.
+"""
+
+from collections import deque
+from urllib.parse import urlparse
+
+from crawl_visited import FingerprintSet
+
+
+def canonicalize_url(url):
+    """
+    Build the canonical form of a URL used for deduplication and filtering.
+
+    The fragment (anchor) is dropped so ``/page#a`` and ``/page#b`` map to the
+    same entry; scheme, host, path and query are kept as-is.
+
+    Args:
+        url (str): Absolute URL
+
+    Returns:
+        str: Canonical URL
+    """
+    parsed = urlparse(url)
+    canonical = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+    if parsed.query:
+        canonical += f"?{parsed.query}"
+    return canonical
+
+
+class Frontier:
+    """
+    FIFO crawl frontier keyed on canonical URLs.
+
+    Every URL is enqueued at most once: the first push (which in a BFS crawl
+    is also the shallowest depth) wins and later pushes of the same canonical
+    URL are ignored.
+    """
+
+    def __init__(self, seen=None):
+        """
+        Args:
+            seen (FingerprintSet): Set of URLs ever enqueued, e.g. one with a
+                Bloom tier (default: an in-memory FingerprintSet)
+        """
+        self.queue = deque()  # (canonical_url, depth)
+        self.seen = seen if seen is not None else FingerprintSet()  # canonical URLs ever enqueued
+
+    def push(self, url, depth):
+        """
+        Enqueue a URL if it has not been seen before.
+
+        Args:
+            url (str): URL to enqueue (canonicalized internally)
+            depth (int): Crawl depth of the URL
+
+        Returns:
+            bool: True if the URL was added, False if it was a duplicate
+        """
+        canonical = canonicalize_url(url)
+        if not self.seen.add(canonical):
+            return False
+        self.queue.append((canonical, depth))
+        return True
+
+    def mark_seen(self, url):
+        """Record a URL as seen without enqueueing it (e.g. restored visited pages)."""
+        self.seen.add(canonicalize_url(url))
+
+    def pop(self):
+        """
+        Dequeue the oldest entry.
+
+        Returns:
+            tuple: (canonical_url, depth)
+        """
+        return self.queue.popleft()
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __contains__(self, url):
+        return canonicalize_url(url) in self.seen
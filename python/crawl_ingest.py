@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Ingest crawled markdown pages into crawl_vectors.db.
+Splits each page into chunks and writes documents and chunks in batched
+transactions, skipping every row whose content hash has not changed.
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import sys
+import threading
+
+from crawl_manifest import content_hash
+
+DB_PATH = "../crawl_vectors.db"  # Shared with the RAG tooling
+CHUNK_TOKENS = 256  # Maximum tokens per chunk (paragraphs are never merged past this)
+INGEST_BATCH_SIZE = 50  # Documents written per transaction
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    file_path TEXT UNIQUE NOT NULL,
+    title TEXT,
+    url TEXT,
+    content_hash TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    metadata TEXT  -- JSON string for additional metadata
+);
+CREATE TABLE IF NOT EXISTS chunks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    document_id INTEGER NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    content_hash TEXT,
+    token_count INTEGER,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (document_id) REFERENCES documents (id) ON DELETE CASCADE
+);
+CREATE TABLE IF NOT EXISTS embeddings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    chunk_id INTEGER NOT NULL,
+    embedding BLOB NOT NULL,  -- Serialized numpy array
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (chunk_id) REFERENCES chunks (id) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS idx_documents_hash ON documents (content_hash);
+CREATE INDEX IF NOT EXISTS idx_chunks_document ON chunks (document_id);
+CREATE INDEX IF NOT EXISTS idx_chunks_hash ON chunks (content_hash);
+CREATE INDEX IF NOT EXISTS idx_embeddings_chunk ON embeddings (chunk_id);
+"""
+
+
+def split_markdown(markdown_content):
+    """
+    Split a page written by the crawler into its header fields and body.
+
+    Args:
+        markdown_content (str): Markdown produced by html_to_markdown
+
+    Returns:
+        dict: title, url, crawled_on and body (body excludes the header block)
+    """
+    page = {"title": None, "url": None, "crawled_on": None, "body": markdown_content}
+    header, separator, body = markdown_content.partition('\n---\n')
+    if not separator:
+        return page
+    for line in header.splitlines():
+        if line.startswith('# ') and page["title"] is None:
+            page["title"] = line[2:].strip()
+        elif line.startswith('**Source URL:**'):
+            page["url"] = line[len('**Source URL:**'):].strip()
+        elif line.startswith('**Crawled on:**'):
+            page["crawled_on"] = line[len('**Crawled on:**'):].strip()
+    page["body"] = body.strip()
+    return page
+
+
+def count_tokens(text):
+    """Count word tokens in a chunk."""
+    return len(TOKEN_PATTERN.findall(text))
+
+
+def chunk_text(text, max_tokens=CHUNK_TOKENS):
+    """
+    Pack paragraphs into chunks of at most ``max_tokens`` tokens.
+
+    Paragraphs longer than the limit are split on whitespace. Chunk
+    boundaries only depend on the text, so an unchanged page always yields
+    the same chunks.
+
+    Args:
+        text (str): Page body
+        max_tokens (int): Token limit per chunk
+
+    Returns:
+        list: Chunk strings in document order
+    """
+    chunks = []
+    current, current_tokens = [], 0
+    for paragraph in re.split(r'\n\s*\n', text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        tokens = count_tokens(paragraph)
+        if tokens > max_tokens:
+            if current:
+                chunks.append('\n\n'.join(current))
+                current, current_tokens = [], 0
+            piece, piece_tokens = [], 0
+            for word in paragraph.split():
+                piece.append(word)
+                piece_tokens += count_tokens(word)
+                if piece_tokens >= max_tokens:
+                    chunks.append(' '.join(piece))
+                    piece, piece_tokens = [], 0
+            if piece:
+                chunks.append(' '.join(piece))
+            continue
+        if current and current_tokens + tokens > max_tokens:
+            chunks.append('\n\n'.join(current))
+            current, current_tokens = [], 0
+        current.append(paragraph)
+        current_tokens += tokens
+    if current:
+        chunks.append('\n\n'.join(current))
+    return chunks
+
+
+class CrawlIngester:
+    """
+    Batched, incremental writer for the documents and chunks tables.
+
+    Document hashes are kept in memory, so re-ingesting an unchanged page
+    costs one dictionary lookup. Changed pages are buffered and written
+    INGEST_BATCH_SIZE at a time in one transaction; within a changed page
+    only chunks whose hash differs are rewritten, and their stale
+    embeddings are dropped so they get re-embedded.
+    """
+
+    def __init__(self, db_path=DB_PATH, batch_size=INGEST_BATCH_SIZE, max_tokens=CHUNK_TOKENS):
+        """
+        Args:
+            db_path (str): SQLite database file
+            batch_size (int): Documents buffered before a transaction is written
+            max_tokens (int): Token limit per chunk
+        """
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+        self.lock = threading.Lock()
+        self.pending = []
+        self.stats = {"documents_inserted": 0, "documents_updated": 0, "documents_unchanged": 0,
+                      "chunks_inserted": 0, "chunks_updated": 0, "chunks_unchanged": 0, "chunks_deleted": 0}
+
+        # The crawler writes from worker threads; every call is serialized by self.lock
+        self.conn = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        self.conn.executescript(SCHEMA)
+        self.documents = {
+            file_path: (doc_id, doc_hash)
+            for doc_id, file_path, doc_hash in self.conn.execute(
+                "SELECT id, file_path, content_hash FROM documents")
+        }
+
+    def add_page(self, file_path, markdown_content):
+        """
+        Queue a page for ingestion unless its stored hash is unchanged.
+
+        Args:
+            file_path (str): Path of the saved markdown file
+            markdown_content (str): Page markdown
+
+        Returns:
+            bool: True if the page changed and was queued
+        """
+        page = split_markdown(markdown_content)
+        # The crawl timestamp is left out so re-crawling an unchanged page keeps its hash
+        doc_hash = content_hash(f"{page['title']}\n{page['url']}\n{page['body']}".encode('utf-8'))
+        with self.lock:
+            known = self.documents.get(file_path)
+            if known and known[1] == doc_hash:
+                self.stats["documents_unchanged"] += 1
+                return False
+            self.pending.append((file_path, doc_hash, page))
+            if len(self.pending) >= self.batch_size:
+                self._write_batch()
+        return True
+
+    def skip_known(self, file_path):
+        """
+        Count a page that already has a document row as unchanged.
+
+        Args:
+            file_path (str): Path of the markdown file
+
+        Returns:
+            bool: True if the page has a row and can be skipped
+        """
+        with self.lock:
+            if file_path not in self.documents:
+                return False
+            self.stats["documents_unchanged"] += 1
+        return True
+
+    def add_file(self, file_path, only_new=False):
+        """
+        Queue a markdown file from disk.
+
+        Args:
+            file_path (str): Markdown file to ingest
+            only_new (bool): Skip files that already have a document row
+                without reading them
+
+        Returns:
+            bool: True if the file was queued
+        """
+        if only_new and self.skip_known(file_path):
+            return False
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                markdown_content = f.read()
+        except OSError as e:
+            print(f" Error reading {file_path} for ingest: {e}")
+            return False
+        return self.add_page(file_path, markdown_content)
+
+    def flush(self):
+        """Write all queued pages."""
+        with self.lock:
+            self._write_batch()
+
+    def close(self):
+        """Flush queued pages and close the database."""
+        self.flush()
+        self.conn.close()
+
+    def _write_batch(self):
+        if not self.pending:
+            return
+        batch, self.pending = self.pending, []
+        written = {}
+        try:
+            with self.conn:
+                for file_path, doc_hash, page in batch:
+                    known = written.get(file_path) or self.documents.get(file_path)
+                    written[file_path] = (self._write_document(file_path, doc_hash, page, known), doc_hash)
+        except sqlite3.Error as e:
+            print(f" Error writing {len(batch)} document(s) to {self.db_path}: {e}")
+            return
+        self.documents.update(written)
+
+    def _write_document(self, file_path, doc_hash, page, known):
+        metadata = json.dumps({"title": page["title"], "url": page["url"], "crawled_on": page["crawled_on"]})
+        if known:
+            doc_id = known[0]
+            self.conn.execute(
+                "UPDATE documents SET title = ?, url = ?, content_hash = ?, metadata = ?, "
+                "updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (page["title"], page["url"], doc_hash, metadata, doc_id))
+            self.stats["documents_updated"] += 1
+        else:
+            doc_id = self.conn.execute(
+                "INSERT INTO documents (file_path, title, url, content_hash, metadata) VALUES (?, ?, ?, ?, ?)",
+                (file_path, page["title"], page["url"], doc_hash, metadata)).lastrowid
+            self.stats["documents_inserted"] += 1
+
+        existing = {
+            chunk_index: (chunk_id, chunk_hash)
+            for chunk_id, chunk_index, chunk_hash in self.conn.execute(
+                "SELECT id, chunk_index, content_hash FROM chunks WHERE document_id = ?", (doc_id,))
+        }
+        chunks = chunk_text(page["body"], self.max_tokens)
+        for chunk_index, chunk in enumerate(chunks):
+            chunk_hash = content_hash(chunk.encode('utf-8'))
+            old = existing.get(chunk_index)
+            if old and old[1] == chunk_hash:
+                self.stats["chunks_unchanged"] += 1
+            elif old:
+                self.conn.execute(
+                    "UPDATE chunks SET content = ?, content_hash = ?, token_count = ? WHERE id = ?",
+                    (chunk, chunk_hash, count_tokens(chunk), old[0]))
+                self.conn.execute("DELETE FROM embeddings WHERE chunk_id = ?", (old[0],))
+                self.stats["chunks_updated"] += 1
+            else:
+                self.conn.execute(
+                    "INSERT INTO chunks (document_id, chunk_index, content, content_hash, token_count) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (doc_id, chunk_index, chunk, chunk_hash, count_tokens(chunk)))
+                self.stats["chunks_inserted"] += 1
+
+        stale = [(chunk_id,) for chunk_index, (chunk_id, _) in existing.items() if chunk_index >= len(chunks)]
+        if stale:
+            self.conn.executemany("DELETE FROM embeddings WHERE chunk_id = ?", stale)
+            self.conn.executemany("DELETE FROM chunks WHERE id = ?", stale)
+            self.stats["chunks_deleted"] += len(stale)
+        return doc_id
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Ingest crawled markdown folders into crawl_vectors.db.')
+    parser.add_argument('folders', nargs='+', help='Folders of .md files, e.g. ../crawl_result/swc')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite database (default: {DB_PATH})')
+    parser.add_argument('--chunk-tokens', type=int, default=CHUNK_TOKENS,
+                        help=f'Maximum tokens per chunk; applies to new or changed documents (default: {CHUNK_TOKENS})')
+    args = parser.parse_args()
+
+    ingester = CrawlIngester(args.db, max_tokens=args.chunk_tokens)
+    for folder in args.folders:
+        if not os.path.isdir(folder):
+            print(f"Error: {folder} is not a folder")
+            sys.exit(1)
+        for name in sorted(os.listdir(folder)):
+            if name.endswith('.md'):
+                ingester.add_file(os.path.join(folder, name))
+    ingester.close()
+    print(json.dumps(ingester.stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
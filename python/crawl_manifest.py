@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Per-output-folder crawl manifest used for incremental re-crawls.
+Remembers the validators (ETag / Last-Modified), content hash and outgoing
+links of every crawled page so unchanged pages can be skipped on the next run.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from crawl_checkpoint import write_json_atomic
+
+MANIFEST_FILE = "_crawl_manifest.json"  # Manifest filename inside the output folder
+MANIFEST_VERSION = 1
+
+
+def content_hash(content):
+    """Return the SHA-256 hex digest of a page body."""
+    return hashlib.sha256(content).hexdigest()
+
+
+class CrawlManifest:
+    def __init__(self, output_folder):
+        """
+        Load the manifest for an output folder (an empty one if none exists yet).
+
+        Args:
+            output_folder (str): Folder the crawler writes markdown files to
+        """
+        self.path = os.path.join(output_folder, MANIFEST_FILE)
+        self.entries = self.load()
+
+    def load(self):
+        """Read manifest entries from disk, ignoring missing or unreadable files."""
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"- Ignoring unreadable crawl manifest: {e}")
+            return {}
+        if data.get("version") != MANIFEST_VERSION:
+            return {}
+        return data.get("pages", {})
+
+    def save(self):
+        """Write the manifest atomically so an interrupted save never corrupts it."""
+        data = {
+            "version": MANIFEST_VERSION,
+            "updated": datetime.now().isoformat(),
+            # Copy first: pages may be updated by worker threads while saving
+            "pages": dict(self.entries),
+        }
+        try:
+            write_json_atomic(self.path, data)
+        except Exception as e:
+            print(f"- Error saving crawl manifest: {e}")
+
+    def get(self, url):
+        """Return the stored entry for a canonical URL, or None."""
+        return self.entries.get(url)
+
+    def conditional_headers(self, url):
+        """
+        Build If-None-Match / If-Modified-Since headers for a URL.
+
+        Args:
+            url (str): Canonical URL
+
+        Returns:
+            dict: Request headers (empty if nothing is cached)
+        """
+        entry = self.entries.get(url)
+        if not entry:
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            headers['If-Modified-Since'] = entry["last_modified"]
+        return headers
+
+    def update(self, url, response, page_hash, links, **fields):
+        """
+        Record the latest state of a page.
+
+        Args:
+            url (str): Canonical URL
+            response (requests.Response): Response the page was served with
+            page_hash (str): Content hash of the body
+            links (list): Outgoing canonical links matching the crawl filter
+            **fields: Extra values to store, e.g. simhash and duplicate_of
+        """
+        entry = self.entries.get(url, {})
+        # A 304 may omit validators; keep the ones we already had
+        entry.update({
+            "etag": response.headers.get('ETag') or entry.get("etag"),
+            "last_modified": response.headers.get('Last-Modified') or entry.get("last_modified"),
+            "content_hash": page_hash,
+            "links": links,
+            "checked": datetime.now().isoformat(),
+            **fields,
+        })
+        self.entries[url] = entry
+
+    def forget(self, url):
+        """Drop a URL so it is fully re-downloaded next time."""
+        self.entries.pop(url, None)
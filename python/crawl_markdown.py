@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Single-pass HTML to Markdown conversion for the web crawler.
+Walks the parsed page once and writes markdown into a buffer instead of
+rewriting the tree with one find_all/replace_with pass per element type.
+"""
+
+import re
+from datetime import datetime
+
+from bs4 import BeautifulSoup, CData, NavigableString, Tag
+
+try:
+    import lxml  # noqa: F401
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+SKIPPED_TAGS = frozenset(["script", "style", "nav", "footer", "header"])
+TEXT_TYPES = (NavigableString, CData)  # String types that count as page text (no comments, scripts, ...)
+CONTENT_CLASS = re.compile('content|main')
+
+# The original converter rewrote the tree in this order: headings h1..h6,
+# paragraphs, lists, code, blockquotes. An element's stage is its position in
+# that order; rendering "at stage k" means all earlier stages have already
+# been applied, which reproduces the old output exactly.
+HEADING_STAGES = {'h1': 1, 'h2': 2, 'h3': 3, 'h4': 4, 'h5': 5, 'h6': 6}
+PARAGRAPH_STAGE = 7
+LIST_STAGE = 8
+CODE_STAGE = 9
+BLOCKQUOTE_STAGE = 10
+FINAL_STAGE = 11
+
+
+def resolve_parser(parser="auto"):
+    """
+    Pick the BeautifulSoup parser backend.
+
+    Args:
+        parser (str): "auto", "lxml" or "html.parser". "auto" uses lxml when installed.
+
+    Returns:
+        str: Parser name to pass to BeautifulSoup
+    """
+    if parser == "auto":
+        return "lxml" if LXML_AVAILABLE else "html.parser"
+    if parser == "lxml" and not LXML_AVAILABLE:
+        raise ValueError("lxml parser requested but lxml is not installed")
+    return parser
+
+
+def parse_html(content, parser="auto"):
+    """Parse raw HTML with the selected backend."""
+    return BeautifulSoup(content, resolve_parser(parser))
+
+
+def find_main_content(soup):
+    """
+    Locate the element holding the page's main content in one walk.
+
+    Preference order is <main>, <article>, a div whose class mentions
+    content/main, then <body>; boilerplate tags are ignored.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content
+
+    Returns:
+        Tag: Main content element, or None
+    """
+    article = content_div = body = None
+    for tag in _iter_tags(soup):
+        if tag.name == 'main':
+            return tag
+        if tag.name == 'article' and article is None:
+            article = tag
+        elif tag.name == 'div' and content_div is None and CONTENT_CLASS.search(' '.join(tag.get('class') or [])):
+            content_div = tag
+        elif tag.name == 'body' and body is None:
+            body = tag
+    return article or content_div or body
+
+
+def _iter_tags(root):
+    """Yield tags below ``root`` in document order, skipping boilerplate subtrees."""
+    stack = [iter(root.contents)]
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, Tag) and child.name not in SKIPPED_TAGS:
+                yield child
+                stack.append(iter(child.contents))
+                break
+        else:
+            stack.pop()
+
+
+class MarkdownWriter:
+    """Renders one content element to markdown text."""
+
+    def __init__(self):
+        self.replacements = {}  # id(tag) -> replacement text (None if left in place)
+
+    def render(self, node, stage):
+        """Return the text of ``node``'s children with all stages before ``stage`` applied."""
+        out = []
+        self._write_children(node, stage, out)
+        return ''.join(out)
+
+    def _write_children(self, node, stage, out):
+        for child in node.contents:
+            if isinstance(child, Tag):
+                if child.name in SKIPPED_TAGS:
+                    continue
+                child_stage = self._stage(child)
+                if child_stage < stage:
+                    text = self._replacement(child, child_stage)
+                    if text is not None:
+                        out.append(text)
+                        continue
+                self._write_children(child, stage, out)
+            elif type(child) in TEXT_TYPES:
+                out.append(child)
+
+    def _stage(self, tag):
+        name = tag.name
+        if name in HEADING_STAGES:
+            return HEADING_STAGES[name]
+        if name == 'p':
+            return PARAGRAPH_STAGE
+        if name in ('ul', 'ol'):
+            return LIST_STAGE
+        if name == 'code':
+            return CODE_STAGE
+        if name == 'pre' and self._pre_code(tag) is not None:
+            return CODE_STAGE
+        if name == 'blockquote':
+            return BLOCKQUOTE_STAGE
+        return FINAL_STAGE
+
+    @staticmethod
+    def _pre_code(tag):
+        """Return the first <code> child of a <pre>, which turns the whole block into a fence."""
+        for child in tag.contents:
+            if isinstance(child, Tag) and child.name == 'code':
+                return child
+        return None
+
+    def _replacement(self, tag, stage):
+        """Markdown that replaces ``tag`` at its stage, or None if the tag is left as plain text."""
+        key = id(tag)
+        if key not in self.replacements:
+            self.replacements[key] = self._build_replacement(tag, stage)
+        return self.replacements[key]
+
+    def _build_replacement(self, tag, stage):
+        if stage <= 6:
+            return f"\n{'#' * stage} {self.render(tag, stage).strip()}\n\n"
+
+        if stage == PARAGRAPH_STAGE:
+            text = self.render(tag, stage).strip()
+            return f"{text}\n\n" if text else None
+
+        if stage == LIST_STAGE:
+            prefix = "- " if tag.name == 'ul' else "1. "
+            items = []
+            self._collect_items(tag, prefix, items)
+            return "\n" + "\n".join(items) + "\n\n" if items else None
+
+        if stage == CODE_STAGE:
+            if tag.name == 'pre':
+                return f"\n```\n{self.render(self._pre_code(tag), stage)}\n```\n\n"
+            return f"`{self.render(tag, stage)}`"
+
+        text = self.render(tag, stage).strip()
+        return f"\n> {text}\n\n" if text else None
+
+    def _collect_items(self, node, prefix, items):
+        """Gather every <li> below a list (nested ones included) that survived earlier stages."""
+        for child in node.contents:
+            if not isinstance(child, Tag) or child.name in SKIPPED_TAGS:
+                continue
+            child_stage = self._stage(child)
+            if child_stage < LIST_STAGE and self._replacement(child, child_stage) is not None:
+                continue
+            if child.name == 'li':
+                item_text = self.render(child, LIST_STAGE).strip()
+                if item_text:
+                    items.append(f"{prefix}{item_text}")
+            self._collect_items(child, prefix, items)
+
+
+def html_to_markdown(soup, url):
+    """
+    Convert HTML content to Markdown format without modifying the soup.
+
+    Args:
+        soup (BeautifulSoup): Parsed HTML content
+        url (str): Source URL
+
+    Returns:
+        str: Markdown formatted content
+    """
+    # Extract title
+    title = "Untitled"
+    if soup.title:
+        title = soup.title.get_text().strip()
+    elif soup.find('h1'):
+        title = soup.find('h1').get_text().strip()
+
+    # Start building markdown content
+    markdown_content = f"# {title}\n\n"
+    markdown_content += f"**Source URL:** {url}\n"
+    markdown_content += f"**Crawled on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+    markdown_content += "---\n\n"
+
+    # Extract main content
+    main_content = find_main_content(soup)
+
+    if main_content:
+        content_text = MarkdownWriter().render(main_content, FINAL_STAGE)
+
+        # Clean up the text
+        content_text = re.sub(r'\n\s*\n\s*\n', '\n\n', content_text)  # Remove excessive newlines
+        content_text = re.sub(r'[ \t]+', ' ', content_text)  # Normalize spaces
+
+        markdown_content += content_text.strip()
+
+    return markdown_content
@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Instrumentation for the web crawler.
+Times the crawl stages (fetch, parse, convert, link extraction, save), counts
+responses, bytes and errors, and keeps fixed-bucket latency histograms. Every
+measurement is appended to a JSON-lines event log, and a Prometheus text
+snapshot of the aggregates is rewritten at each checkpoint. Also provides the
+optional cProfile and sampling profilers behind ``crawler.py --profile``.
+"""
+
+import bisect
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+EVENTS_FILE = "_crawl_events.jsonl"  # JSON-lines event log inside the output folder (appended across runs)
+METRICS_FILE = "_crawl_metrics.prom"  # Prometheus text snapshot inside the output folder
+PROFILE_FILE = "_crawl_profile"  # Profiler output inside the output folder (.prof or .folded is appended)
+STAGES = ("fetch", "parse", "convert", "links", "save")  # Timed stages, in pipeline order
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)  # Histogram upper bounds in seconds
+SAMPLE_INTERVAL = 0.005  # Seconds between stack samples of the sampling profiler
+PROFILE_TOP = 25  # Functions printed from a cProfile run
+
+
+class Histogram:
+    """Latency histogram with fixed bucket bounds, in the Prometheus layout."""
+
+    def __init__(self, bounds=LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds):
+        self.counts[bisect.bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+        self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """
+        Estimate a quantile by interpolating inside its bucket.
+
+        Args:
+            q (float): Quantile between 0 and 1
+
+        Returns:
+            float: Estimated seconds (0 for an empty histogram)
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[i - 1] if i else 0.0
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(self.max, lower + (upper - lower) * (rank - seen) / count)
+            seen += count
+        return self.max
+
+    def summary(self):
+        """Aggregate view used in _crawl_summary.json."""
+        return {
+            "count": self.count,
+            "total_seconds": round(self.sum, 6),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+        }
+
+
+class CrawlMetrics:
+    """
+    Thread-safe metrics registry of one crawl.
+
+    Stage timings are recorded from the fetch thread pool and the asyncio
+    stages at the same time, so every update holds one lock. Pages converted
+    in parser processes report their timings back with the converted page and
+    are recorded through ``observe``.
+    """
+
+    def __init__(self, output_folder, events=True):
+        """
+        Args:
+            output_folder (str): Folder the event log and snapshot are written to
+            events (bool): Append every measurement to the JSON-lines event log
+        """
+        self.metrics_path = os.path.join(output_folder, METRICS_FILE)
+        self.events_path = os.path.join(output_folder, EVENTS_FILE)
+        self.lock = threading.Lock()
+        self.started = time.monotonic()
+        self.stages = {stage: Histogram() for stage in STAGES}
+        self.response_latency = Histogram()  # Request sent to headers parsed (DNS, TLS and server time)
+        self.status_codes = Counter()
+        self.errors = Counter()  # stage -> failures
+        self.counters = Counter()  # Other named counters, e.g. pages_unchanged
+        self.body_bytes = 0
+        self.saved_bytes = 0
+        self.events = open(self.events_path, 'a', encoding='utf-8') if events else None
+
+    def event(self, kind, **fields):
+        """Append one event to the JSON-lines log (no-op when events are disabled)."""
+        if not self.events:
+            return
+        line = json.dumps({"ts": round(time.time(), 6), "event": kind, **fields}, ensure_ascii=False)
+        with self.lock:
+            self.events.write(line + "\n")
+
+    def observe(self, stage, seconds, url=None, **fields):
+        """
+        Record one timed stage.
+
+        Args:
+            stage (str): One of STAGES
+            seconds (float): Wall time spent in the stage
+            url (str): Page the stage worked on
+            **fields: Extra values for the event (status, bytes, ...)
+        """
+        with self.lock:
+            self.stages[stage].observe(seconds)
+        self.event("stage", stage=stage, url=url, seconds=round(seconds, 6), **fields)
+
+    @contextmanager
+    def stage(self, stage, url=None):
+        """
+        Time a block as ``stage``; an exception counts as an error of the stage.
+
+        Yields:
+            dict: Extra fields the block can fill in for the event
+        """
+        fields = {}
+        start = time.perf_counter()
+        try:
+            yield fields
+        except Exception as e:
+            self.error(stage, url, e)
+            raise
+        finally:
+            self.observe(stage, time.perf_counter() - start, url, **fields)
+
+    def error(self, stage, url, error):
+        """Count a failed stage."""
+        with self.lock:
+            self.errors[stage] += 1
+        self.event("error", stage=stage, url=url, error=f"{type(error).__name__}: {error}")
+
+    def response(self, response):
+        """
+        Count a response's status code, body size and time to headers.
+
+        Args:
+            response (requests.Response): Response, successful or not
+
+        Returns:
+            dict: Fields for the fetch event
+        """
+        size = len(response.content)
+        latency = response.elapsed.total_seconds()
+        with self.lock:
+            self.status_codes[response.status_code] += 1
+            self.body_bytes += size
+            self.response_latency.observe(latency)
+        return {"status": response.status_code, "bytes": size, "response_seconds": round(latency, 6)}
+
+    def saved(self, size):
+        """Count bytes written to markdown files (compressed record bytes in archive mode)."""
+        with self.lock:
+            self.saved_bytes += size
+
+    def increment(self, name, value=1):
+        """Increase a named counter."""
+        with self.lock:
+            self.counters[name] += value
+
+    def summary(self):
+        """
+        Aggregate stats for _crawl_summary.json.
+
+        Returns:
+            dict: Per-stage latency summaries, response counts and byte totals
+        """
+        with self.lock:
+            return {
+                "elapsed_seconds": round(time.monotonic() - self.started, 3),
+                "stages": {stage: histogram.summary() for stage, histogram in self.stages.items()},
+                "response_latency": self.response_latency.summary(),
+                "status_codes": {str(code): count for code, count in sorted(self.status_codes.items())},
+                "errors": dict(self.errors),
+                "body_bytes": self.body_bytes,
+                "saved_bytes": self.saved_bytes,
+                "counters": dict(self.counters),
+            }
+
+    def prometheus(self):
+        """
+        Render the aggregates in the Prometheus text exposition format.
+
+        Returns:
+            str: Snapshot text
+        """
+        lines = []
+
+        def histogram(name, help_text, items):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} histogram"])
+            for labels, hist in items:
+                cumulative = 0
+                for bound, count in zip(list(hist.bounds) + ["+Inf"], hist.counts):
+                    cumulative += count
+                    le = f'le="{bound}"'
+                    lines.append(f"{name}_bucket{{{labels + ',' + le if labels else le}}} {cumulative}")
+                suffix = f"{{{labels}}}" if labels else ""
+                lines.append(f"{name}_sum{suffix} {hist.sum:.6f}")
+                lines.append(f"{name}_count{suffix} {hist.count}")
+
+        def counter(name, help_text, items):
+            lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} counter"])
+            lines.extend(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}" for labels, value in items)
+
+        with self.lock:
+            histogram("crawl_stage_seconds", "Wall time per crawl stage.",
+                      [(f'stage="{stage}"', hist) for stage, hist in self.stages.items()])
+            histogram("crawl_response_seconds", "Time from sending a request until its headers arrived.",
+                      [("", self.response_latency)])
+            counter("crawl_responses_total", "Responses by HTTP status code.",
+                    [(f'code="{code}"', count) for code, count in sorted(self.status_codes.items())])
+            counter("crawl_errors_total", "Failed stages.",
+                    [(f'stage="{stage}"', count) for stage, count in sorted(self.errors.items())])
+            counter("crawl_body_bytes_total", "Decoded response body bytes.", [("", self.body_bytes)])
+            counter("crawl_saved_bytes_total", "Markdown bytes written.", [("", self.saved_bytes)])
+            counter("crawl_events_total", "Other crawl events.",
+                    [(f'name="{name}"', count) for name, count in sorted(self.counters.items())])
+        return "\n".join(lines) + "\n"
+
+    def write_snapshot(self):
+        """Atomically rewrite the Prometheus snapshot and flush the event log."""
+        try:
+            tmp_path = f"{self.metrics_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus())
+            os.replace(tmp_path, self.metrics_path)
+            if self.events:
+                with self.lock:
+                    self.events.flush()
+        except Exception as e:
+            print(f"- Error saving crawl metrics: {e}")
+
+    def close(self):
+        """Write the final snapshot and close the event log."""
+        self.write_snapshot()
+        if self.events:
+            self.events.close()
+            self.events = None
+
+
+class SamplingProfiler:
+    """
+    Stack sampler covering every thread, including the fetch thread pool.
+
+    A daemon thread records the stacks of all other threads every
+    ``interval`` seconds and writes them in the folded format
+    (``frame;frame;frame count``) read by flamegraph.pl and speedscope.
+    Parser processes are not sampled.
+    """
+
+    def __init__(self, path, interval=SAMPLE_INTERVAL):
+        """
+        Args:
+            path (str): Folded-stack output file
+            interval (float): Seconds between samples
+        """
+        self.path = path
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="crawl-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def run(self):
+        own_id = threading.get_ident()
+        while not self.stopped.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        """Stop sampling and write the folded stacks."""
+        self.stopped.set()
+        self.thread.join()
+        with open(self.path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        print(f"- Profile saved: {os.path.basename(self.path)} ({sum(self.stacks.values())} samples)")
+
+
+class CProfileRunner:
+    """cProfile of the main thread (the sequential crawl and the event loop)."""
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): pstats output file, readable with ``python -m pstats``
+        """
+        import cProfile
+
+        self.path = path
+        self.profile = cProfile.Profile()
+
+    def start(self):
+        self.profile.enable()
+
+    def stop(self):
+        """Stop profiling, save the stats and print the most expensive functions."""
+        import pstats
+
+        self.profile.disable()
+        self.profile.dump_stats(self.path)
+        print(f"- Profile saved: {os.path.basename(self.path)}")
+        pstats.Stats(self.profile).sort_stats("cumulative").print_stats(PROFILE_TOP)
+
+
+def start_profiler(kind, output_folder):
+    """
+    Start the profiler selected with ``--profile``.
+
+    Args:
+        kind (str): "cprofile", "sample" or None
+        output_folder (str): Folder the profile is written to
+
+    Returns:
+        Object with a ``stop()`` method, or None when profiling is off
+    """
+    if not kind:
+        return None
+    if kind == "cprofile":
+        profiler = CProfileRunner(os.path.join(output_folder, f"{PROFILE_FILE}.prof"))
+    else:
+        profiler = SamplingProfiler(os.path.join(output_folder, f"{PROFILE_FILE}.folded"))
+    print(f"Profiling with {kind}")
+    profiler.start()
+    return profiler
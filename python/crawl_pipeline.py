@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+CPU-bound page conversion for the pipelined crawl engine.
+Functions here run inside ProcessPoolExecutor workers, so they only take and
+return plain picklable values and never touch WebCrawler state.
+"""
+
+import time
+from urllib.parse import urljoin
+
+from crawl_dedup import simhash
+from crawl_frontier import canonicalize_url
+from crawl_markdown import html_to_markdown, parse_html
+
+PARSE_WORKERS = 0  # Parser processes (0 = convert in the crawler's thread pool)
+STAGE_QUEUE_SIZE = 2  # Pages buffered between stages, per consuming worker
+
+
+def convert_page(url, content, parser, fingerprint=False):
+    """
+    Parse a page, convert it to markdown and collect its links.
+
+    Args:
+        url (str): Canonical URL of the page
+        content (bytes): Raw HTML body
+        parser (str): BeautifulSoup parser backend
+        fingerprint (bool): Also compute the page's SimHash
+
+    Returns:
+        tuple: (markdown text, canonical links in document order (unfiltered),
+            SimHash or None, seconds spent per stage for CrawlMetrics)
+    """
+    start = time.perf_counter()
+    soup = parse_html(content, parser)
+    parsed = time.perf_counter()
+    markdown_content = html_to_markdown(soup, url)
+    converted = time.perf_counter()
+    links = {}
+    for link in soup.find_all('a', href=True):
+        links[canonicalize_url(urljoin(url, link['href']))] = None
+    timings = {"parse": parsed - start, "convert": converted - parsed, "links": time.perf_counter() - converted}
+    return markdown_content, list(links), simhash(markdown_content) if fingerprint else None, timings
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+BM25 keyword search over the chunks in crawl_vectors.db.
+Keeps an SQLite FTS5 inverted index next to the chunks table. Triggers update
+the index whenever a chunk is inserted, rewritten or deleted, so pages
+re-ingested by ``crawler.py --ingest`` are searchable immediately.
+"""
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+
+from crawl_ingest import DB_PATH, SCHEMA
+
+TOP_K = 5  # Documents returned by default
+TITLE_WEIGHT = 2.0  # BM25 weight of the title column relative to the chunk text
+CANDIDATE_FACTOR = 4  # Chunks fetched per requested document before grouping by document
+
+TERM_PATTERN = re.compile(r'\w+')
+
+INDEX_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS chunks_fts USING fts5(title, content, tokenize='porter unicode61');
+CREATE TRIGGER IF NOT EXISTS chunks_fts_insert AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunks_fts (rowid, title, content)
+    VALUES (new.id, (SELECT title FROM documents WHERE id = new.document_id), new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_fts_update AFTER UPDATE OF content ON chunks BEGIN
+    UPDATE chunks_fts SET content = new.content WHERE rowid = new.id;
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_fts_delete AFTER DELETE ON chunks BEGIN
+    DELETE FROM chunks_fts WHERE rowid = old.id;
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_fts_title AFTER UPDATE OF title ON documents BEGIN
+    UPDATE chunks_fts SET title = new.title
+    WHERE rowid IN (SELECT id FROM chunks WHERE document_id = new.id);
+END;
+"""
+
+
+def ensure_index(conn):
+    """
+    Create the FTS5 index and its triggers, filling it from existing chunks
+    the first time.
+
+    Args:
+        conn (sqlite3.Connection): Open crawl_vectors.db connection
+
+    Raises:
+        RuntimeError: If this SQLite build has no FTS5 support
+    """
+    conn.executescript(SCHEMA)
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'chunks_fts'").fetchone()
+    if exists:
+        return
+    try:
+        with conn:
+            conn.executescript(INDEX_SCHEMA)
+            conn.execute(
+                "INSERT INTO chunks_fts (rowid, title, content) "
+                "SELECT chunks.id, documents.title, chunks.content "
+                "FROM chunks JOIN documents ON documents.id = chunks.document_id")
+    except sqlite3.OperationalError as e:
+        if 'fts5' in str(e):
+            raise RuntimeError("This SQLite build does not include FTS5, which crawl_search requires") from e
+        raise
+
+
+def rebuild_index(conn):
+    """Drop and recreate the index from the chunks table."""
+    with conn:
+        conn.execute("DROP TABLE IF EXISTS chunks_fts")
+        for trigger in ("chunks_fts_insert", "chunks_fts_update", "chunks_fts_delete", "chunks_fts_title"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    ensure_index(conn)
+
+
+def build_query(query, match_all=False):
+    """
+    Turn free text into an FTS5 query of quoted terms.
+
+    Args:
+        query (str): User query, e.g. "reentrancy external call"
+        match_all (bool): Require every term instead of any term
+
+    Returns:
+        str: FTS5 MATCH expression, or "" if the query has no terms
+    """
+    terms = dict.fromkeys(term.lower() for term in TERM_PATTERN.findall(query))
+    return (' AND ' if match_all else ' OR ').join(f'"{term}"' for term in terms)
+
+
+class CrawlSearcher:
+    """BM25 top-k search over crawl_vectors.db, grouped by document."""
+
+    def __init__(self, db_path=DB_PATH):
+        """
+        Args:
+            db_path (str): SQLite database file
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        ensure_index(self.conn)
+
+    def search(self, query, k=TOP_K, match_all=False):
+        """
+        Find the ``k`` documents whose best chunk ranks highest for ``query``.
+
+        Args:
+            query (str): One or more search terms
+            k (int): Number of documents to return
+            match_all (bool): Only match chunks containing every term
+
+        Returns:
+            list: Dicts with id, file_path, title, url, score (higher is better),
+                chunk_index and snippet, best first
+        """
+        expression = build_query(query, match_all)
+        if not expression or k <= 0:
+            return []
+
+        limit = k * CANDIDATE_FACTOR
+        while True:
+            # Rank chunk ids only; snippets are costly and built for the winners alone
+            rows = self.conn.execute(
+                "SELECT hits.rowid, hits.score, chunks.chunk_index, documents.id, documents.file_path, "
+                "documents.title, documents.url "
+                "FROM (SELECT rowid, bm25(chunks_fts, ?, 1.0) AS score "
+                "      FROM chunks_fts WHERE chunks_fts MATCH ? ORDER BY score LIMIT ?) AS hits "
+                "JOIN chunks ON chunks.id = hits.rowid "
+                "JOIN documents ON documents.id = chunks.document_id "
+                "ORDER BY hits.score",
+                (TITLE_WEIGHT, expression, limit)).fetchall()
+
+            results = {}
+            for chunk_id, score, chunk_index, doc_id, file_path, title, url in rows:
+                if doc_id not in results:
+                    # FTS5 scores are negative with the best match lowest
+                    results[doc_id] = {"id": doc_id, "file_path": file_path, "title": title, "url": url,
+                                       "score": round(-score, 6), "chunk_index": chunk_index,
+                                       "chunk_id": chunk_id}
+            # Many hits may come from the same few documents; widen until k are found
+            if len(results) >= k or len(rows) < limit:
+                break
+            limit *= 4
+
+        top = list(results.values())[:k]
+        for result in top:
+            result["snippet"] = self.conn.execute(
+                "SELECT snippet(chunks_fts, 1, '**', '**', '...', 16) FROM chunks_fts "
+                "WHERE chunks_fts MATCH ? AND rowid = ?",
+                (expression, result.pop("chunk_id"))).fetchone()[0]
+        return top
+
+    def close(self):
+        self.conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BM25 keyword search over crawl_vectors.db.')
+    parser.add_argument('query', nargs='?', help='Search terms')
+    parser.add_argument('-k', '--top-k', type=int, default=TOP_K, help=f'Documents to return (default: {TOP_K})')
+    parser.add_argument('--all', action='store_true', help='Only match documents containing every term')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite database (default: {DB_PATH})')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    parser.add_argument('--rebuild', action='store_true', help='Rebuild the index from the chunks table')
+    args = parser.parse_args()
+
+    try:
+        searcher = CrawlSearcher(args.db)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    if args.rebuild:
+        rebuild_index(searcher.conn)
+        print("Index rebuilt", file=sys.stderr)
+    if not args.query:
+        return
+
+    start = time.perf_counter()
+    results = searcher.search(args.query, args.top_k, args.all)
+    elapsed = time.perf_counter() - start
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False))
+        return
+    for rank, result in enumerate(results, 1):
+        print(f"{rank}. [{result['score']:.3f}] {result['title']} ({result['file_path']})")
+        print(f"   {' '.join(result['snippet'].split())}")
+    print(f"{len(results)} result(s) in {elapsed * 1000:.2f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
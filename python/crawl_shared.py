@@ -0,0 +1,458 @@
+#!/usr/bin/env python3
+"""
+Shared crawl frontier for coordinated multi-worker crawls.
+Several ``crawler.py`` worker processes split one crawl through a SQLite
+database in WAL mode. Workers lease small batches of URLs that expire if
+the worker dies, so its URLs go back to the queue. Every URL is stored
+once (global dedup), page bodies are claimed by content hash so exact
+duplicates are caught across workers, and each host has one request slot
+schedule that all workers book from, so per-host rate limits hold for the
+crawl as a whole.
+"""
+
+import os
+import socket
+import sqlite3
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from crawl_manifest import MANIFEST_FILE, CrawlManifest
+
+FRONTIER_DB = "_crawl_frontier.db"  # Shared frontier inside the crawl output folder
+WORKERS_FOLDER = "_workers"  # Per-worker manifest, URL log, metrics and summary
+LEASE_SECONDS = 120  # A leased URL is handed to another worker if not completed within this
+LEASE_BATCH = 8  # URLs leased per database round trip
+LEASE_AHEAD = 10  # Seconds of a host's request schedule a single lease may cover
+MAX_ATTEMPTS = 3  # Expired leases before a URL is given up as failed
+POLL_INTERVAL = 0.5  # Seconds an idle worker waits before asking for URLs again
+
+QUEUED = 0  # URL states
+LEASED = 1
+DONE = 2
+FAILED = 3
+STATE_NAMES = {QUEUED: "queued", LEASED: "leased", DONE: "done", FAILED: "failed"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    base_url TEXT NOT NULL,
+    filter_pattern TEXT NOT NULL,
+    max_depth INTEGER NOT NULL,
+    page_limit INTEGER NOT NULL,
+    pages_claimed INTEGER NOT NULL DEFAULT 0,  -- URLs leased or finished, counted against page_limit
+    seeded INTEGER NOT NULL DEFAULT 0,
+    seeder TEXT,
+    seed_expires REAL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,  -- Insertion order, so each host is crawled breadth-first
+    url TEXT UNIQUE NOT NULL,
+    host TEXT NOT NULL,
+    depth INTEGER NOT NULL,
+    lastmod TEXT,
+    state INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    lease_expires REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS hosts (
+    host TEXT PRIMARY KEY,
+    next_slot REAL NOT NULL DEFAULT 0  -- Earliest time the next request to the host may start
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS contents (
+    content_hash TEXT PRIMARY KEY,
+    url TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS workers (
+    worker TEXT PRIMARY KEY,
+    started REAL,
+    heartbeat REAL,
+    pages INTEGER NOT NULL DEFAULT 0,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_urls_queued ON urls (host, id) WHERE state = 0;
+CREATE INDEX IF NOT EXISTS idx_urls_expiry ON urls (lease_expires) WHERE state = 1;
+CREATE INDEX IF NOT EXISTS idx_urls_worker ON urls (worker) WHERE state = 1;
+CREATE INDEX IF NOT EXISTS idx_contents_url ON contents (url);
+"""
+
+
+def default_worker_id():
+    """``<hostname>-<pid>``, unique among the workers of a crawl."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def url_host(url):
+    return urlparse(url).netloc.lower()
+
+
+def merge_manifest_entries(entries, other):
+    """
+    Merge manifest entries, keeping the most recently checked entry per URL.
+
+    Args:
+        entries (dict): Entries to update in place
+        other (dict): Entries to merge in
+
+    Returns:
+        int: Entries taken from ``other``
+    """
+    taken = 0
+    for url, entry in other.items():
+        current = entries.get(url)
+        if current is None or entry.get("checked", "") >= current.get("checked", ""):
+            entries[url] = entry
+            taken += 1
+    return taken
+
+
+def merge_worker_manifests(output_folder):
+    """
+    Fold the workers' manifests into the crawl manifest and delete them.
+
+    Args:
+        output_folder (str): Crawl output folder
+
+    Returns:
+        int: Worker manifests merged
+    """
+    workers_folder = os.path.join(output_folder, WORKERS_FOLDER)
+    if not os.path.isdir(workers_folder):
+        return 0
+    manifest = CrawlManifest(output_folder)
+    merged = []
+    for name in sorted(os.listdir(workers_folder)):
+        folder = os.path.join(workers_folder, name)
+        if os.path.exists(os.path.join(folder, MANIFEST_FILE)):
+            merge_manifest_entries(manifest.entries, CrawlManifest(folder).entries)
+            merged.append(folder)
+    if merged:
+        manifest.save()
+        for folder in merged:
+            os.remove(os.path.join(folder, MANIFEST_FILE))
+    return len(merged)
+
+
+def remove_frontier(db_path):
+    """Delete a frontier database together with its WAL files."""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+
+
+class SharedFrontier:
+    """
+    Crawl frontier in a SQLite database shared by worker processes.
+
+    Every change runs in a ``BEGIN IMMEDIATE`` transaction, so leases, page
+    budget and host slots are updated by one worker at a time. WAL mode lets
+    the other workers keep reading meanwhile. SQLite needs all workers on the
+    same machine (or a local disk they share); the database must not live on
+    a network file system.
+    """
+
+    def __init__(self, db_path, worker=None):
+        """
+        Args:
+            db_path (str): Frontier database (created if missing)
+            worker (str): Id of this worker (default: hostname-pid)
+        """
+        self.db_path = db_path
+        self.worker = worker or default_worker_id()
+        self.conn = sqlite3.connect(db_path, timeout=60, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction that takes the database lock up front."""
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.conn
+        except BaseException:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.conn.execute("COMMIT")
+
+    def settings(self):
+        """
+        Limits and progress of the crawl.
+
+        Returns:
+            dict: base_url, filter_pattern, max_depth, page_limit, pages_claimed
+                and seeded, or None before the crawl is configured
+        """
+        row = self.conn.execute(
+            "SELECT base_url, filter_pattern, max_depth, page_limit, pages_claimed, seeded FROM crawl").fetchone()
+        if row is None:
+            return None
+        keys = ("base_url", "filter_pattern", "max_depth", "page_limit", "pages_claimed", "seeded")
+        return dict(zip(keys, row))
+
+    def configure(self, base_url, filter_pattern, max_pages, max_depth):
+        """
+        Set the crawl's limits unless another worker already did.
+
+        Args:
+            base_url (str): Start URL
+            filter_pattern (str): URL filter
+            max_pages (int): Pages to crawl over all workers
+            max_depth (int): Maximum crawl depth
+
+        Returns:
+            dict: The crawl's settings (those of the first worker to configure it)
+        """
+        with self.transaction() as conn:
+            conn.execute("INSERT OR IGNORE INTO crawl (id, base_url, filter_pattern, max_depth, page_limit) "
+                         "VALUES (1, ?, ?, ?, ?)", (base_url, filter_pattern, max_depth, max_pages))
+        return self.settings()
+
+    def join(self):
+        """Register this worker (its page count starts over)."""
+        now = time.time()
+        with self.transaction() as conn:
+            conn.execute("INSERT OR REPLACE INTO workers (worker, started, heartbeat, status) VALUES (?, ?, ?, ?)",
+                         (self.worker, now, now, "crawling"))
+
+    def resume(self, max_pages):
+        """
+        Prepare a stopped crawl for a new run with no worker alive.
+
+        Leases of the previous run go back to the queue and ``max_pages`` more
+        pages may be crawled.
+
+        Args:
+            max_pages (int): Pages to crawl in this run over all workers
+
+        Returns:
+            int: URLs still queued
+        """
+        with self.transaction() as conn:
+            conn.execute("UPDATE urls SET state = ?, worker = NULL, lease_expires = NULL WHERE state = ?",
+                         (QUEUED, LEASED))
+            conn.execute("UPDATE crawl SET pages_claimed = (SELECT COUNT(*) FROM urls WHERE state IN (?, ?))",
+                         (DONE, FAILED))
+            conn.execute("UPDATE crawl SET page_limit = pages_claimed + ?, seeder = NULL", (max_pages,))
+            conn.execute("UPDATE hosts SET next_slot = 0")
+        return self.conn.execute("SELECT COUNT(*) FROM urls WHERE state = ?", (QUEUED,)).fetchone()[0]
+
+    def claim_seeding(self):
+        """
+        Become the worker that seeds the crawl, unless it is seeded or another
+        live worker is seeding it.
+
+        Returns:
+            bool: True if this worker has to call ``seed``
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            claimed = conn.execute(
+                "UPDATE crawl SET seeder = ?, seed_expires = ? "
+                "WHERE seeded = 0 AND (seeder IS NULL OR seed_expires < ?)",
+                (self.worker, now + LEASE_SECONDS, now)).rowcount
+        return claimed == 1
+
+    def seed(self, entries):
+        """
+        Queue the start URLs and mark the crawl seeded.
+
+        Args:
+            entries (list): (canonical url, depth, lastmod or None) tuples
+
+        Returns:
+            int: URLs added
+        """
+        with self.transaction() as conn:
+            added = self.insert(conn, entries)
+            conn.execute("UPDATE crawl SET seeded = 1")
+        return added
+
+    @staticmethod
+    def insert(conn, entries):
+        added = 0
+        for url, depth, lastmod in entries:
+            host = url_host(url)
+            conn.execute("INSERT OR IGNORE INTO hosts (host) VALUES (?)", (host,))
+            added += conn.execute("INSERT OR IGNORE INTO urls (url, host, depth, lastmod) VALUES (?, ?, ?, ?)",
+                                  (url, host, depth, lastmod)).rowcount
+        return added
+
+    def reclaim_expired(self, conn, now):
+        """Requeue URLs whose lease ran out; give up on those that keep expiring."""
+        conn.execute("UPDATE urls SET state = ?, worker = NULL, lease_expires = NULL, attempts = attempts + 1 "
+                     "WHERE state = ? AND lease_expires < ? AND attempts + 1 >= ?",
+                     (FAILED, LEASED, now, MAX_ATTEMPTS))
+        requeued = conn.execute("UPDATE urls SET state = ?, worker = NULL, lease_expires = NULL, "
+                                "attempts = attempts + 1 WHERE state = ? AND lease_expires < ?",
+                                (QUEUED, LEASED, now)).rowcount
+        if requeued:
+            conn.execute("UPDATE crawl SET pages_claimed = pages_claimed - ?", (requeued,))
+
+    def lease(self, count=LEASE_BATCH, delay=0):
+        """
+        Lease up to ``count`` queued URLs.
+
+        Hosts whose request schedule is booked more than LEASE_AHEAD seconds
+        ahead are skipped, and a lease takes no more URLs of one host than
+        fit into LEASE_AHEAD seconds at ``delay``, so a worker does not sit
+        on URLs of a busy host while others are idle.
+
+        Args:
+            count (int): Maximum URLs to lease
+            delay (float): Minimum seconds between two requests to a host
+
+        Returns:
+            list: (url, depth, lastmod) tuples
+        """
+        now = time.time()
+        per_host = max(1, int(LEASE_AHEAD / delay)) if delay > 0 else count
+        leased = []
+        with self.transaction() as conn:
+            self.reclaim_expired(conn, now)
+            page_limit, pages_claimed = conn.execute("SELECT page_limit, pages_claimed FROM crawl").fetchone()
+            count = min(count, page_limit - pages_claimed)
+            hosts = conn.execute("SELECT host FROM hosts WHERE next_slot <= ? ORDER BY next_slot",
+                                 (now + LEASE_AHEAD,)).fetchall()
+            for (host,) in hosts:
+                if len(leased) >= count:
+                    break
+                rows = conn.execute("SELECT id, url, depth, lastmod FROM urls WHERE state = ? AND host = ? "
+                                    "ORDER BY id LIMIT ?",
+                                    (QUEUED, host, min(per_host, count - len(leased)))).fetchall()
+                for url_id, url, depth, lastmod in rows:
+                    conn.execute("UPDATE urls SET state = ?, worker = ?, lease_expires = ? WHERE id = ?",
+                                 (LEASED, self.worker, now + LEASE_SECONDS, url_id))
+                    leased.append((url, depth, lastmod))
+            if leased:
+                conn.execute("UPDATE crawl SET pages_claimed = pages_claimed + ?", (len(leased),))
+        return leased
+
+    def reserve_slot(self, url, delay):
+        """
+        Book the next request slot of a URL's host.
+
+        Slots are booked right before the request rather than at lease time,
+        so a worker that falls behind never fires a stale slot: requests to a
+        host start at least ``delay`` seconds apart over all workers.
+
+        Args:
+            url (str): URL about to be fetched
+            delay (float): Minimum seconds between two requests to the host
+
+        Returns:
+            float: Seconds to wait before sending the request
+        """
+        if delay <= 0:
+            return 0.0
+        host = url_host(url)
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute("SELECT next_slot FROM hosts WHERE host = ?", (host,)).fetchone()
+            slot = max(row[0] if row else 0, now)
+            conn.execute("INSERT OR REPLACE INTO hosts (host, next_slot) VALUES (?, ?)", (host, slot + delay))
+        return slot - now
+
+    def complete(self, url, links, depth, max_depth):
+        """
+        Finish a leased URL and queue its links.
+
+        Both happen in one transaction, so a crash never loses the links of a
+        finished page. Finishing also extends this worker's other leases.
+
+        Args:
+            url (str): Canonical URL that was crawled
+            links (list): Canonical links found on the page
+            depth (int): Depth of the links
+            max_depth (int): Links deeper than this are not queued
+
+        Returns:
+            int: Links that were new to the crawl
+        """
+        now = time.time()
+        with self.transaction() as conn:
+            row = conn.execute("SELECT state FROM urls WHERE url = ?", (url,)).fetchone()
+            if row and row[0] == QUEUED:
+                # The lease expired and the URL was requeued meanwhile; it counts against the budget again
+                conn.execute("UPDATE crawl SET pages_claimed = pages_claimed + 1")
+            conn.execute("UPDATE urls SET state = ?, worker = NULL, lease_expires = NULL WHERE url = ?",
+                         (DONE, url))
+            added = self.insert(conn, [(link, depth, None) for link in links]) if depth <= max_depth else 0
+            conn.execute("UPDATE urls SET lease_expires = MAX(lease_expires, ?) WHERE state = ? AND worker = ?",
+                         (now + LEASE_SECONDS, LEASED, self.worker))
+            conn.execute("UPDATE workers SET heartbeat = ?, pages = pages + 1 WHERE worker = ?", (now, self.worker))
+        return added
+
+    def claim_content(self, url, page_hash):
+        """
+        Register a page body by its hash unless another URL already has it.
+
+        Args:
+            url (str): Canonical URL
+            page_hash (str): Content hash of the body
+
+        Returns:
+            str: URL that first claimed the same body, or None
+        """
+        with self.transaction() as conn:
+            # A page whose body changed releases its old hash
+            conn.execute("DELETE FROM contents WHERE url = ? AND content_hash != ?", (url, page_hash))
+            conn.execute("INSERT OR IGNORE INTO contents (content_hash, url) VALUES (?, ?)", (page_hash, url))
+            original = conn.execute("SELECT url FROM contents WHERE content_hash = ?", (page_hash,)).fetchone()[0]
+        return original if original != url else None
+
+    def release(self, status="stopped"):
+        """
+        Requeue this worker's leases (on shutdown).
+
+        Args:
+            status (str): Worker status to record, e.g. "finished"
+
+        Returns:
+            int: URLs given back
+        """
+        with self.transaction() as conn:
+            released = conn.execute("UPDATE urls SET state = ?, worker = NULL, lease_expires = NULL "
+                                    "WHERE state = ? AND worker = ?", (QUEUED, LEASED, self.worker)).rowcount
+            conn.execute("UPDATE crawl SET pages_claimed = pages_claimed - ?", (released,))
+            conn.execute("UPDATE workers SET heartbeat = ?, status = ? WHERE worker = ?",
+                         (time.time(), status, self.worker))
+        return released
+
+    def finished(self):
+        """
+        Tell an idle worker whether to stop.
+
+        Returns:
+            bool: True once the page budget is used up, or the crawl is seeded
+                and no URL is queued or leased
+        """
+        settings = self.settings()
+        if settings["pages_claimed"] >= settings["page_limit"]:
+            return True
+        if not settings["seeded"]:
+            return False
+        return self.conn.execute("SELECT NOT EXISTS (SELECT 1 FROM urls WHERE state IN (?, ?))",
+                                 (QUEUED, LEASED)).fetchone()[0] == 1
+
+    def stats(self):
+        """
+        Crawl-wide counts for the summary.
+
+        Returns:
+            dict: URLs per state, page budget and pages per worker
+        """
+        counts = dict(self.conn.execute("SELECT state, COUNT(*) FROM urls GROUP BY state").fetchall())
+        settings = self.settings() or {}
+        return {
+            **{name: counts.get(state, 0) for state, name in STATE_NAMES.items()},
+            "page_limit": settings.get("page_limit"),
+            "pages_claimed": settings.get("pages_claimed"),
+            "workers": {worker: {"pages": pages, "status": status}
+                        for worker, pages, status in self.conn.execute(
+                            "SELECT worker, pages, status FROM workers ORDER BY worker")},
+        }
+
+    def close(self):
+        self.conn.close()
@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Compact URL sets and the visited-URL log of the web crawler.
+URLs are stored as 64-bit fingerprints in an open-addressing hash table
+backed by a flat ``array('Q')`` (16-32 bytes per URL instead of a few hundred
+for a set of strings). Very large crawls can cap that table and spill older
+fingerprints into a memory-mapped Bloom filter on disk. The URLs themselves
+are streamed to a log file instead of being kept in memory or written into
+_crawl_summary.json.
+"""
+
+import hashlib
+import math
+import mmap
+import os
+from array import array
+from collections import Counter
+
+URL_LOG_FILE = "_crawl_urls.log"  # Streamed "<kind>\t<url>" lines inside the output folder
+VISITED_BLOOM_FILE = "_crawl_visited.bloom"  # Bloom tier of the visited set
+SEEN_BLOOM_FILE = "_crawl_seen.bloom"  # Bloom tier of the frontier's seen set
+INITIAL_SLOTS = 1024  # Starting hash table size (power of two)
+MAX_LOAD = 0.5  # The table doubles when it is fuller than this
+MEMORY_LIMIT = 1 << 19  # Fingerprints held in memory before spilling into the Bloom tier (8 MiB table)
+BLOOM_ERROR_RATE = 0.001  # False-positive rate the Bloom tier is sized for
+
+VISITED = "visited"  # URL log kinds
+UNCHANGED = "unchanged"
+DUPLICATE = "duplicate"
+URL_KINDS = (VISITED, UNCHANGED, DUPLICATE)
+
+MASK64 = (1 << 64) - 1
+
+
+def url_fingerprint(url):
+    """
+    Hash a canonical URL to a non-zero 64-bit integer.
+
+    Two of ten million URLs collide with a probability of about 3e-6.
+
+    Args:
+        url (str): Canonical URL
+
+    Returns:
+        int: Fingerprint (0 is reserved for empty table slots)
+    """
+    return int.from_bytes(hashlib.blake2b(url.encode('utf-8'), digest_size=8).digest(), 'little') or 1
+
+
+class BloomFilter:
+    """
+    Bloom filter over URL fingerprints in a memory-mapped file.
+
+    The k probe positions are derived from the fingerprint by double hashing,
+    so no further hashing is needed. The file is scratch space: it is
+    recreated for every run and rebuilt from the URL log on resume.
+    """
+
+    def __init__(self, path, capacity, error_rate=BLOOM_ERROR_RATE):
+        """
+        Args:
+            path (str): File backing the bit array
+            capacity (int): Fingerprints the filter is sized for
+            error_rate (float): False-positive rate at ``capacity`` entries
+        """
+        capacity = max(1, capacity)
+        bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.size = (bits + 63) // 64 * 64
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.path = path
+        self.count = 0
+        with open(path, 'wb') as f:
+            f.truncate(self.size // 8)
+        self.file = open(path, 'r+b')
+        self.bits = mmap.mmap(self.file.fileno(), self.size // 8)
+
+    def positions(self, fingerprint):
+        step = ((fingerprint >> 32) | (fingerprint << 32)) & MASK64 | 1
+        return ((fingerprint + i * step) % self.size for i in range(self.hashes))
+
+    def add(self, fingerprint):
+        bits = self.bits
+        for position in self.positions(fingerprint):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, fingerprint):
+        bits = self.bits
+        for position in self.positions(fingerprint):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def error_rate(self):
+        """Expected false-positive rate at the current fill."""
+        return (1 - math.exp(-self.hashes * self.count / self.size)) ** self.hashes
+
+    def close(self):
+        """Unmap and delete the backing file."""
+        self.bits.close()
+        self.file.close()
+        os.remove(self.path)
+
+
+class FingerprintSet:
+    """
+    Set of canonical URLs stored as 64-bit fingerprints.
+
+    Open addressing with linear probing in a flat ``array('Q')``; empty slots
+    hold 0. With a Bloom tier the table stops growing at ``memory_limit``
+    fingerprints: it is then emptied into the filter, so memory stays bounded
+    while lookups of spilled URLs may return a false positive at the
+    filter's error rate.
+    """
+
+    def __init__(self, bloom=None, memory_limit=MEMORY_LIMIT):
+        """
+        Args:
+            bloom (BloomFilter): Disk tier (None = keep every fingerprint in memory)
+            memory_limit (int): Fingerprints held in memory before spilling into ``bloom``
+        """
+        self.bloom = bloom
+        self.memory_limit = memory_limit
+        self.clear()
+
+    def clear(self):
+        self.slots = array('Q', [0]) * INITIAL_SLOTS
+        self.mask = INITIAL_SLOTS - 1
+        self.used = 0  # Fingerprints in the table
+        self.spilled = 0  # Fingerprints moved into the Bloom tier
+
+    def slot(self, fingerprint):
+        """Index of ``fingerprint`` in the table, or of the empty slot it would go to."""
+        slots, mask = self.slots, self.mask
+        i = fingerprint & mask
+        while slots[i] and slots[i] != fingerprint:
+            i = (i + 1) & mask
+        return i
+
+    def add(self, url):
+        """
+        Add a URL.
+
+        Returns:
+            bool: True if the URL was not in the set yet
+        """
+        fingerprint = url_fingerprint(url)
+        i = self.slot(fingerprint)
+        if self.slots[i] or (self.bloom is not None and fingerprint in self.bloom):
+            return False
+        self.slots[i] = fingerprint
+        self.used += 1
+        if self.bloom is not None and self.used >= self.memory_limit:
+            self.spill()
+        elif self.used > len(self.slots) * MAX_LOAD:
+            self.resize(len(self.slots) * 2)
+        return True
+
+    def resize(self, size):
+        old = self.slots
+        self.slots = array('Q', [0]) * size
+        self.mask = size - 1
+        for fingerprint in old:
+            if fingerprint:
+                self.slots[self.slot(fingerprint)] = fingerprint
+
+    def spill(self):
+        """Move every in-memory fingerprint into the Bloom tier."""
+        for fingerprint in self.slots:
+            if fingerprint:
+                self.bloom.add(fingerprint)
+        self.spilled += self.used
+        size = len(self.slots)
+        self.slots = array('Q', [0]) * size
+        self.used = 0
+
+    def __contains__(self, url):
+        fingerprint = url_fingerprint(url)
+        if self.slots[self.slot(fingerprint)]:
+            return True
+        return self.bloom is not None and fingerprint in self.bloom
+
+    def __len__(self):
+        return self.used + self.spilled
+
+    @property
+    def nbytes(self):
+        """Bytes held in memory by the table."""
+        return self.slots.itemsize * len(self.slots)
+
+    def close(self):
+        if self.bloom is not None:
+            self.bloom.close()
+
+
+class VisitedStore:
+    """
+    Visited set of a crawl plus the streamed URL log.
+
+    Every visited URL is appended to URL_LOG_FILE as it is crawled, followed
+    by an ``unchanged`` or ``duplicate`` line when the page turned out to be
+    one. Checkpoints record the log offset and counts instead of the URLs;
+    resuming replays the log up to that offset and rewrites it without the
+    lines after the offset or of pages the checkpoint re-queues.
+    """
+
+    def __init__(self, output_folder, bloom_capacity=None):
+        """
+        Args:
+            output_folder (str): Folder the URL log (and Bloom file) is written to
+            bloom_capacity (int): Expected URLs; enables the Bloom tier when set
+        """
+        self.log_path = os.path.join(output_folder, URL_LOG_FILE)
+        bloom = BloomFilter(os.path.join(output_folder, VISITED_BLOOM_FILE), bloom_capacity) if bloom_capacity else None
+        self.urls = FingerprintSet(bloom)
+        self.counts = Counter({kind: 0 for kind in URL_KINDS})
+        self.log = None
+
+    def start(self):
+        """Begin a new crawl with an empty URL log."""
+        self.open(0)
+
+    def open(self, offset):
+        if self.log:
+            self.log.close()
+        mode = 'r+b' if os.path.exists(self.log_path) else 'wb'
+        with open(self.log_path, mode) as f:
+            f.truncate(offset)
+        self.log = open(self.log_path, 'ab')
+
+    def restore(self, state, pending, mark_seen=None):
+        """
+        Rebuild the set and counts from the URL log of a checkpoint.
+
+        Args:
+            state (dict): Value returned by ``checkpoint()``
+            pending (set): URLs the checkpoint re-queues; they do not count as visited
+            mark_seen (callable): Called with every restored visited URL
+        """
+        offset = state["offset"]
+        tmp_path = f"{self.log_path}.tmp"
+        with open(tmp_path, 'wb') as out:
+            if os.path.exists(self.log_path):
+                with open(self.log_path, 'rb') as f:
+                    for line in f:
+                        if f.tell() > offset:
+                            break
+                        kind, url = line.decode('utf-8').rstrip('\n').split('\t', 1)
+                        if url in pending:
+                            continue
+                        if kind == VISITED:
+                            self.urls.add(url)
+                            if mark_seen:
+                                mark_seen(url)
+                        self.counts[kind] += 1
+                        out.write(line)
+            offset = out.tell()
+        os.replace(tmp_path, self.log_path)
+        self.open(offset)
+
+    def add(self, url):
+        """
+        Mark a URL visited.
+
+        Returns:
+            bool: True if it had not been visited before
+        """
+        if not self.urls.add(url):
+            return False
+        self.record(VISITED, url)
+        return True
+
+    def record(self, kind, url):
+        """Append a ``kind`` line for ``url`` to the log and count it."""
+        self.counts[kind] += 1
+        if self.log:
+            self.log.write(f"{kind}\t{url}\n".encode('utf-8'))
+
+    def __contains__(self, url):
+        return url in self.urls
+
+    def __len__(self):
+        return self.counts[VISITED]
+
+    def checkpoint(self):
+        """
+        Flush the log and describe the state to put into a checkpoint.
+
+        Returns:
+            dict: Log offset and counts
+        """
+        offset = 0
+        if self.log:
+            self.log.flush()
+            offset = self.log.tell()
+        return {"log": URL_LOG_FILE, "offset": offset, "counts": dict(self.counts)}
+
+    def summary(self, extra_bytes=0):
+        """
+        Counts and memory use for _crawl_summary.json.
+
+        Args:
+            extra_bytes (int): Memory of related sets to include, e.g. the frontier's seen set
+
+        Returns:
+            dict: Counts, URL log name and bytes per URL
+        """
+        memory = self.urls.nbytes + extra_bytes
+        bloom = self.urls.bloom
+        return {
+            **self.counts,
+            "url_log": URL_LOG_FILE,
+            "memory_bytes": memory,
+            "bytes_per_url": round(memory / len(self), 1) if len(self) else None,
+            "bloom": {
+                "file_bytes": bloom.size // 8,
+                "hashes": bloom.hashes,
+                "spilled": self.urls.spilled,
+                "error_rate": round(bloom.error_rate(), 6),
+            } if bloom is not None else None,
+        }
+
+    def close(self):
+        if self.log:
+            self.log.close()
+            self.log = None
+        self.urls.close()
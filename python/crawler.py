@@ -5,13 +5,33 @@ Crawls websites and saves content to markdown files with configurable URL filter
 """
 
 import requests
+import hashlib
 import os
 import re
 import time
 import argparse
+import asyncio
+import signal
+import subprocess
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
 from urllib.parse import urljoin, urlparse, unquote
-from bs4 import BeautifulSoup
+from crawl_frontier import Frontier, canonicalize_url
+from crawl_manifest import CrawlManifest, content_hash
+from crawl_archive import ARCHIVE_FOLDER, PageArchive
+from crawl_checkpoint import CrawlCheckpoint
+from crawl_dedup import DuplicateDetector, simhash
+from crawl_discovery import ROBOTS_AGENT, fetch_robots, robots_origin, sitemap_pages
+from crawl_fetch import MAX_PAGE_BYTES, PageSkipped, read_body
+from crawl_ingest import DB_PATH, CrawlIngester
+from crawl_markdown import html_to_markdown, parse_html, resolve_parser
+from crawl_metrics import STAGES, CrawlMetrics, start_profiler
+from crawl_pipeline import PARSE_WORKERS, STAGE_QUEUE_SIZE, convert_page
+from crawl_shared import (FRONTIER_DB, LEASE_BATCH, POLL_INTERVAL, WORKERS_FOLDER, SharedFrontier,
+                          default_worker_id, merge_manifest_entries, merge_worker_manifests, remove_frontier)
+from crawl_visited import (DUPLICATE, SEEN_BLOOM_FILE, UNCHANGED, BloomFilter, FingerprintSet,
+                           VisitedStore)
 from datetime import datetime
 import json
 
@@ -22,9 +42,55 @@ MAX_DEPTH = 3  # Maximum crawling depth
 DELAY_BETWEEN_REQUESTS = 1  # Delay in seconds between requests
 MAX_PAGES = 100  # Maximum number of pages to crawl
 TIMEOUT = 30  # Request timeout in seconds
+CONCURRENCY = 1  # Number of concurrent fetch workers (1 = sequential crawl)
+HOST_BURST = 2  # Requests a single host may receive back-to-back before pacing kicks in
+CHECKPOINT_INTERVAL = 25  # Pages crawled between checkpoints
+HTML_PARSER = "auto"  # BeautifulSoup backend: "auto" (lxml if installed), "lxml" or "html.parser"
+MAX_FILENAME_LENGTH = 120  # Longer names are truncated (and disambiguated by a URL hash)
+
+
+class HostRateLimiter:
+    """
+    Per-host token bucket used by the async crawl engine.
+
+    Each host gets a bucket that refills at ``1 / delay`` tokens per second and
+    holds at most ``burst`` tokens, so requests to one host are paced while
+    requests to different hosts never wait on each other.
+    """
+
+    def __init__(self, delay, burst=HOST_BURST):
+        """
+        Args:
+            delay (float): Minimum average interval between requests to one host
+            burst (int): Maximum number of tokens a host bucket can hold
+        """
+        self.rate = 1.0 / delay if delay > 0 else 0
+        self.burst = max(1, burst)
+        self.buckets = {}  # host -> (tokens, last_refill)
+        self.locks = {}
+
+    async def acquire(self, host):
+        """Wait until a request to ``host`` is allowed."""
+        if not self.rate:
+            return
+
+        lock = self.locks.setdefault(host, asyncio.Lock())
+        async with lock:
+            while True:
+                now = time.monotonic()
+                tokens, last_refill = self.buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - last_refill) * self.rate)
+                if tokens >= 1:
+                    self.buckets[host] = (tokens - 1, now)
+                    return
+                self.buckets[host] = (tokens, now)
+                await asyncio.sleep((1 - tokens) / self.rate)
+
 
 class WebCrawler:
-    def __init__(self, base_url, url_filter_pattern, output_folder=OUTPUT_FOLDER):
+    def __init__(self, base_url, url_filter_pattern, output_folder=OUTPUT_FOLDER, incremental=True,
+                 parser=HTML_PARSER, ingest_db=None, dedup=True, events=True, visited_bloom=None,
+                 robots=True, sitemaps=True, max_page_bytes=MAX_PAGE_BYTES, archive=None, worker=None):
         """
         Initialize the web crawler.
         
@@ -32,20 +98,49 @@ class WebCrawler:
             base_url (str): The starting URL to crawl from
             url_filter_pattern (str): Pattern to filter URLs (only URLs starting with this will be crawled)
             output_folder (str): Subfolder name within BASE_FOLDER
+            incremental (bool): Reuse the crawl manifest to skip pages that have not changed
+            parser (str): HTML parser backend ("auto", "lxml" or "html.parser")
+            ingest_db (str): Also chunk pages into this crawl_vectors.db (None = markdown files only)
+            dedup (bool): Skip saving and expanding pages that duplicate or nearly duplicate a kept page
+            events (bool): Log every stage timing to _crawl_events.jsonl
+            visited_bloom (int): Expected number of URLs; caps the in-memory visited and
+                seen sets and spills older fingerprints into on-disk Bloom filters
+            robots (bool): Honor robots.txt disallow rules and Crawl-delay
+            sitemaps (bool): Seed the frontier from the sitemaps before crawling
+            max_page_bytes (int): Abort pages whose decoded body is larger than this
+            archive (str): Append pages to compressed pack files in _archive/ with this
+                codec ("auto", "zstd" or "gzip") instead of writing .md files
+            worker (str): Worker id in a shared-frontier crawl; the manifest, URL log,
+                metrics and summary then go to _workers/<worker>/ in the output folder
         """
         self.base_url = base_url
         self.url_filter_pattern = url_filter_pattern
+        self.incremental = incremental
+        self.parser = resolve_parser(parser)
+        self.respect_robots = robots
+        self.max_page_bytes = max_page_bytes
+        self.use_sitemaps = sitemaps
+        self.robots = {}  # origin -> RobotsPolicy
+        self.sitemap_lastmod = {}  # canonical_url -> <lastmod> from the sitemaps
+        self.request_delay = DELAY_BETWEEN_REQUESTS  # Raised to the robots.txt Crawl-delay by read_robots
         
         # Create folder structure: BASE_FOLDER/output_folder (no website subfolder)
         self.output_folder = os.path.join(BASE_FOLDER, output_folder)
         
-        self.visited_urls = set()
-        self.to_visit = []
+        # Crawl state files; every worker of a shared-frontier crawl keeps its own
+        self.worker = worker
+        self.shared = None  # SharedFrontier while crawl_shared runs
+        self.state_folder = os.path.join(self.output_folder, WORKERS_FOLDER, worker) if worker else self.output_folder
+        
+        self.in_progress = {}  # canonical_url -> depth of pages being fetched
+        self.pages_crawled = 0
+        self.last_checkpoint = 0
         self.session = requests.Session()
         
-        # Set up session headers to mimic a real browser
+        # Set up session headers to mimic a real browser; the robots.txt token identifies the crawler in logs
         self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                          f'Chrome/91.0.4472.124 Safari/537.36 {ROBOTS_AGENT}',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
@@ -58,6 +153,32 @@ class WebCrawler:
         
         # Create website info file
         self.create_website_info()
+        os.makedirs(self.state_folder, exist_ok=True)
+        
+        # Stage timers, response counters and latency histograms
+        self.metrics = CrawlMetrics(self.state_folder, events=events)
+        
+        # Visited and seen URLs are kept as 64-bit fingerprints; the URLs go to _crawl_urls.log
+        self.visited = VisitedStore(self.state_folder, bloom_capacity=visited_bloom)
+        seen = FingerprintSet(BloomFilter(os.path.join(self.state_folder, SEEN_BLOOM_FILE), visited_bloom)) \
+            if visited_bloom else None
+        self.frontier = Frontier(seen)
+        
+        # Validators, hashes and links from previous crawls of this folder
+        self.manifest = CrawlManifest(self.state_folder)
+        if worker:
+            # Workers may get any URL of the crawl, so start from the merged crawl manifest
+            merge_manifest_entries(self.manifest.entries, CrawlManifest(self.output_folder).entries)
+        self.checkpoint = CrawlCheckpoint(self.state_folder, self.base_url, self.url_filter_pattern)
+        self.ingester = CrawlIngester(ingest_db) if ingest_db else None
+        self.archive = PageArchive(os.path.join(self.output_folder, ARCHIVE_FOLDER), archive, writable=True) \
+            if archive else None
+        self.duplicates = DuplicateDetector() if dedup else None
+        if self.duplicates:
+            for url, entry in self.manifest.entries.items():
+                if not entry.get("duplicate_of"):
+                    fingerprint = entry.get("simhash")
+                    self.duplicates.add(url, entry["content_hash"], int(fingerprint, 16) if fingerprint else None)
         
     def create_output_directory(self):
         """Create the output directory if it doesn't exist."""
@@ -99,178 +220,416 @@ class WebCrawler:
         Returns:
             bool: True if URL is valid and matches filter pattern
         """
-        if not url or url in self.visited_urls:
+        if not url:
             return False
         
-        # Remove fragment (anchor) from URL to avoid duplicates
-        parsed = urlparse(url)
-        clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-        if parsed.query:
-            clean_url += f"?{parsed.query}"
-        
-        # Check if the clean URL was already visited
-        if clean_url in self.visited_urls and clean_url != url:
+        # Compare on the canonical URL (fragment removed) to avoid duplicates
+        canonical_url = canonicalize_url(url)
+        if canonical_url in self.visited:
             return False
             
+        return self.matches_filter(canonical_url)
+    
+    def matches_filter(self, canonical_url):
+        """
+        Check if a canonical URL matches the filter pattern and is crawlable.
+        
+        Args:
+            canonical_url (str): URL already passed through canonicalize_url
+            
+        Returns:
+            bool: True if URL matches the filter pattern and is not a skipped file type
+        """
         # Check if URL starts with the filter pattern
-        if not clean_url.startswith(self.url_filter_pattern):
+        if not canonical_url.startswith(self.url_filter_pattern):
             return False
             
         # Additional validation
+        parsed = urlparse(canonical_url)
         if not parsed.scheme or not parsed.netloc:
             return False
             
         # Skip certain file types
         skip_extensions = ['.pdf', '.jpg', '.jpeg', '.png', '.gif', '.css', '.js', '.ico', '.svg']
-        if any(clean_url.lower().endswith(ext) for ext in skip_extensions):
+        if any(canonical_url.lower().endswith(ext) for ext in skip_extensions):
             return False
             
-        return True
+        return self.robots_allowed(canonical_url)
+    
+    def robots_allowed(self, url):
+        """Check a URL against the robots.txt of its origin (allowed if none was read)."""
+        policy = self.robots.get(robots_origin(url))
+        return policy is None or policy.allowed(url)
+    
+    def crawl_origins(self):
+        """Origins of the base URL and the filter pattern, whose robots.txt and sitemaps are read."""
+        return list(dict.fromkeys(robots_origin(url) for url in (self.base_url, self.url_filter_pattern)))
+    
+    def read_robots(self):
+        """Load robots.txt of the crawl origins and raise the request delay to their Crawl-delay."""
+        self.request_delay = DELAY_BETWEEN_REQUESTS
+        if not self.respect_robots:
+            return
+        for origin in self.crawl_origins():
+            self.robots[origin] = fetch_robots(self.session, origin, TIMEOUT)
+        crawl_delay = max(policy.crawl_delay for policy in self.robots.values())
+        if crawl_delay > self.request_delay:
+            print(f"- robots.txt Crawl-delay: {crawl_delay}s")
+            self.request_delay = crawl_delay
+    
+    def seed_from_sitemaps(self):
+        """
+        Queue the sitemap URLs that pass the filter and robots.txt.
+        
+        Seeds are queued at depth 0, so pages deep in the site are reached
+        without fetching the pages that link to them.
+        
+        Returns:
+            int: Number of sitemap URLs added to the frontier
+        """
+        sitemaps = [url for policy in self.robots.values() for url in policy.sitemaps] or \
+            [f"{origin}/sitemap.xml" for origin in self.crawl_origins()]
+        found = seeded = 0
+        for url, lastmod in sitemap_pages(self.session, sitemaps, TIMEOUT):
+            found += 1
+            canonical_url = canonicalize_url(url)
+            if not self.matches_filter(canonical_url):
+                continue
+            if lastmod:
+                self.sitemap_lastmod[canonical_url] = lastmod
+            if self.frontier.push(canonical_url, 0):
+                seeded += 1
+        if found:
+            print(f"- Sitemaps: {found} URLs listed, {seeded} queued")
+        self.metrics.increment("sitemap_urls", seeded)
+        return seeded
+    
+    def lastmod_links(self, url):
+        """
+        Reuse a page whose sitemap <lastmod> is the one recorded when it was last crawled.
+        
+        Args:
+            url (str): Canonical URL
+        
+        Returns:
+            list: Cached links of the page, or None if it has to be fetched
+        """
+        lastmod = self.sitemap_lastmod.get(url)
+        entry = self.cached_entry(url) if lastmod else None
+        if not entry or entry.get("lastmod") != lastmod:
+            return None
+        print(f" Unchanged (sitemap lastmod): {url}")
+        self.metrics.increment("lastmod_skipped")
+        self.visited.record(UNCHANGED, url)
+        return entry["links"]
     
     def extract_links(self, soup, current_url):
         """
-        Extract all valid links from the current page.
+        Extract all links from the current page that match the crawl filter.
+        
+        Already visited URLs are kept so the list can be cached in the crawl
+        manifest; the frontier drops them when they are enqueued.
         
         Args:
             soup (BeautifulSoup): Parsed HTML content
             current_url (str): Current page URL for resolving relative links
             
         Returns:
-            list: List of valid URLs to crawl
+            list: List of canonical URLs matching the filter, in document order
         """
-        links = []
+        links = {}
         
         for link in soup.find_all('a', href=True):
-            href = link['href']
-            absolute_url = urljoin(current_url, href)
-            
-            # Remove fragment (anchor) from URL to avoid duplicates
-            parsed = urlparse(absolute_url)
-            clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                clean_url += f"?{parsed.query}"
-            
-            if self.is_valid_url(clean_url):
-                links.append(clean_url)
+            canonical_url = canonicalize_url(urljoin(current_url, link['href']))
+            if canonical_url not in links and self.matches_filter(canonical_url):
+                links[canonical_url] = None
                 
-        return list(set(links))  # Remove duplicates
+        return list(links)
     
     def html_to_markdown(self, soup, url):
         """
         Convert HTML content to Markdown format.
         
         Args:
-            soup (BeautifulSoup): Parsed HTML content
+            soup (BeautifulSoup): Parsed HTML content (left unmodified)
             url (str): Source URL
             
         Returns:
             str: Markdown formatted content
         """
-        # Extract title
-        title = "Untitled"
-        if soup.title:
-            title = soup.title.get_text().strip()
-        elif soup.find('h1'):
-            title = soup.find('h1').get_text().strip()
-        
-        # Remove script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-        
-        # Start building markdown content
-        markdown_content = f"# {title}\n\n"
-        markdown_content += f"**Source URL:** {url}\n"
-        markdown_content += f"**Crawled on:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        markdown_content += "---\n\n"
-        
-        # Extract main content
-        main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=re.compile('content|main')) or soup.body
-        
-        if main_content:
-            # Process headings
-            for i, heading in enumerate(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                for tag in main_content.find_all(heading):
-                    level = '#' * (i + 1)
-                    tag.replace_with(f"\n{level} {tag.get_text().strip()}\n\n")
-            
-            # Process paragraphs
-            for p in main_content.find_all('p'):
-                text = p.get_text().strip()
-                if text:
-                    p.replace_with(f"{text}\n\n")
-            
-            # Process lists
-            for ul in main_content.find_all(['ul', 'ol']):
-                list_items = []
-                for li in ul.find_all('li'):
-                    item_text = li.get_text().strip()
-                    if item_text:
-                        prefix = "- " if ul.name == 'ul' else "1. "
-                        list_items.append(f"{prefix}{item_text}")
-                
-                if list_items:
-                    ul.replace_with("\n" + "\n".join(list_items) + "\n\n")
-            
-            # Process code blocks
-            for code in main_content.find_all('code'):
-                code_text = code.get_text()
-                if code.parent.name == 'pre':
-                    code.parent.replace_with(f"\n```\n{code_text}\n```\n\n")
-                else:
-                    code.replace_with(f"`{code_text}`")
-            
-            # Process blockquotes
-            for blockquote in main_content.find_all('blockquote'):
-                quote_text = blockquote.get_text().strip()
-                if quote_text:
-                    blockquote.replace_with(f"\n> {quote_text}\n\n")
-            
-            # Get the remaining text
-            content_text = main_content.get_text()
-            
-            # Clean up the text
-            content_text = re.sub(r'\n\s*\n\s*\n', '\n\n', content_text)  # Remove excessive newlines
-            content_text = re.sub(r'[ \t]+', ' ', content_text)  # Normalize spaces
-            
-            markdown_content += content_text.strip()
-        
-        return markdown_content
+        return html_to_markdown(soup, url)
     
-    def save_to_markdown(self, content, url):
+    def markdown_filename(self, url):
         """
-        Save content to a markdown file.
-        
+        Build the collision-free markdown filename a URL is saved under.
+
+        The name is the URL path below the filter pattern (plus the query),
+        sanitized. A name that needed any character replaced, including the
+        ``/`` between nested segments, gets a short hash of the URL appended,
+        so ``/docs/a/index`` and ``/docs/b/index`` never share a file, while a
+        plain ``/docs/SWC-100/`` keeps the readable ``SWC-100.md``.
+
         Args:
-            content (str): Markdown content to save
-            url (str): Source URL for generating filename
+            url (str): Canonical source URL
+
+        Returns:
+            str: Filename relative to the output folder
         """
-        # Generate filename from URL
         parsed_url = urlparse(url)
-        path_parts = parsed_url.path.strip('/').split('/')
-        
-        if path_parts and path_parts[-1]:
-            filename = path_parts[-1]
+        filter_path = urlparse(self.url_filter_pattern).path
+        relative = parsed_url.path
+        if relative.startswith(filter_path):
+            relative = relative[len(filter_path):]
+        relative = relative.strip('/')
+
+        if not relative and not parsed_url.query:
+            # The filter root is a single page; name it after the site as before
+            filename = re.sub(r'[^\w\-_.]', '_', parsed_url.netloc.replace('.', '_'))
         else:
-            filename = parsed_url.netloc.replace('.', '_')
-        
-        # Clean filename
-        filename = re.sub(r'[^\w\-_.]', '_', filename)
+            name = relative + (f"?{parsed_url.query}" if parsed_url.query else "")
+            filename = re.sub(r'[^\w\-_.]', '_', name)[:MAX_FILENAME_LENGTH]
+            if filename != name:
+                url_hash = hashlib.sha1(url.rstrip('/').encode('utf-8')).hexdigest()[:10]
+                filename = f"{filename}-{url_hash}"
         if not filename.endswith('.md'):
             filename += '.md'
+        return filename
+    
+    def save_to_markdown(self, content, url):
+        """
+        Save content to a markdown file, or append it to the archive in archive mode.
         
+        Args:
+            content (str): Markdown content to save
+            url (str): Source URL for generating filename
+
+        Returns:
+            str: Path of the markdown file (the path it would be exported to in
+                archive mode), or None if saving failed
+        """
         # Use the filename directly (will replace if exists)
+        filename = self.markdown_filename(url)
         filepath = os.path.join(self.output_folder, filename)
         
+        if self.archive is not None:
+            try:
+                size = self.archive.add(url, filename, content)
+                self.metrics.saved(size)
+                print(f" Archived: {filename}")
+                return filepath
+            except Exception as e:
+                print(f" Error archiving {filename}: {e}")
+                return None
+        
         # Save file (will overwrite if exists)
         try:
             with open(filepath, 'w', encoding='utf-8') as f:
                 f.write(content)
+            self.metrics.saved(len(content.encode('utf-8')))
             print(f" Saved: {filename}")
             return filepath
         except Exception as e:
             print(f" Error saving {filename}: {e}")
             return None
     
+    def store_page(self, content, url):
+        """
+        Save a converted page and, in ingest mode, queue it for the database.
+
+        Args:
+            content (str): Markdown content to save
+            url (str): Source URL
+        """
+        with self.metrics.stage("save", url):
+            filepath = self.save_to_markdown(content, url)
+            if filepath and self.ingester:
+                self.ingester.add_page(filepath, content)
+
+    def ingest_unchanged(self, url):
+        """Ingest the saved markdown of an unchanged page if the database does not have it yet."""
+        if not self.ingester:
+            return
+        filepath = os.path.join(self.output_folder, self.markdown_filename(url))
+        if self.archive is None:
+            self.ingester.add_file(filepath, only_new=True)
+        elif not self.ingester.skip_known(filepath):
+            page = self.archive.get(url)
+            if page:
+                self.ingester.add_page(filepath, page.markdown)
+
+    def has_saved_page(self, url):
+        """Check whether a page's markdown is on disk (or in the archive in archive mode)."""
+        if self.archive is not None:
+            return url in self.archive
+        return os.path.exists(os.path.join(self.output_folder, self.markdown_filename(url)))
+
+    def fetch_page(self, url):
+        """
+        Download a single page.
+
+        The body is streamed and only read if the headers announce HTML of an
+        acceptable size (see crawl_fetch.read_body).
+
+        Args:
+            url (str): URL to fetch
+
+        Returns:
+            requests.Response: Successful response
+
+        Raises:
+            requests.RequestException: On network errors or non-2xx status codes
+            PageSkipped: For non-HTML, oversized or overly compressed bodies
+        """
+        print(f"Crawling: {url}")
+        headers = {}
+        if self.cached_entry(url):
+            headers = self.manifest.conditional_headers(url)
+        with self.metrics.stage("fetch", url) as fields:
+            response = self.session.get(url, timeout=TIMEOUT, headers=headers, stream=True)
+            try:
+                read_body(response, self.max_page_bytes)
+            except PageSkipped as e:
+                self.metrics.increment(f"skipped_{e.reason}")
+                raise
+            finally:
+                fields.update(self.metrics.response(response))
+            response.raise_for_status()
+        return response
+
+    def cached_entry(self, url):
+        """
+        Return the manifest entry for a URL if its markdown file can be reused.
+
+        Args:
+            url (str): Canonical URL
+
+        Returns:
+            dict: Manifest entry, or None when the page must be fully processed
+        """
+        if not self.incremental:
+            return None
+        entry = self.manifest.get(url)
+        # Duplicates have no file of their own
+        if entry and (entry.get("duplicate_of") or self.has_saved_page(url)):
+            return entry
+        return None
+
+    def process_response(self, url, response):
+        """
+        Turn a fetch result into outgoing links, skipping unchanged pages.
+
+        A 304 or a body whose hash matches the manifest reuses the cached link
+        list without parsing or rewriting the markdown file.
+
+        Args:
+            url (str): Canonical URL the response belongs to
+            response (requests.Response): Response from fetch_page
+
+        Returns:
+            list: List of canonical URLs found on this page
+        """
+        page_hash, links = self.reuse_unchanged(url, response)
+        if links is not None:
+            self.ingest_unchanged(url)
+            self.manifest.update(url, response, page_hash, links, lastmod=self.sitemap_lastmod.get(url))
+            return links
+
+        original = self.duplicates.find_exact(url, page_hash) if self.duplicates else None
+        if not original and self.duplicates and self.shared:
+            # Pages kept by other workers are only known to the shared frontier
+            original = self.shared.claim_content(url, page_hash)
+        fingerprint = None
+        if not original:
+            links, fingerprint, original = self.process_page(url, response.content)
+        return self.finish_page(url, response, page_hash, links, fingerprint, original)
+
+    def finish_page(self, url, response, page_hash, links, fingerprint=None, duplicate_of=None):
+        """
+        Record a processed page in the manifest and the duplicate registry.
+
+        Args:
+            url (str): Canonical URL
+            response (requests.Response): Response from fetch_page
+            page_hash (str): Content hash of the body
+            links (list): Outgoing links of the page
+            fingerprint (int): SimHash of the converted page, if computed
+            duplicate_of (str): URL of the kept page this one duplicates
+
+        Returns:
+            list: Links to expand (none for a duplicate)
+        """
+        if duplicate_of:
+            print(f" Duplicate of {duplicate_of}: {url}")
+            self.metrics.increment("duplicates")
+            self.visited.record(DUPLICATE, url)
+            self.duplicates.remove(url)
+            links = []
+        elif self.duplicates:
+            self.duplicates.add(url, page_hash, fingerprint)
+        self.manifest.update(url, response, page_hash, links,
+                             simhash=f"{fingerprint:016x}" if fingerprint is not None else None,
+                             duplicate_of=duplicate_of, lastmod=self.sitemap_lastmod.get(url))
+        return links
+
+    def reuse_unchanged(self, url, response):
+        """
+        Check a response against the manifest.
+
+        Args:
+            url (str): Canonical URL the response belongs to
+            response (requests.Response): Response from fetch_page
+
+        Returns:
+            tuple: (content hash, cached links) where cached links is None if
+                the page changed and has to be parsed and saved
+        """
+        entry = self.cached_entry(url)
+        if entry and response.status_code == 304:
+            print(f" Not modified: {url}")
+            self.metrics.increment("not_modified")
+            self.visited.record(UNCHANGED, url)
+            return entry["content_hash"], entry["links"]
+
+        page_hash = content_hash(response.content)
+        if entry and entry["content_hash"] == page_hash:
+            print(f" Unchanged: {url}")
+            self.metrics.increment("unchanged")
+            self.visited.record(UNCHANGED, url)
+            return page_hash, entry["links"]
+        return page_hash, None
+
+    def process_page(self, url, content):
+        """
+        Parse downloaded HTML, save it as markdown and collect outgoing links.
+
+        Near duplicates of a page already kept are neither saved nor expanded.
+
+        Args:
+            url (str): URL the content was fetched from
+            content (bytes): Raw HTML body
+
+        Returns:
+            tuple: (links found on this page, SimHash fingerprint, URL of the
+                page this one nearly duplicates or None)
+        """
+        # Parse HTML
+        with self.metrics.stage("parse", url):
+            soup = parse_html(content, self.parser)
+
+        # Convert to markdown and save
+        with self.metrics.stage("convert", url):
+            markdown_content = self.html_to_markdown(soup, url)
+        fingerprint = simhash(markdown_content) if self.duplicates else None
+        original = self.duplicates.find_near(url, fingerprint) if self.duplicates else None
+        if original:
+            return [], fingerprint, original
+        self.store_page(markdown_content, url)
+
+        # Extract links for further crawling
+        with self.metrics.stage("links", url):
+            links = self.extract_links(soup, url)
+        return links, fingerprint, None
+
     def crawl_page(self, url):
         """
         Crawl a single page and extract content and links.
@@ -282,27 +641,9 @@ class WebCrawler:
             list: List of new URLs found on this page
         """
         try:
-            # Remove fragment from URL for crawling but keep original for display
-            parsed = urlparse(url)
-            clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                clean_url += f"?{parsed.query}"
-            
-            print(f"Crawling: {clean_url}")
-            response = self.session.get(clean_url, timeout=TIMEOUT)
-            response.raise_for_status()
-            
-            # Parse HTML
-            soup = BeautifulSoup(response.content, 'html.parser')
-            
-            # Convert to markdown and save
-            markdown_content = self.html_to_markdown(soup, clean_url)
-            self.save_to_markdown(markdown_content, clean_url)
-            
-            # Extract links for further crawling
-            new_links = self.extract_links(soup, clean_url)
-            
-            return new_links
+            canonical_url = canonicalize_url(url)
+            response = self.fetch_page(canonical_url)
+            return self.process_response(canonical_url, response)
             
         except requests.RequestException as e:
             print(f"✗ Error crawling {url}: {e}")
@@ -311,13 +652,19 @@ class WebCrawler:
             print(f"✗ Unexpected error crawling {url}: {e}")
             return []
     
-    def crawl(self, max_pages=MAX_PAGES, max_depth=MAX_DEPTH):
+    def crawl(self, max_pages=MAX_PAGES, max_depth=MAX_DEPTH, concurrency=CONCURRENCY, resume=False,
+              parse_workers=PARSE_WORKERS):
         """
         Start the crawling process.
         
         Args:
-            max_pages (int): Maximum number of pages to crawl
+            max_pages (int): Maximum number of pages to crawl in this run
             max_depth (int): Maximum depth to crawl
+            concurrency (int): Number of concurrent fetch workers. Values above 1
+                switch to the asyncio engine with per-host rate limiting.
+            resume (bool): Continue from the last checkpoint if one exists
+            parse_workers (int): Parser processes for the pipelined engine
+                (0 = convert pages in the fetch thread pool)
         """
         print(f"Starting crawler...")
         print(f"Base URL: {self.base_url}")
@@ -325,61 +672,412 @@ class WebCrawler:
         print(f"Output folder: {self.output_folder}")
         print(f"Max pages: {max_pages}")
         print(f"Max depth: {max_depth}")
+        print(f"Concurrency: {concurrency}")
+        print(f"Parse workers: {parse_workers}")
         print("-" * 60)
         
-        # Initialize with base URL
-        self.to_visit = [(self.base_url, 0)]  # (url, depth)
-        pages_crawled = 0
+        # Initialize with base URL unless a checkpoint restored the frontier,
+        # then add the sitemap URLs that are not visited or queued yet
+        self.read_robots()
+        if not (resume and self.restore_checkpoint()):
+            self.visited.start()
+            if self.robots_allowed(self.base_url):
+                self.frontier.push(self.base_url, 0)
+            else:
+                print(f"- {self.base_url} is disallowed by robots.txt")
+        if self.use_sitemaps:
+            self.seed_from_sitemaps()
+        page_limit = self.pages_crawled + max_pages
         
-        while self.to_visit and pages_crawled < max_pages:
-            current_url, depth = self.to_visit.pop(0)
-            
-            # Clean URL for comparison
-            parsed = urlparse(current_url)
-            clean_url = f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
-            if parsed.query:
-                clean_url += f"?{parsed.query}"
+        if concurrency > 1 or parse_workers > 0:
+            asyncio.run(self.crawl_async(page_limit, max_depth, concurrency, parse_workers))
+            self.finish_crawl()
+            return
+        
+        while self.frontier and self.pages_crawled < page_limit:
+            current_url, depth = self.frontier.pop()
             
-            if clean_url in self.visited_urls or depth > max_depth:
+            if depth > max_depth or not self.visited.add(current_url):
                 continue
             
-            self.visited_urls.add(clean_url)
+            self.in_progress[current_url] = depth
+            self.pages_crawled += 1
             
-            # Crawl the page
-            new_links = self.crawl_page(clean_url)
-            pages_crawled += 1
+            # Crawl the page unless the sitemap says it has not changed
+            new_links = self.lastmod_links(current_url)
+            fetched = new_links is None
+            if fetched:
+                new_links = self.crawl_page(current_url)
+            else:
+                self.ingest_unchanged(current_url)
             
-            # Add new links to the queue (if within depth limit)
+            # Add new links to the frontier (if within depth limit)
             if depth < max_depth:
                 for link in new_links:
-                    if link not in self.visited_urls and (link, depth + 1) not in self.to_visit:
-                        self.to_visit.append((link, depth + 1))
+                    self.frontier.push(link, depth + 1)
+            del self.in_progress[current_url]
+            self.maybe_checkpoint()
             
-            # Rate limiting
-            time.sleep(DELAY_BETWEEN_REQUESTS)
+            # Rate limiting (pages reused from the sitemap lastmod were not fetched)
+            if fetched:
+                time.sleep(self.request_delay)
             
-            print(f"Progress: {pages_crawled}/{max_pages} pages, {len(self.to_visit)} in queue")
+            print(f"Progress: {self.pages_crawled}/{page_limit} pages, {len(self.frontier)} in queue")
         
-        # Save crawl summary
-        self.save_crawl_summary(pages_crawled)
+        self.finish_crawl()
+
+    def crawl_shared(self, frontier_db, max_pages=MAX_PAGES, max_depth=MAX_DEPTH):
+        """
+        Crawl as one of several workers sharing a frontier database.
+
+        The worker that claims seeding queues the base URL and the sitemap
+        URLs. Every worker then leases batches of URLs, books a request slot
+        of the URL's host before each fetch, and reports the page's links
+        back when it is done. Page and depth limits come from the database,
+        so all workers use the ones the crawl was started with.
+
+        Args:
+            frontier_db (str): SQLite frontier shared by the workers
+            max_pages (int): Page limit over all workers, if this worker starts the crawl
+            max_depth (int): Maximum depth, if this worker starts the crawl
+        """
+        self.shared = SharedFrontier(frontier_db, self.worker)
+        settings = self.shared.configure(self.base_url, self.url_filter_pattern, max_pages, max_depth)
+        if (settings["base_url"], settings["filter_pattern"]) != (self.base_url, self.url_filter_pattern):
+            raise ValueError(f"{frontier_db} belongs to a crawl of {settings['base_url']} "
+                             f"({settings['filter_pattern']})")
+        self.shared.join()
+        max_depth = settings["max_depth"]
+        print(f"Worker {self.shared.worker} joining the shared crawl in {frontier_db}")
+        print(f"Max pages (all workers): {settings['page_limit']}")
+        print(f"Max depth: {max_depth}")
+        print("-" * 60)
+
+        self.read_robots()
+        self.visited.start()
+        if self.shared.claim_seeding():
+            if self.robots_allowed(self.base_url):
+                self.frontier.push(self.base_url, 0)
+            else:
+                print(f"- {self.base_url} is disallowed by robots.txt")
+            if self.use_sitemaps:
+                self.seed_from_sitemaps()
+            seeds = [(url, depth, self.sitemap_lastmod.get(url)) for url, depth in self.frontier.queue]
+            self.frontier.queue.clear()
+            print(f"- Seeded the shared frontier with {self.shared.seed(seeds)} URLs")
+
+        while True:
+            batch = self.shared.lease(LEASE_BATCH, self.request_delay)
+            if not batch:
+                if self.shared.finished():
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+            for current_url, depth, lastmod in batch:
+                if lastmod:
+                    self.sitemap_lastmod[current_url] = lastmod
+                self.visited.add(current_url)
+                self.in_progress[current_url] = depth
+                self.pages_crawled += 1
+
+                new_links = self.lastmod_links(current_url)
+                if new_links is None:
+                    # The host's slot keeps requests request_delay apart over all workers
+                    wait = self.shared.reserve_slot(current_url, self.request_delay)
+                    if wait > 0:
+                        time.sleep(wait)
+                    new_links = self.crawl_page(current_url)
+                else:
+                    self.ingest_unchanged(current_url)
+                self.shared.complete(current_url, new_links, depth + 1, max_depth)
+                del self.in_progress[current_url]
+                self.maybe_checkpoint()
+                print(f"Progress: {self.pages_crawled} pages by {self.shared.worker}")
+
+        self.shared.release("finished")
+        self.finish_crawl()
+
+    async def crawl_async(self, page_limit, max_depth, concurrency, parse_workers=PARSE_WORKERS):
+        """
+        Crawl with a pipeline of asyncio stages connected by bounded queues.
+
+        Fetchers download pages in a thread pool under per-host rate limiting
+        (``HostRateLimiter``) instead of a global sleep. Converters turn HTML
+        into markdown and links, either in the same thread pool or, with
+        ``parse_workers``, in a process pool so parsing uses every core. A
+        writer saves the markdown files (and queues them for ingest). Full queues make the upstream stage
+        wait, which keeps the number of pages held in memory bounded.
+
+        Args:
+            page_limit (int): Stop once pages_crawled reaches this total
+            max_depth (int): Maximum depth to crawl
+            concurrency (int): Number of concurrent fetchers
+            parse_workers (int): Parser processes (0 = convert in the thread pool)
+        """
+        loop = asyncio.get_running_loop()
+        limiter = HostRateLimiter(self.request_delay)
+        ready = asyncio.Condition()
+        converters = parse_workers or concurrency
+        parse_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE * converters)
+        write_queue = asyncio.Queue(maxsize=STAGE_QUEUE_SIZE)
+
+        # Let the connection pool keep one connection per worker alive
+        adapter = HTTPAdapter(pool_connections=concurrency, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        async def page_done(url, depth, links):
+            # Cancellation skips this, leaving the page in_progress for the checkpoint
+            async with ready:
+                if depth < max_depth:
+                    for link in links:
+                        self.frontier.push(link, depth + 1)
+                del self.in_progress[url]
+                self.maybe_checkpoint()
+                ready.notify_all()
+            print(f"Progress: {self.pages_crawled}/{page_limit} pages, {len(self.frontier)} in queue")
+
+        async def fetcher(io_executor):
+            while True:
+                async with ready:
+                    # Wait while the frontier is empty but other pages may still add links
+                    await ready.wait_for(lambda: self.frontier or not self.in_progress)
+                    if not self.frontier or self.pages_crawled >= page_limit:
+                        ready.notify_all()
+                        return
+
+                    current_url, depth = self.frontier.pop()
+                    if depth > max_depth or not self.visited.add(current_url):
+                        continue
+
+                    self.in_progress[current_url] = depth
+                    self.pages_crawled += 1
+
+                cached_links = self.lastmod_links(current_url)
+                if cached_links is not None:
+                    if self.ingester:
+                        await loop.run_in_executor(io_executor, self.ingest_unchanged, current_url)
+                    await page_done(current_url, depth, cached_links)
+                    continue
+
+                try:
+                    await limiter.acquire(urlparse(current_url).netloc)
+                    response = await loop.run_in_executor(io_executor, self.fetch_page, current_url)
+                    page_hash, cached_links = self.reuse_unchanged(current_url, response)
+                except requests.RequestException as e:
+                    print(f"✗ Error crawling {current_url}: {e}")
+                    await page_done(current_url, depth, [])
+                    continue
+                except Exception as e:
+                    print(f"✗ Unexpected error crawling {current_url}: {e}")
+                    await page_done(current_url, depth, [])
+                    continue
+
+                if cached_links is not None:
+                    if self.ingester:
+                        await loop.run_in_executor(io_executor, self.ingest_unchanged, current_url)
+                    self.manifest.update(current_url, response, page_hash, cached_links,
+                                         lastmod=self.sitemap_lastmod.get(current_url))
+                    await page_done(current_url, depth, cached_links)
+                    continue
+
+                original = self.duplicates.find_exact(current_url, page_hash) if self.duplicates else None
+                if original:
+                    links = self.finish_page(current_url, response, page_hash, [], duplicate_of=original)
+                    await page_done(current_url, depth, links)
+                else:
+                    await parse_queue.put((current_url, depth, response, page_hash))
+
+        async def converter(parse_executor):
+            while True:
+                url, depth, response, page_hash = await parse_queue.get()
+                try:
+                    markdown_content, links, fingerprint, timings = await loop.run_in_executor(
+                        parse_executor, convert_page, url, response.content, self.parser, bool(self.duplicates))
+                    for stage, seconds in timings.items():
+                        self.metrics.observe(stage, seconds, url)
+                    links = [link for link in links if self.matches_filter(link)]
+                    await write_queue.put((url, depth, response, page_hash, markdown_content, links, fingerprint))
+                except Exception as e:
+                    print(f"✗ Unexpected error converting {url}: {e}")
+                    self.metrics.error("convert", url, e)
+                    await page_done(url, depth, [])
+                finally:
+                    parse_queue.task_done()
+
+        async def writer(io_executor):
+            while True:
+                url, depth, response, page_hash, markdown_content, links, fingerprint = await write_queue.get()
+                try:
+                    # The single writer sees pages in order, so concurrent copies are still caught here
+                    original = self.duplicates.find_near(url, fingerprint) if self.duplicates else None
+                    if not original:
+                        await loop.run_in_executor(io_executor, self.store_page, markdown_content, url)
+                    links = self.finish_page(url, response, page_hash, links, fingerprint, original)
+                    await page_done(url, depth, links)
+                except Exception as e:
+                    print(f"✗ Unexpected error saving {url}: {e}")
+                    self.metrics.error("save", url, e)
+                    await page_done(url, depth, [])
+                finally:
+                    write_queue.task_done()
+
+        pool = ProcessPoolExecutor(max_workers=parse_workers) if parse_workers else None
+        with ThreadPoolExecutor(max_workers=concurrency + 1) as io_executor:
+            parse_executor = pool or io_executor
+            stages = [asyncio.create_task(converter(parse_executor)) for _ in range(converters)]
+            stages.append(asyncio.create_task(writer(io_executor)))
+            try:
+                await asyncio.gather(*(fetcher(io_executor) for _ in range(concurrency)))
+                # Fetchers stop at the page limit; let pages already in the pipeline finish
+                await parse_queue.join()
+                await write_queue.join()
+            finally:
+                for task in stages:
+                    task.cancel()
+                await asyncio.gather(*stages, return_exceptions=True)
+                if pool:
+                    pool.shutdown(cancel_futures=True)
+
+    def restore_checkpoint(self):
+        """
+        Load frontier, visited set and counters from the last checkpoint.
+
+        Returns:
+            bool: True if a checkpoint was restored
+        """
+        data = self.checkpoint.load()
+        if not data:
+            print("No checkpoint to resume from, starting a new crawl")
+            return False
+
+        self.pages_crawled = data["pages_crawled"]
+        if "visited_log" in data:
+            pending = {url for url, _ in data["pending"]}
+            self.visited.restore(data["visited_log"], pending, self.frontier.mark_seen)
+        else:
+            # Version 1 checkpoints list the URLs inline
+            self.visited.start()
+            for url in data["visited"]:
+                self.visited.add(url)
+                self.frontier.mark_seen(url)
+            for url in data["unchanged"]:
+                self.visited.record(UNCHANGED, url)
+        for url, depth in data["pending"]:
+            self.frontier.push(url, depth)
+        print(f"Resuming from checkpoint saved {data['saved']}: "
+              f"{self.pages_crawled} pages crawled, {len(self.frontier)} in queue")
+        return True
+
+    def maybe_checkpoint(self):
+        """Save progress every CHECKPOINT_INTERVAL pages."""
+        if self.pages_crawled - self.last_checkpoint >= CHECKPOINT_INTERVAL:
+            self.save_progress()
+
+    def save_progress(self):
+        """
+        Checkpoint the crawl state and flush the manifest.
+
+        Pages that are still being fetched are stored as pending, not visited,
+        so a resumed crawl fetches them again.
+        """
+        # In-flight pages are in the URL log already; resuming skips them there since they are pending
+        pending = list(self.in_progress.items()) + list(self.frontier.queue)
+        if self.shared:
+            # The shared frontier is the checkpoint of a shared crawl
+            self.visited.checkpoint()
+        else:
+            self.checkpoint.save(pending, self.visited.checkpoint(), self.pages_crawled - len(self.in_progress))
+        if self.archive is not None:
+            self.archive.flush()
+        self.manifest.save()
+        if self.ingester:
+            self.ingester.flush()
+        self.metrics.write_snapshot()
+        self.last_checkpoint = self.pages_crawled
+
+    def interrupt_crawl(self):
+        """Persist partial results after an interrupt or timeout so the crawl can resume."""
+        self.save_progress()
+        if self.shared:
+            released = self.shared.release()
+            print(f"- {released} leased URLs returned to the shared frontier")
+        self.save_crawl_summary()
+        self.close()
+        print(f"- Checkpoint saved, continue with --resume")
+
+    def finish_crawl(self):
+        """Save the crawl summary and print the final report."""
+        # A drained frontier means the crawl is complete; otherwise keep a
+        # checkpoint so the next run can pick up where the page limit stopped
+        if self.frontier or self.shared:
+            self.save_progress()
+        else:
+            self.checkpoint.clear()
+            self.manifest.save()
+        if self.ingester:
+            self.ingester.flush()
+        self.save_crawl_summary()
+        shared = self.shared.stats() if self.shared else None
+        self.close()
         
         print("-" * 60)
         print(f"Crawling completed!")
-        print(f"Pages crawled: {pages_crawled}")
+        print(f"Pages crawled: {self.pages_crawled}")
+        print(f"Pages unchanged: {self.visited.counts[UNCHANGED]}")
+        print(f"Duplicates skipped: {self.visited.counts[DUPLICATE]}")
+        if self.frontier:
+            print(f"Pages remaining: {len(self.frontier)} (continue with --resume)")
+        if shared:
+            print(f"Shared frontier: {shared['done']} done, {shared['queued']} queued, "
+                  f"{shared['leased']} leased by other workers, {shared['failed']} failed")
         print(f"Files saved to: {self.output_folder}")
+        if self.archive is not None:
+            stats = self.archive.stats()
+            print(f"Archive: {stats['pages']} pages in {stats['segments']} {stats['codec']} segment(s), "
+                  f"{stats['stored_bytes']} bytes stored (ratio {stats['compression_ratio']}); "
+                  f"export with: python crawl_archive.py export {self.output_folder}")
+        stages = self.metrics.summary()["stages"]
+        print("Stage time: " + ", ".join(
+            f"{stage} {stages[stage]['total_seconds']:.2f}s (p95 {stages[stage]['p95_ms']:.0f} ms)"
+            for stage in STAGES if stages[stage]["count"]))
+        if self.ingester:
+            stats = self.ingester.stats
+            print(f"Ingested into {self.ingester.db_path}: "
+                  f"{stats['documents_inserted']} new, {stats['documents_updated']} updated, "
+                  f"{stats['documents_unchanged']} unchanged documents; "
+                  f"{stats['chunks_inserted'] + stats['chunks_updated']} chunks written, "
+                  f"{stats['chunks_unchanged']} unchanged, {stats['chunks_deleted']} deleted")
     
-    def save_crawl_summary(self, pages_crawled):
+    def close(self):
+        """Close the metrics and URL logs and the archive, and remove the Bloom filter files."""
+        if self.archive is not None:
+            self.archive.close()
+        if self.shared:
+            self.shared.close()
+        self.metrics.close()
+        self.visited.close()
+        self.frontier.seen.close()
+    
+    def save_crawl_summary(self):
         """Save a summary of the crawling session."""
         summary = {
             "crawl_date": datetime.now().isoformat(),
             "base_url": self.base_url,
             "filter_pattern": self.url_filter_pattern,
-            "pages_crawled": pages_crawled,
-            "visited_urls": list(self.visited_urls),
+            "pages_crawled": self.pages_crawled,
+            "pages_unchanged": self.visited.counts[UNCHANGED],
+            "duplicates_skipped": self.visited.counts[DUPLICATE],
+            "ingest": self.ingester.stats if self.ingester else None,
+            "archive": self.archive.stats() if self.archive is not None else None,
+            "worker": self.worker,
+            "shared_frontier": self.shared.stats() if self.shared else None,
+            "metrics": self.metrics.summary(),
+            "urls": self.visited.summary(extra_bytes=self.frontier.seen.nbytes),
             "output_folder": self.output_folder
         }
         
-        summary_file = os.path.join(self.output_folder, "_crawl_summary.json")
+        summary_file = os.path.join(self.state_folder, "_crawl_summary.json")
         try:
             with open(summary_file, 'w', encoding='utf-8') as f:
                 json.dump(summary, f, indent=2, ensure_ascii=False)
@@ -438,9 +1136,219 @@ Examples:
         help=f'Delay between requests in seconds (default: {DELAY_BETWEEN_REQUESTS})'
     )
     
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=CONCURRENCY,
+        help=f'Number of concurrent fetch workers; values above 1 enable the async engine with per-host rate limiting (default: {CONCURRENCY})'
+    )
+    
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Ignore the crawl manifest and re-download and rewrite every page'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Continue from the last checkpoint in the output folder (starts fresh if there is none)'
+    )
+    
+    parser.add_argument(
+        '--parser',
+        default=HTML_PARSER,
+        choices=['auto', 'lxml', 'html.parser'],
+        help=f'HTML parser backend; "auto" uses lxml when installed (default: {HTML_PARSER})'
+    )
+    
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=PARSE_WORKERS,
+        help=f'Processes used to parse and convert pages in parallel with fetching; enables the pipelined engine (default: {PARSE_WORKERS})'
+    )
+    
+    parser.add_argument(
+        '--no-dedup',
+        action='store_true',
+        help='Save and expand every page, even exact or near duplicates of pages already kept'
+    )
+    
+    parser.add_argument(
+        '--ingest',
+        nargs='?',
+        const=DB_PATH,
+        metavar='DB',
+        help=f'Also chunk every page into crawl_vectors.db, skipping unchanged documents and chunks (default DB: {DB_PATH})'
+    )
+    
+    parser.add_argument(
+        '--archive',
+        nargs='?',
+        const='auto',
+        choices=['auto', 'zstd', 'gzip'],
+        help='Append pages to compressed pack files in [output]/_archive/ instead of writing .md files; '
+             '"auto" uses zstd when zstandard is installed, else gzip. Export with crawl_archive.py export'
+    )
+    
+    parser.add_argument(
+        '--max-page-bytes',
+        type=int,
+        default=MAX_PAGE_BYTES,
+        help=f'Abort pages whose (decompressed) body is larger than this many bytes (default: {MAX_PAGE_BYTES})'
+    )
+    
+    parser.add_argument(
+        '--no-sitemaps',
+        action='store_true',
+        help='Do not seed the frontier from sitemap.xml (and the sitemaps listed in robots.txt)'
+    )
+    
+    parser.add_argument(
+        '--ignore-robots',
+        action='store_true',
+        help='Do not read robots.txt: no disallow rules, no Crawl-delay'
+    )
+    
+    parser.add_argument(
+        '--visited-bloom',
+        type=int,
+        metavar='URLS',
+        help='Expected number of URLs for very large crawls: bounds the in-memory visited and seen sets and spills older URLs into on-disk Bloom filters sized for this many'
+    )
+    
+    parser.add_argument(
+        '--no-events',
+        action='store_true',
+        help='Do not log stage timings to _crawl_events.jsonl (aggregates and _crawl_metrics.prom are still written)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        choices=['cprofile', 'sample'],
+        help='Profile the crawl: "cprofile" writes _crawl_profile.prof (main thread), "sample" writes folded stacks of all threads to _crawl_profile.folded'
+    )
+    
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help=f'Crawl with this many local worker processes sharing one frontier database ({FRONTIER_DB} in the output folder); --max-pages counts over all workers'
+    )
+    
+    parser.add_argument(
+        '--shared-frontier',
+        metavar='DB',
+        help='Run as a worker of a shared-frontier crawl using this SQLite frontier (created if missing); start more workers with the same DB to split the crawl'
+    )
+    
+    parser.add_argument(
+        '--worker-id',
+        help='Id of this worker in a shared-frontier crawl; names its state folder _workers/<id>/ (default: hostname-pid)'
+    )
+    
     return parser.parse_args()
 
 
+def worker_arguments(argv):
+    """Command line for a worker: the launcher's arguments without --workers and --resume."""
+    result = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+        elif arg == '--workers':
+            skip = True
+        elif not (arg.startswith('--workers=') or arg == '--resume'):
+            result.append(arg)
+    return result
+
+
+def run_workers(args):
+    """
+    Run a shared-frontier crawl with ``args.workers`` local worker processes.
+
+    Prepares the frontier database (a fresh one unless --resume), starts one
+    ``crawler.py --shared-frontier`` process per worker with the same options,
+    waits for all of them and folds their manifests into the crawl manifest.
+
+    Args:
+        args (argparse.Namespace): Parsed command line
+
+    Returns:
+        int: Number of workers that failed
+    """
+    output_folder = os.path.join(BASE_FOLDER, args.output)
+    os.makedirs(output_folder, exist_ok=True)
+    frontier_db = args.shared_frontier or os.path.join(output_folder, FRONTIER_DB)
+    # Manifests of an earlier run that was killed before it could merge them
+    merge_worker_manifests(output_folder)
+    if not args.resume:
+        remove_frontier(frontier_db)
+    frontier = SharedFrontier(frontier_db, "launcher")
+    if frontier.settings():
+        print(f"Resuming the shared crawl: {frontier.resume(args.max_pages)} URLs queued")
+    else:
+        frontier.configure(args.base_url, args.filter_pattern, args.max_pages, args.max_depth)
+
+    command = [sys.executable, os.path.abspath(__file__)] + worker_arguments(sys.argv[1:])
+    if not args.shared_frontier:
+        command += ['--shared-frontier', frontier_db]
+    # Own sessions: an interrupt reaches the workers once, forwarded as SIGTERM below
+    processes = [subprocess.Popen(command + ['--worker-id', f"w{i}"], start_new_session=True)
+                 for i in range(args.workers)]
+    print(f"Started {args.workers} workers sharing {frontier_db}")
+    try:
+        for process in processes:
+            process.wait()
+    except KeyboardInterrupt:
+        # Workers checkpoint and return their leases on SIGTERM
+        for process in processes:
+            if process.poll() is None:
+                process.send_signal(signal.SIGTERM)
+        for process in processes:
+            process.wait()
+    failed = sum(1 for process in processes if process.returncode != 0)
+
+    merge_worker_manifests(output_folder)
+    stats = frontier.stats()
+    frontier.close()
+    totals = {"pages_crawled": 0, "pages_unchanged": 0, "duplicates_skipped": 0}
+    for i in range(args.workers):
+        path = os.path.join(output_folder, WORKERS_FOLDER, f"w{i}", "_crawl_summary.json")
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                worker_summary = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for key in totals:
+            totals[key] += worker_summary.get(key) or 0
+    summary = {
+        "crawl_date": datetime.now().isoformat(),
+        "base_url": args.base_url,
+        "filter_pattern": args.filter_pattern,
+        **totals,
+        "workers": args.workers,
+        "failed_workers": failed,
+        "shared_frontier": stats,
+        "output_folder": output_folder,
+    }
+    try:
+        with open(os.path.join(output_folder, "_crawl_summary.json"), 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        print(f"- Error saving crawl summary: {e}")
+
+    print("=" * 60)
+    print(f"Shared crawl finished: {totals['pages_crawled']} pages by {args.workers} workers "
+          f"({failed} failed)")
+    print(f"Frontier: {stats['done']} done, {stats['queued']} queued, {stats['failed']} failed")
+    if stats["queued"]:
+        print(f"Pages remaining: {stats['queued']} (continue with --resume)")
+    print(f"Files saved to: {output_folder}")
+    return failed
+
+
 def main():
     """Main function to run the crawler."""
     args = parse_arguments()
@@ -459,6 +1367,7 @@ def main():
     print(f"Max pages: {args.max_pages}")
     print(f"Max depth: {args.max_depth}")
     print(f"Delay between requests: {args.delay}s")
+    print(f"Concurrency: {args.concurrency}")
     print("=" * 60)
     
     # Validate URLs
@@ -481,22 +1390,50 @@ def main():
         print(f"Error validating URLs: {e}")
         sys.exit(1)
     
+    shared = args.workers or args.shared_frontier
+    if shared and args.archive:
+        print("Error: --archive cannot be combined with a shared-frontier crawl")
+        sys.exit(1)
+    if shared and (args.concurrency > 1 or args.parse_workers > 0):
+        print("Warning: shared-frontier workers crawl sequentially; --concurrency and --parse-workers are ignored")
+    
+    # Treat SIGTERM (e.g. the /api/crawl timeout) like Ctrl+C so progress is checkpointed
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    
+    if args.workers:
+        sys.exit(1 if run_workers(args) else 0)
+    
     # Initialize and start crawler
-    crawler = WebCrawler(args.base_url, args.filter_pattern, args.output)
+    worker = (args.worker_id or default_worker_id()) if args.shared_frontier else None
+    crawler = WebCrawler(args.base_url, args.filter_pattern, args.output, incremental=not args.force,
+                         parser=args.parser, ingest_db=args.ingest, dedup=not args.no_dedup,
+                         events=not args.no_events, visited_bloom=args.visited_bloom,
+                         robots=not args.ignore_robots, sitemaps=not args.no_sitemaps,
+                         max_page_bytes=args.max_page_bytes, archive=args.archive, worker=worker)
     
     # Update delay if specified
     global DELAY_BETWEEN_REQUESTS
     DELAY_BETWEEN_REQUESTS = args.delay
     
     # Start crawling
+    profiler = start_profiler(args.profile, crawler.state_folder)
     try:
-        crawler.crawl(max_pages=args.max_pages, max_depth=args.max_depth)
+        if args.shared_frontier:
+            crawler.crawl_shared(args.shared_frontier, max_pages=args.max_pages, max_depth=args.max_depth)
+        else:
+            crawler.crawl(max_pages=args.max_pages, max_depth=args.max_depth,
+                          concurrency=args.concurrency, resume=args.resume,
+                          parse_workers=args.parse_workers)
     except KeyboardInterrupt:
         print("\n\nCrawling interrupted by user.")
+        crawler.interrupt_crawl()
         print(f"Partial results saved to: {crawler.output_folder}")
     except Exception as e:
         print(f"\nError during crawling: {e}")
         sys.exit(1)
+    finally:
+        if profiler:
+            profiler.stop()
 
 
 if __name__ == "__main__":
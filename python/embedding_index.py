@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+Memory-mapped cosine top-k search over the embeddings in crawl_vectors.db.
+Packs every embedding into one contiguous, L2-normalized float32 matrix on
+disk with a chunk-id sidecar, so a batch of queries is one matrix product and
+an argpartition instead of deserializing every BLOB. An optional IVF index
+(k-means centroids + inverted lists) restricts large corpora to the closest
+clusters.
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+
+from crawl_checkpoint import write_json_atomic
+from crawl_ingest import DB_PATH
+
+INDEX_FOLDER = "../crawl_vectors_index"  # Matrix, sidecars and IVF lists
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"  # sentence-transformers model for text queries (384 dims)
+TOP_K = 5  # Results per query
+READ_BATCH = 4096  # Embedding rows read from SQLite at a time
+SEARCH_BLOCK = 65536  # Matrix rows scored at a time, bounds memory on large corpora
+IVF_LISTS = 0  # Coarse clusters (0 = exact search only)
+IVF_PROBES = 8  # Clusters searched per query
+IVF_ITERATIONS = 10  # k-means iterations when training centroids
+IVF_SAMPLE = 50000  # Rows sampled to train centroids
+INDEX_VERSION = 1
+
+VECTORS_FILE = "vectors.f32"
+IDS_FILE = "chunk_ids.i64"
+ASSIGN_FILE = "ivf_lists.i32"
+CENTROIDS_FILE = "ivf_centroids.npy"
+META_FILE = "meta.json"
+
+
+def normalize(matrix):
+    """Scale rows to unit length so a dot product is the cosine similarity."""
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def iter_embeddings(conn, after_id=0, batch=READ_BATCH):
+    """
+    Read embeddings newer than ``after_id`` in id order.
+
+    Yields:
+        tuple: (embedding ids, chunk ids, float32 matrix) per batch
+    """
+    cursor = conn.execute("SELECT id, chunk_id, embedding FROM embeddings WHERE id > ? ORDER BY id", (after_id,))
+    while True:
+        rows = cursor.fetchmany(batch)
+        if not rows:
+            return
+        yield ([row[0] for row in rows], [row[1] for row in rows],
+               np.vstack([np.frombuffer(row[2], dtype=np.float32) for row in rows]))
+
+
+def top_k(scores, k):
+    """
+    Indices of the ``k`` highest scores in each row, best first.
+
+    Args:
+        scores (np.ndarray): (queries, candidates) similarity matrix
+        k (int): Results per row
+
+    Returns:
+        np.ndarray: (queries, min(k, candidates)) column indices
+    """
+    k = min(k, scores.shape[1])
+    if k == 0:
+        return np.empty((scores.shape[0], 0), dtype=np.int64)
+    part = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, part, axis=1), axis=1)
+    return np.take_along_axis(part, order, axis=1)
+
+
+def train_centroids(vectors, lists, iterations=IVF_ITERATIONS, sample=IVF_SAMPLE, seed=0):
+    """
+    Spherical k-means on a sample of the (normalized) rows.
+
+    Args:
+        vectors (np.ndarray): (rows, dim) normalized matrix, may be a memmap
+        lists (int): Number of centroids
+        iterations (int): k-means iterations
+        sample (int): Rows sampled for training
+
+    Returns:
+        np.ndarray: (lists, dim) normalized centroids
+    """
+    rng = np.random.default_rng(seed)
+    rows = len(vectors)
+    picked = np.sort(rng.choice(rows, size=min(rows, sample), replace=False))
+    data = np.asarray(vectors[picked])
+    lists = min(lists, len(data))
+    centroids = data[rng.choice(len(data), size=lists, replace=False)].copy()
+    for _ in range(iterations):
+        assign = np.argmax(data @ centroids.T, axis=1)
+        order = np.argsort(assign, kind='stable')
+        counts = np.bincount(assign, minlength=lists)
+        empty = counts == 0
+        sums = np.zeros_like(centroids)
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums[~empty] = np.add.reduceat(data[order], starts[~empty], axis=0)
+        # Re-seed empty clusters with random sample rows
+        sums[empty] = data[rng.choice(len(data), size=int(empty.sum()))]
+        centroids = normalize(sums)
+    return centroids
+
+
+def assign_lists(vectors, centroids):
+    """Nearest centroid for every row, computed block by block."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), SEARCH_BLOCK):
+        block = np.asarray(vectors[start:start + SEARCH_BLOCK])
+        out[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return out
+
+
+class EmbeddingIndex:
+    """
+    On-disk embedding matrix with exact and IVF cosine top-k search.
+
+    ``meta.json`` holds the row count, dimension and the highest embedding id
+    packed so far; the data files are only trusted up to that row count, so an
+    interrupted append never corrupts the index.
+    """
+
+    def __init__(self, folder=INDEX_FOLDER):
+        """
+        Args:
+            folder (str): Index folder
+        """
+        self.folder = folder
+        self.meta = None
+        self.vectors = None
+        self.chunk_ids = None
+        self.centroids = None
+        self.list_order = None
+        self.list_offsets = None
+        self.load()
+
+    def path(self, name):
+        return os.path.join(self.folder, name)
+
+    def load(self):
+        """Map the index files into memory (no-op if the index does not exist yet)."""
+        try:
+            with open(self.path(META_FILE), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            self.meta = None
+            return
+        if meta.get("version") != INDEX_VERSION:
+            self.meta = None
+            return
+        self.meta = meta
+        count, dim = meta["count"], meta["dim"]
+        if count:
+            self.vectors = np.memmap(self.path(VECTORS_FILE), dtype=np.float32, mode='r', shape=(count, dim))
+            self.chunk_ids = np.memmap(self.path(IDS_FILE), dtype=np.int64, mode='r', shape=(count,))
+        else:
+            self.vectors = np.empty((0, dim), dtype=np.float32)
+            self.chunk_ids = np.empty(0, dtype=np.int64)
+        self.centroids = self.list_order = self.list_offsets = None
+        if meta.get("ivf_lists"):
+            self.centroids = np.load(self.path(CENTROIDS_FILE))
+            assign = np.fromfile(self.path(ASSIGN_FILE), dtype=np.int32, count=count)
+            self.list_order = np.argsort(assign, kind='stable')
+            self.list_offsets = np.searchsorted(assign[self.list_order], np.arange(len(self.centroids) + 1))
+
+    def __len__(self):
+        return self.meta["count"] if self.meta else 0
+
+    def build(self, conn, ivf_lists=IVF_LISTS):
+        """
+        Pack every embedding in the database into a fresh index.
+
+        Args:
+            conn (sqlite3.Connection): crawl_vectors.db connection
+            ivf_lists (int): Coarse clusters to train (0 = exact search only)
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        for name in (VECTORS_FILE, IDS_FILE, ASSIGN_FILE, CENTROIDS_FILE):
+            if os.path.exists(self.path(name)):
+                os.remove(self.path(name))
+        self.meta = {"version": INDEX_VERSION, "count": 0, "dim": 0, "max_embedding_id": 0, "ivf_lists": 0}
+        write_json_atomic(self.path(META_FILE), self.meta)
+        self._append(conn)
+        if ivf_lists and len(self):
+            self.train_ivf(ivf_lists)
+        self.load()
+
+    def update(self, conn):
+        """
+        Append embeddings added since the last build or update.
+
+        Falls back to a full rebuild when embeddings already packed were
+        deleted (e.g. chunks rewritten by the ingester).
+
+        Args:
+            conn (sqlite3.Connection): crawl_vectors.db connection
+
+        Returns:
+            int: Rows appended (or packed by the rebuild)
+        """
+        if not self.meta:
+            self.build(conn)
+            return len(self)
+        still_there = conn.execute("SELECT COUNT(*) FROM embeddings WHERE id <= ?",
+                                   (self.meta["max_embedding_id"],)).fetchone()[0]
+        if still_there != self.meta["count"]:
+            self.build(conn, self.meta.get("ivf_lists", 0))
+            return len(self)
+        before = len(self)
+        self._append(conn)
+        self.load()
+        return len(self) - before
+
+    def train_ivf(self, lists):
+        """Train centroids on the current matrix and assign every row to a list."""
+        lists = max(1, min(lists, len(self)))
+        self.load()
+        centroids = train_centroids(self.vectors, lists)
+        np.save(self.path(CENTROIDS_FILE), centroids)
+        assign_lists(self.vectors, centroids).tofile(self.path(ASSIGN_FILE))
+        self.meta["ivf_lists"] = lists
+        write_json_atomic(self.path(META_FILE), self.meta)
+        self.load()
+
+    def _append(self, conn):
+        meta = dict(self.meta)
+        centroids = np.load(self.path(CENTROIDS_FILE)) if meta.get("ivf_lists") else None
+        # Drop bytes left behind by an interrupted append before adding new rows
+        self._truncate(meta)
+        with open(self.path(VECTORS_FILE), 'ab') as vectors_file, \
+                open(self.path(IDS_FILE), 'ab') as ids_file, \
+                open(self.path(ASSIGN_FILE), 'ab') as assign_file:
+            for embedding_ids, chunk_ids, matrix in iter_embeddings(conn, meta["max_embedding_id"]):
+                if not meta["dim"]:
+                    meta["dim"] = matrix.shape[1]
+                elif matrix.shape[1] != meta["dim"]:
+                    raise ValueError(f"Embedding dimension {matrix.shape[1]} does not match index dimension {meta['dim']}")
+                matrix = normalize(matrix)
+                vectors_file.write(matrix.tobytes())
+                ids_file.write(np.asarray(chunk_ids, dtype=np.int64).tobytes())
+                if centroids is not None:
+                    assign_file.write(np.argmax(matrix @ centroids.T, axis=1).astype(np.int32).tobytes())
+                meta["count"] += len(chunk_ids)
+                meta["max_embedding_id"] = embedding_ids[-1]
+            for f in (vectors_file, ids_file, assign_file):
+                f.flush()
+                os.fsync(f.fileno())
+        write_json_atomic(self.path(META_FILE), meta)
+        self.meta = meta
+
+    def _truncate(self, meta):
+        sizes = {VECTORS_FILE: meta["count"] * meta["dim"] * 4, IDS_FILE: meta["count"] * 8,
+                 ASSIGN_FILE: meta["count"] * 4 if meta.get("ivf_lists") else 0}
+        for name, size in sizes.items():
+            with open(self.path(name), 'ab') as f:
+                f.truncate(size)
+
+    def search(self, queries, k=TOP_K, probes=None):
+        """
+        Cosine top-k for one or more query vectors.
+
+        Args:
+            queries (np.ndarray): (dim,) or (queries, dim) query vectors
+            k (int): Results per query
+            probes (int): IVF lists to search per query; None searches every
+                row exactly (also used when the index has no IVF lists)
+
+        Returns:
+            list: One list of (chunk_id, score) tuples per query, best first
+        """
+        queries = normalize(np.atleast_2d(queries))
+        if not len(self):
+            return [[] for _ in queries]
+        if probes and self.centroids is not None:
+            return [self._search_ivf(query, k, probes) for query in queries]
+        return self._search_exact(queries, k)
+
+    def _search_exact(self, queries, k):
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(self), SEARCH_BLOCK):
+            scores = queries @ np.asarray(self.vectors[start:start + SEARCH_BLOCK]).T
+            picked = top_k(scores, k)
+            # Merge this block's winners with the running top-k
+            best_scores = np.hstack([best_scores, np.take_along_axis(scores, picked, axis=1)])
+            best_rows = np.hstack([best_rows, picked + start])
+            keep = top_k(best_scores, k)
+            best_scores = np.take_along_axis(best_scores, keep, axis=1)
+            best_rows = np.take_along_axis(best_rows, keep, axis=1)
+        return [[(int(self.chunk_ids[row]), float(score)) for row, score in zip(rows, scores)]
+                for rows, scores in zip(best_rows, best_scores)]
+
+    def _search_ivf(self, query, k, probes):
+        lists = top_k((query @ self.centroids.T)[None, :], probes)[0]
+        rows = np.concatenate([self.list_order[self.list_offsets[i]:self.list_offsets[i + 1]] for i in lists])
+        if not len(rows):
+            return []
+        rows.sort()  # Sequential reads from the memmap
+        scores = np.asarray(self.vectors[rows]) @ query
+        picked = top_k(scores[None, :], k)[0]
+        return [(int(self.chunk_ids[rows[i]]), float(scores[i])) for i in picked]
+
+
+def describe_chunks(conn, chunk_ids):
+    """Look up file path, title and chunk index for result chunk ids."""
+    if not chunk_ids:
+        return {}
+    placeholders = ','.join('?' * len(chunk_ids))
+    rows = conn.execute(
+        "SELECT chunks.id, chunks.chunk_index, documents.file_path, documents.title, documents.url "
+        f"FROM chunks JOIN documents ON documents.id = chunks.document_id WHERE chunks.id IN ({placeholders})",
+        chunk_ids)
+    return {row[0]: {"chunk_index": row[1], "file_path": row[2], "title": row[3], "url": row[4]} for row in rows}
+
+
+def embed_text(text, model_name=EMBEDDING_MODEL):
+    """Embed a query with sentence-transformers (imported only when a text query is used)."""
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("Error: text queries need sentence-transformers (see install.txt); use --chunk-id instead")
+        sys.exit(1)
+    return SentenceTransformer(model_name).encode([text])[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Memory-mapped cosine search over crawl_vectors.db embeddings.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python embedding_index.py build --ivf-lists 256
+  python embedding_index.py update
+  python embedding_index.py search "reentrancy guard" -k 5 --probes 8
+  python embedding_index.py search --chunk-id 42
+        """
+    )
+    parser.add_argument('command', choices=['build', 'update', 'search'])
+    parser.add_argument('query', nargs='?', help='Text to search for (search command)')
+    parser.add_argument('--db', default=DB_PATH, help=f'SQLite database (default: {DB_PATH})')
+    parser.add_argument('--index', default=INDEX_FOLDER, help=f'Index folder (default: {INDEX_FOLDER})')
+    parser.add_argument('--ivf-lists', type=int, default=IVF_LISTS,
+                        help=f'Coarse clusters to train on build (default: {IVF_LISTS}, exact only)')
+    parser.add_argument('--probes', type=int, default=None,
+                        help=f'IVF lists searched per query (default: exact search; {IVF_PROBES} is a good start)')
+    parser.add_argument('-k', '--top-k', type=int, default=TOP_K, help=f'Results per query (default: {TOP_K})')
+    parser.add_argument('--chunk-id', type=int, help='Use the embedding of an existing chunk as the query')
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db, timeout=30)
+    index = EmbeddingIndex(args.index)
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        index.build(conn, args.ivf_lists)
+        print(f"Packed {len(index)} embeddings in {time.perf_counter() - start:.2f}s")
+        return
+    if args.command == 'update':
+        print(f"Appended {index.update(conn)} embeddings, {len(index)} total")
+        return
+
+    if args.chunk_id is not None:
+        row = conn.execute("SELECT embedding FROM embeddings WHERE chunk_id = ? ORDER BY id DESC LIMIT 1",
+                           (args.chunk_id,)).fetchone()
+        if not row:
+            print(f"Error: no embedding for chunk {args.chunk_id}")
+            sys.exit(1)
+        query = np.frombuffer(row[0], dtype=np.float32)
+    elif args.query:
+        query = embed_text(args.query)
+    else:
+        parser.error('search needs a query or --chunk-id')
+
+    start = time.perf_counter()
+    results = index.search(query, args.top_k, args.probes)[0]
+    elapsed = time.perf_counter() - start
+    info = describe_chunks(conn, [chunk_id for chunk_id, _ in results])
+    for rank, (chunk_id, score) in enumerate(results, 1):
+        chunk = info.get(chunk_id, {})
+        print(f"{rank}. [{score:.4f}] chunk {chunk_id} of {chunk.get('title')} ({chunk.get('file_path')})")
+    print(f"{len(results)} result(s) in {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Bulk honeypot risk scan for a watchlist of tokens.
+Runs the GetPairs -> IsHoneypot -> TopHolders chain for many tokens
+concurrently and streams one aggregated JSON record per token as it finishes.
+"""
+
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from get_pairs_api import get_pairs_by_address
+from honeypot_client import metrics
+from is_honey_pot import is_honeypot
+from top_holders import get_top_holders
+
+DEFAULT_CHAIN_ID = 8453  # Base
+CONCURRENCY = 8  # Tokens scanned at the same time
+MAX_PAIRS = 5  # Pairs per token checked with IsHoneypot (in GetPairs order)
+
+
+def scan_token(address, chain_id=DEFAULT_CHAIN_ID, max_pairs=MAX_PAIRS):
+    """
+    Run the full risk check for one token.
+
+    Args:
+        address (str): Token address
+        chain_id (int): Chain ID
+        max_pairs (int): Maximum number of pairs to simulate
+
+    Returns:
+        dict: Aggregated record with pairs, per-pair honeypot results, top holders and a summary
+    """
+    start = time.monotonic()
+    errors = []
+
+    pairs = get_pairs_by_address(address, chain_id)
+    if isinstance(pairs, dict) and "error" in pairs:
+        errors.append({"stage": "pairs", **pairs})
+    if not isinstance(pairs, list):
+        pairs = []
+
+    honeypot = {}
+    for pair in pairs[:max_pairs]:
+        pair_address = (pair.get("Pair") or {}).get("Address")
+        if not pair_address:
+            continue
+        result = is_honeypot(address, pair_address, chain_id)
+        if "error" in result:
+            errors.append({"stage": "honeypot", "pair": pair_address, **result})
+        honeypot[pair_address] = result
+
+    holders = get_top_holders(address, chain_id)
+    if "error" in holders:
+        errors.append({"stage": "holders", **holders})
+
+    flagged = [pair for pair, result in honeypot.items()
+               if (result.get("honeypotResult") or {}).get("isHoneypot")]
+    risks = [(result.get("summary") or {}).get("risk") for result in honeypot.values()]
+
+    return {
+        "address": address,
+        "chain_id": chain_id,
+        "summary": {
+            "pair_count": len(pairs),
+            "pairs_checked": len(honeypot),
+            "is_honeypot": bool(flagged),
+            "honeypot_pairs": flagged,
+            "risks": [risk for risk in risks if risk],
+            "error_count": len(errors),
+        },
+        "pairs": pairs,
+        "honeypot": honeypot,
+        "holders": holders,
+        "errors": errors,
+        "elapsed": round(time.monotonic() - start, 3),
+    }
+
+
+def scan_tokens(tokens, concurrency=CONCURRENCY, max_pairs=MAX_PAIRS):
+    """
+    Scan many tokens concurrently.
+
+    Args:
+        tokens (iterable): (address, chain_id) pairs
+        concurrency (int): Maximum number of tokens in flight
+        max_pairs (int): Maximum number of pairs to simulate per token
+
+    Yields:
+        dict: One record per token, in completion order
+    """
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        futures = {executor.submit(scan_token, address, chain_id, max_pairs): (address, chain_id)
+                   for address, chain_id in tokens}
+        for future in as_completed(futures):
+            address, chain_id = futures[future]
+            try:
+                yield future.result()
+            except Exception as e:
+                yield {"address": address, "chain_id": chain_id, "errors": [{"stage": "scan", "error": str(e)}]}
+
+
+def read_tokens(lines):
+    """
+    Parse watchlist lines: ``address[,chain_id]`` or JSON ``{"address": ..., "chain_id": ...}``.
+    Blank lines and lines starting with ``#`` are skipped.
+    """
+    tokens = []
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('{'):
+            item = json.loads(line)
+            tokens.append((item["address"], int(item.get("chain_id") or DEFAULT_CHAIN_ID)))
+        else:
+            address, _, chain_id = line.partition(',')
+            tokens.append((address.strip(), int(chain_id.strip() or DEFAULT_CHAIN_ID)))
+    return tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Scan a watchlist of tokens for honeypot risk.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+  python honeypot_bulk_scan.py watchlist.txt > results.jsonl
+  cat watchlist.txt | python honeypot_bulk_scan.py - --concurrency 16 --max-pairs 3
+        """
+    )
+    parser.add_argument('watchlist', help='File with one token per line ("-" for stdin)')
+    parser.add_argument('--concurrency', '-c', type=int, default=CONCURRENCY,
+                        help=f'Tokens scanned at the same time (default: {CONCURRENCY})')
+    parser.add_argument('--max-pairs', type=int, default=MAX_PAIRS,
+                        help=f'Pairs per token checked with IsHoneypot (default: {MAX_PAIRS})')
+    args = parser.parse_args()
+
+    if args.watchlist == '-':
+        tokens = read_tokens(sys.stdin)
+    else:
+        with open(args.watchlist, 'r', encoding='utf-8') as f:
+            tokens = read_tokens(f)
+
+    start = time.monotonic()
+    flagged = 0
+    for record in scan_tokens(tokens, args.concurrency, args.max_pairs):
+        flagged += bool((record.get("summary") or {}).get("is_honeypot"))
+        print(json.dumps(record), flush=True)
+    print(f"Scanned {len(tokens)} tokens in {time.monotonic() - start:.1f}s, {flagged} flagged as honeypot",
+          file=sys.stderr)
+    print(f"Upstream: {json.dumps(metrics())}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
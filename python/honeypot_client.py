@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Shared HTTP layer for the honeypot.is helpers.
+Keeps one pooled keep-alive requests.Session per process, paces and retries
+upstream calls, and talks to the long-running honeypot_service.py when it is
+available.
+"""
+
+import json
+import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+import urllib.error
+import urllib.parse
+import urllib.request
+from email.utils import parsedate_to_datetime
+
+API_BASE = os.environ.get("HONEYPOT_API_BASE", "https://api.honeypot.is")  # Overridable for local stubs
+SERVICE_URL = os.environ.get("HONEYPOT_SERVICE_URL", "http://127.0.0.1:8787")  # honeypot_service.py address
+SERVICE_TIMEOUT = 60  # Seconds a thin client waits for the service
+POOL_SIZE = 32  # Keep-alive connections kept open to api.honeypot.is
+CACHE_SIZE = 4096  # Responses kept in the in-process LRU cache
+CACHE_TTLS = {  # Seconds a successful response stays fresh, per endpoint
+    "/v1/GetPairs": 300,
+    "/v1/TopHolders": 600,
+    "/v2/IsHoneypot": 300,
+}
+CONNECT_TIMEOUT = 5  # Seconds to open a connection to the API
+READ_TIMEOUT = 20  # Seconds to wait for the API to answer
+MAX_RETRIES = 4  # Extra attempts after a timeout, connection error, 429 or 5xx
+RETRY_STATUSES = {429, 500, 502, 503, 504}  # Responses worth retrying
+BACKOFF_BASE = 0.5  # Seconds, doubled on every retry
+BACKOFF_MAX = 30  # Upper bound for one backoff sleep
+RETRY_AFTER_MAX = 120  # Upper bound honored for a Retry-After header
+RATE_LIMIT = float(os.environ.get("HONEYPOT_RATE_LIMIT", 5))  # Starting requests/second to the API
+RATE_MIN = 0.5  # Requests/second floor after repeated 429s
+RATE_MAX = float(os.environ.get("HONEYPOT_RATE_MAX", 50))  # Requests/second ceiling
+RATE_BURST = 5  # Requests allowed back-to-back
+RATE_INCREASE = 0.1  # Requests/second added after each success
+RATE_DECREASE = 0.5  # Rate multiplier applied on a 429
+
+_session = None
+_session_lock = threading.Lock()
+_metrics = {"requests": 0, "retries": 0, "throttled": 0, "timeouts": 0, "connection_errors": 0,
+            "server_errors": 0}
+_metrics_lock = threading.Lock()
+
+
+class AdaptiveRateLimiter:
+    """
+    Thread-safe token bucket shared by every upstream call.
+
+    The rate grows additively after each success up to ``max_rate`` and is
+    cut multiplicatively on a 429, so a bulk scan settles just below the
+    rate the API accepts. A Retry-After header pauses all callers.
+    """
+
+    def __init__(self, rate=RATE_LIMIT, burst=RATE_BURST, min_rate=RATE_MIN, max_rate=RATE_MAX):
+        """
+        Args:
+            rate (float): Starting requests per second
+            burst (int): Requests allowed back-to-back
+            min_rate (float): Lowest rate reached after throttling
+            max_rate (float): Highest rate reached after successes
+        """
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.waited = 0.0
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.blocked_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.blocked_until - now, (1 - self.tokens) / self.rate)
+                self.waited += wait
+            time.sleep(wait)
+
+    def throttled(self, retry_after=None):
+        """Slow down after a 429, pausing everyone for ``retry_after`` seconds if given."""
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate * RATE_DECREASE)
+            self.tokens = 0
+            if retry_after:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+
+    def succeeded(self):
+        """Speed up a little after a successful call."""
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + RATE_INCREASE)
+
+
+rate_limiter = AdaptiveRateLimiter()
+
+
+def _count(name):
+    with _metrics_lock:
+        _metrics[name] += 1
+
+
+def metrics():
+    """Return upstream request, retry and throttle counters plus the current rate."""
+    with _metrics_lock:
+        result = dict(_metrics)
+    result["rate"] = round(rate_limiter.rate, 2)
+    result["limiter_wait"] = round(rate_limiter.waited, 3)
+    return result
+
+
+def parse_retry_after(value):
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value (str): Delay in seconds or an HTTP date
+
+    Returns:
+        float: Seconds to wait (capped at RETRY_AFTER_MAX), or None if absent or invalid
+    """
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+def backoff_delay(attempt, retry_after=None):
+    """
+    Seconds to sleep before retry number ``attempt``: full-jitter exponential
+    backoff, but never less than the server's Retry-After.
+    """
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    return max(delay, retry_after or 0.0)
+
+
+class ResponseCache:
+    """
+    Thread-safe TTL + LRU cache with request coalescing.
+
+    Concurrent lookups of a key that is not cached share one upstream call:
+    the first caller fetches, the others wait for its result.
+    """
+
+    def __init__(self, max_size=CACHE_SIZE, ttls=None):
+        """
+        Args:
+            max_size (int): Maximum number of cached responses
+            ttls (dict): Seconds to keep responses, keyed by endpoint path
+        """
+        self.max_size = max_size
+        self.ttls = CACHE_TTLS if ttls is None else ttls
+        self.entries = OrderedDict()  # key -> (expires_at, value)
+        self.in_flight = {}  # key -> Future
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.coalesced = 0
+
+    def get_or_fetch(self, key, ttl, fetch, cacheable):
+        """
+        Return the cached value for ``key`` or compute it with ``fetch``.
+
+        Args:
+            key (tuple): Cache key
+            ttl (float): Seconds a fresh value stays valid (0 disables caching)
+            fetch (callable): Produces the value on a miss
+            cacheable (callable): Decides whether a fetched value may be stored
+
+        Returns:
+            The cached or freshly fetched value
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            future = self.in_flight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                owner = False
+            else:
+                future = self.in_flight[key] = Future()
+                self.misses += 1
+                owner = True
+
+        if not owner:
+            return future.result()
+
+        try:
+            value = fetch()
+        except BaseException as e:
+            with self.lock:
+                del self.in_flight[key]
+            future.set_exception(e)
+            raise
+
+        with self.lock:
+            del self.in_flight[key]
+            if ttl > 0 and cacheable(value):
+                self.entries[key] = (time.monotonic() + ttl, value)
+                self.entries.move_to_end(key)
+                while len(self.entries) > self.max_size:
+                    self.entries.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    def clear(self):
+        """Drop all cached responses."""
+        with self.lock:
+            self.entries.clear()
+
+    def stats(self):
+        """Return hit/miss/coalesced counters and the current size."""
+        with self.lock:
+            return {"size": len(self.entries), "hits": self.hits, "misses": self.misses,
+                    "coalesced": self.coalesced}
+
+
+response_cache = ResponseCache()
+
+
+def cache_key(path, params):
+    """Build the cache key (endpoint, address, pair, chain_id); addresses are case-insensitive."""
+    return (
+        path,
+        str(params.get("address", "")).lower(),
+        str(params.get("pair", "")).lower(),
+        str(params.get("chainID", "")),
+    )
+
+
+def get_session():
+    """Return the process-wide requests.Session, creating it on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                # Imported here so thin clients that only talk to the service skip the import
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                _session = session
+    return _session
+
+
+def api_get(path, params, use_cache=True):
+    """
+    Call a honeypot.is endpoint and return its JSON body.
+
+    Successful responses are cached per (endpoint, address, pair, chain_id)
+    for the endpoint's TTL and identical concurrent calls are coalesced.
+    Calls are paced by ``rate_limiter`` and retried with jittered backoff on
+    timeouts, connection errors, 429 and 5xx responses.
+    Errors are returned as ``{"error": ...}`` dicts, matching what the CLI
+    scripts have always printed, and are never cached.
+
+    Args:
+        path (str): Endpoint path, e.g. "/v1/GetPairs"
+        params (dict): Query parameters
+        use_cache (bool): Set to False to always hit the API
+
+    Returns:
+        dict: Parsed JSON response or an error dict
+    """
+    if not use_cache:
+        return _fetch(path, params)
+    return response_cache.get_or_fetch(
+        cache_key(path, params),
+        response_cache.ttls.get(path, 0),
+        lambda: _fetch(path, params),
+        lambda value: not (isinstance(value, dict) and "error" in value),
+    )
+
+
+def _fetch(path, params):
+    """Perform the upstream request behind api_get, retrying transient failures."""
+    import requests
+
+    url = f"{API_BASE}{path}?{urllib.parse.urlencode(params)}"
+    for attempt in range(MAX_RETRIES + 1):
+        last_attempt = attempt == MAX_RETRIES
+        rate_limiter.acquire()
+        _count("requests")
+        retry_after = None
+        response = None
+        try:
+            response = get_session().get(url, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+            if response.status_code in RETRY_STATUSES:
+                retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                if response.status_code == 429:
+                    _count("throttled")
+                    rate_limiter.throttled(retry_after)
+                else:
+                    _count("server_errors")
+                if not last_attempt:
+                    _count("retries")
+                    time.sleep(backoff_delay(attempt, retry_after))
+                    continue
+            if response.ok:
+                rate_limiter.succeeded()
+            return _decode(response)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as err:
+            _count("timeouts" if isinstance(err, requests.exceptions.Timeout) else "connection_errors")
+            if last_attempt:
+                return _decode_error(err)
+            _count("retries")
+            time.sleep(backoff_delay(attempt))
+        except requests.exceptions.RequestException as err:
+            return _decode_error(err)
+
+
+def _decode(response):
+    """Turn a final response into its JSON body or an error dict."""
+    import requests
+
+    try:
+        response.raise_for_status()
+        return response.json()
+    except requests.exceptions.HTTPError as http_err:
+        return {"error": f"HTTP error occurred: {http_err}", "response_text": response.text}
+    except requests.exceptions.RequestException as req_err:
+        return _decode_error(req_err)
+    except json.JSONDecodeError as json_err:
+        return {"error": f"JSON decode error occurred: {json_err}", "response_text": response.text}
+
+
+def _decode_error(err):
+    """Turn a requests exception into the error dict the CLI scripts print."""
+    import requests
+
+    if isinstance(err, requests.exceptions.ConnectionError):
+        return {"error": f"Connection error occurred: {err}"}
+    if isinstance(err, requests.exceptions.Timeout):
+        return {"error": f"Timeout error occurred: {err}"}
+    return {"error": f"An unexpected error occurred: {err}"}
+
+
+def call_service(method, params, service_url=SERVICE_URL, timeout=SERVICE_TIMEOUT):
+    """
+    Forward a call to a running honeypot_service.py.
+
+    Args:
+        method (str): Service method, e.g. "get_pairs"
+        params (dict): Method parameters
+        service_url (str): Base URL of the service
+        timeout (float): Seconds to wait for the answer
+
+    Returns:
+        dict: Method result, or None if the service is not reachable
+    """
+    if not service_url:
+        return None
+    url = f"{service_url.rstrip('/')}/{method}?{urllib.parse.urlencode(params)}"
+    try:
+        with urllib.request.urlopen(url, timeout=timeout) as response:
+            return json.loads(response.read().decode('utf-8'))
+    except urllib.error.HTTPError as http_err:
+        # The service answered; pass its error body through
+        try:
+            return json.loads(http_err.read().decode('utf-8'))
+        except ValueError:
+            return {"error": f"Honeypot service error: {http_err}"}
+    except (urllib.error.URLError, OSError, ValueError):
+        return None
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Long-running honeypot.is helper service.
+Serves get_pairs_by_address, get_top_holders and is_honeypot over a local HTTP
+server (or JSON lines on stdin/stdout) so callers skip interpreter startup and
+reuse one pooled keep-alive connection to api.honeypot.is.
+"""
+
+import argparse
+import json
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from get_pairs_api import get_pairs_by_address
+from honeypot_client import get_session, metrics, response_cache
+from is_honey_pot import is_honeypot
+from top_holders import get_top_holders
+
+HOST = "127.0.0.1"  # Only listen locally
+PORT = 8787  # Default port, matches honeypot_client.SERVICE_URL
+STDIO_WORKERS = 16  # Concurrent requests handled in --stdio mode
+DEFAULT_CHAIN_ID = 8453
+
+
+def _chain_id(params):
+    return int(params.get("chain_id") or DEFAULT_CHAIN_ID)
+
+
+METHODS = {
+    "get_pairs": lambda p: get_pairs_by_address(p.get("address", ""), _chain_id(p)),
+    "top_holders": lambda p: get_top_holders(p.get("address", ""), _chain_id(p)),
+    "is_honeypot": lambda p: is_honeypot(p.get("address", ""), p.get("pair", ""), _chain_id(p)),
+}
+
+
+def dispatch(method, params):
+    """
+    Run a service method.
+
+    Args:
+        method (str): One of METHODS
+        params (dict): Method parameters
+
+    Returns:
+        tuple: (HTTP status, result dict)
+    """
+    handler = METHODS.get(method)
+    if handler is None:
+        return 404, {"error": f"Unknown method: {method}"}
+    try:
+        return 200, handler(params)
+    except ValueError as e:
+        return 400, {"error": f"Invalid parameters: {e}"}
+
+
+class HoneypotRequestHandler(BaseHTTPRequestHandler):
+    """
+    GET /<method>?address=...&pair=...&chain_id=... returns the method result as JSON.
+    GET /health and GET /stats report liveness, cache and upstream retry/throttle counters.
+    """
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        method = parsed.path.strip('/')
+        if method == "health":
+            self.send_json(200, {"status": "ok"})
+            return
+        if method == "stats":
+            self.send_json(200, {"cache": response_cache.stats(), "upstream": metrics()})
+            return
+        params = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        status, result = dispatch(method, params)
+        self.send_json(status, result)
+
+    def send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve_http(host, port, verbose=False):
+    """Serve the methods over HTTP until interrupted."""
+    server = ThreadingHTTPServer((host, port), HoneypotRequestHandler)
+    server.daemon_threads = True
+    server.verbose = verbose
+    print(f"Honeypot service listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def serve_stdio(workers=STDIO_WORKERS):
+    """
+    Serve JSON lines: each input line is {"id": ..., "method": ..., "params": {...}}
+    and produces one output line {"id": ..., "status": ..., "result": {...}}.
+    Requests run concurrently, so responses may come back out of order.
+    """
+    write_lock = threading.Lock()
+
+    def handle(line):
+        # Every line gets a response, so a client waiting on its id never hangs
+        request_id = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            request_id = request.get("id")
+            params = request.get("params") or {}
+            if not isinstance(params, dict):
+                raise ValueError("params must be a JSON object")
+            status, result = dispatch(request.get("method"), params)
+        except ValueError as e:
+            status, result = 400, {"error": f"Invalid request: {e}"}
+        except Exception as e:
+            status, result = 500, {"error": f"{type(e).__name__}: {e}"}
+        with write_lock:
+            sys.stdout.write(json.dumps({"id": request_id, "status": status, "result": result}) + "\n")
+            sys.stdout.flush()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for line in sys.stdin:
+            if line.strip():
+                executor.submit(handle, line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Long-running honeypot.is helper service.')
+    parser.add_argument('--host', default=HOST, help=f'Address to bind (default: {HOST})')
+    parser.add_argument('--port', type=int, default=PORT, help=f'Port to listen on (default: {PORT})')
+    parser.add_argument('--stdio', action='store_true', help='Serve JSON lines on stdin/stdout instead of HTTP')
+    parser.add_argument('--verbose', action='store_true', help='Log every HTTP request')
+    args = parser.parse_args()
+
+    # Open the pooled session up front so the first request doesn't pay for it
+    get_session()
+
+    if args.stdio:
+        serve_stdio()
+    else:
+        serve_http(args.host, args.port, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
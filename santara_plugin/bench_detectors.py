@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Benchmark and regression suite for the santara_plugin detectors.
+
+Compiles every fixture in fixtures/ plus generated multi-contract files, from
+tiny to very large, once each. Every detector returned by make_plugin() then
+runs on its own freshly parsed Slither instance, so the shared source scan and
+analysis index are measured cold. For each detector and fixture the script
+records the median wall time, the peak traced memory and the findings.
+
+Two kinds of failures are reported:
+
+* expectations from fixtures/expected.json that are not met (false
+  negatives, or false positives that were fixed before), and
+* regressions against bench_baseline.json: slower or more memory beyond the
+  tolerances, and findings that used to be reported but no longer are.
+  A missing baseline fails the run too, so the comparison is never skipped.
+
+Everything runs offline; solc must be installed (solc-select or --solc).
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EXPECTED_FILE = os.path.join(FIXTURES_DIR, "expected.json")
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+GENERATED_SIZES = {  # Name -> (contracts, functions per contract)
+    "tiny": (1, 4),
+    "small": (10, 8),
+    "medium": (100, 10),
+    "large": (400, 12),
+}
+UNPROTECTED_EVERY = 5  # Every n-th generated contract exposes an unprotected selfdestruct
+ROUNDS = 3  # Timed runs per detector and fixture; the median is compared
+TIME_TOLERANCE = 0.25  # Allowed relative slowdown against the baseline
+TIME_SLACK = 0.005  # Seconds of noise ignored for very fast runs
+MEMORY_TOLERANCE = 0.5  # Allowed relative growth of peak memory
+
+GENERATED_HEADER = """// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+abstract contract Owned {
+    address internal owner = msg.sender;
+
+    modifier onlyOwner() {
+        require(msg.sender == owner, "not owner");
+        _;
+    }
+}
+"""
+
+
+def generate_fixture(contracts, functions):
+    """
+    Build a multi-contract source with known SWC-106 positives.
+
+    Args:
+        contracts (int): Contracts in the file
+        functions (int): Plain state-changing functions per contract
+
+    Returns:
+        tuple: (source text, expectations in the expected.json format)
+    """
+    parts, expect, absent = [GENERATED_HEADER], [], []
+    for i in range(contracts):
+        unprotected = i % UNPROTECTED_EVERY == 0
+        body = [f"    uint256 public counter{j};\n\n    function step{j}(uint256 amount) public onlyOwner {{\n"
+                f"        counter{j} += amount;\n        _note{j}(amount);\n    }}\n\n"
+                f"    function _note{j}(uint256 amount) internal {{\n"
+                f"        if (amount > {j + 1}) {{\n            counter{j} -= 1;\n        }}\n    }}\n"
+                for j in range(functions)]
+        guard = "" if unprotected else " onlyOwner"
+        body.append(f"    function kill(){' public' + guard} {{\n        _destroy();\n    }}\n\n"
+                    f"    function _destroy() internal {{\n        selfdestruct(payable(owner));\n    }}\n")
+        parts.append(f"\ncontract Generated{i} is Owned {{\n" + "\n".join(body) + "}\n")
+        (expect if unprotected else absent).append(f"reachable from function kill of contract Generated{i} via")
+    return "".join(parts), {"swc103106": {"expect": expect, "absent": absent + ["SWC-103"]}}
+
+
+def plugin_detectors():
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from santara_plugin import make_plugin
+
+    return make_plugin()[0]
+
+
+def compile_fixture(path, solc):
+    from crytic_compile import CryticCompile
+
+    start = time.perf_counter()
+    compilation = CryticCompile(path, solc=solc, compile_force_framework="solc")
+    return compilation, time.perf_counter() - start
+
+
+def run_detector(compilation, detector):
+    """Run one detector on a fresh Slither instance; returns (seconds, findings)."""
+    from slither import Slither
+
+    slither = Slither(compilation)
+    slither.register_detector(detector)
+    start = time.perf_counter()
+    results = slither.run_detectors()
+    elapsed = time.perf_counter() - start
+    return elapsed, [finding["description"].strip() for found in results for finding in found]
+
+
+def measure(compilation, detector, rounds):
+    """
+    Returns:
+        dict: seconds (median), peak_kb, findings
+    """
+    timings, findings = [], []
+    for _ in range(rounds):
+        elapsed, findings = run_detector(compilation, detector)
+        timings.append(elapsed)
+    # Memory is traced in a separate run so tracing overhead does not skew the timings
+    tracemalloc.start()
+    run_detector(compilation, detector)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(statistics.median(timings), 6), "peak_kb": peak // 1024, "findings": sorted(findings)}
+
+
+def check_expectations(findings, expectation):
+    """List of problems where findings contradict an expected.json entry."""
+    problems = []
+    for text in expectation.get("expect", []):
+        if not any(text in finding for finding in findings):
+            problems.append(f"false negative: nothing matches '{text}'")
+    for text in expectation.get("absent", []):
+        matches = [finding for finding in findings if text in finding]
+        if matches:
+            problems.append(f"false positive: '{matches[0].splitlines()[0]}'")
+    return problems
+
+
+def compare(current, baseline):
+    """List of regressions of one measurement against its baseline entry."""
+    problems = []
+    allowed = baseline["seconds"] * (1 + TIME_TOLERANCE) + TIME_SLACK
+    if current["seconds"] > allowed:
+        problems.append(f"slower: {current['seconds'] * 1000:.1f} ms vs {baseline['seconds'] * 1000:.1f} ms")
+    if current["peak_kb"] > baseline["peak_kb"] * (1 + MEMORY_TOLERANCE) + 64:
+        problems.append(f"more memory: {current['peak_kb']} KB vs {baseline['peak_kb']} KB")
+    lost = sorted(set(baseline["findings"]) - set(current["findings"]))
+    if lost:
+        problems.append(f"{len(lost)} finding(s) lost, e.g. '{lost[0].splitlines()[0]}'")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark santara_plugin detectors and check them for regressions.')
+    parser.add_argument('--solc', default='solc', help='solc binary (default: solc on PATH)')
+    parser.add_argument('--rounds', type=int, default=ROUNDS, help=f'Timed runs per measurement (default: {ROUNDS})')
+    parser.add_argument('--sizes', default=','.join(GENERATED_SIZES),
+                        help=f'Generated fixture sizes to include (default: {",".join(GENERATED_SIZES)})')
+    parser.add_argument('--only', help='Only fixtures whose name contains this text')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help='Baseline file to compare against')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the measurements as the new baseline')
+    args = parser.parse_args()
+
+    with open(EXPECTED_FILE, 'r', encoding='utf-8') as f:
+        expected = json.load(f)
+    try:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    except OSError:
+        baseline = None
+        if not args.update_baseline:
+            # Without a baseline nothing is compared, so the run cannot pass
+            print(f"Error: no baseline at {args.baseline}; create and commit one with --update-baseline "
+                  f"(solc 0.8.19)")
+
+    detectors = plugin_detectors()
+    with tempfile.TemporaryDirectory() as folder:
+        fixtures = [(name, os.path.join(FIXTURES_DIR, name)) for name in sorted(os.listdir(FIXTURES_DIR))
+                    if name.endswith('.sol')]
+        for size in filter(None, args.sizes.split(',')):
+            source, expectation = generate_fixture(*GENERATED_SIZES[size])
+            name = f"generated_{size}.sol"
+            with open(os.path.join(folder, name), 'w', encoding='utf-8') as f:
+                f.write(source)
+            expected[name] = expectation
+            fixtures.append((name, os.path.join(folder, name)))
+        if args.only:
+            fixtures = [(name, path) for name, path in fixtures if args.only in name]
+
+        report, failures = {}, []
+        for name, path in fixtures:
+            try:
+                compilation, compile_seconds = compile_fixture(path, args.solc)
+            except Exception as e:  # crytic-compile raises InvalidCompilation, or OSError without solc
+                print(f"Error: could not compile {name} with {args.solc}: {e}")
+                sys.exit(2)
+            print(f"{name} ({os.path.getsize(path) // 1024} KB, compiled in {compile_seconds:.2f}s)")
+            report[name] = {}
+            for detector in detectors:
+                current = measure(compilation, detector, args.rounds)
+                report[name][detector.ARGUMENT] = current
+                problems = check_expectations(current["findings"], expected.get("*", {}).get(detector.ARGUMENT, {}))
+                problems += check_expectations(current["findings"], expected.get(name, {}).get(detector.ARGUMENT, {}))
+                previous = (baseline or {}).get(name, {}).get(detector.ARGUMENT)
+                if previous and not args.update_baseline:
+                    problems += compare(current, previous)
+                print(f"  {detector.ARGUMENT:16} {current['seconds'] * 1000:9.2f} ms  {current['peak_kb']:8} KB  "
+                      f"{len(current['findings']):4} finding(s)  {'FAIL' if problems else 'ok'}")
+                for problem in problems:
+                    print(f"      - {problem}")
+                failures += [(name, detector.ARGUMENT, problem) for problem in problems]
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.baseline}")
+    print(f"\n{len(fixtures)} fixture(s), {len(detectors)} detector(s): "
+          + (f"{len(failures)} problem(s)" if failures else "no problems"))
+    sys.exit(1 if failures or (baseline is None and not args.update_baseline) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,10 @@
+// SPDX-License-Identifier: MIT
+pragma solidity>=0.8.0;
+
+contract NoSpacePragma {
+    uint256 public value;
+
+    function set(uint256 newValue) public {
+        value = newValue;
+    }
+}
@@ -0,0 +1,11 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract CheckAfterSink {
+    address public owner = msg.sender;
+
+    function kill() public {
+        selfdestruct(payable(owner));
+        require(msg.sender == owner);
+    }
+}
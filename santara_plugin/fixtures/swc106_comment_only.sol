@@ -0,0 +1,11 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract CommentOnly {
+    string public note = "never call selfdestruct(this) here";
+
+    // selfdestruct(payable(msg.sender)) used to live in this function
+    function retire() public pure returns (bool) {
+        return true;
+    }
+}
@@ -0,0 +1,22 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract IfCheckAfterSink {
+    address public owner = msg.sender;
+
+    function kill(bool immediately) public {
+        if (immediately) {
+            selfdestruct(payable(owner));
+        }
+        if (msg.sender != owner) {
+            revert("not owner");
+        }
+    }
+
+    function close(bool immediately) public {
+        if (immediately) {
+            selfdestruct(payable(owner));
+            require(msg.sender == owner);
+        }
+    }
+}
@@ -0,0 +1,14 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract IfWithoutRevert {
+    address public owner = msg.sender;
+    uint256 public kills;
+
+    function kill() public {
+        if (msg.sender == owner) {
+            kills += 1;
+        }
+        selfdestruct(payable(owner));
+    }
+}
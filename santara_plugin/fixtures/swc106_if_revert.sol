@@ -0,0 +1,37 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract IfRevertGuard {
+    address public owner = msg.sender;
+    uint256 public closes;
+
+    error NotOwner(address account);
+
+    function kill() public {
+        if (msg.sender != owner) {
+            revert NotOwner(msg.sender);
+        }
+        selfdestruct(payable(owner));
+    }
+
+    function shutdown() public {
+        if (msg.sender != owner) revert("not owner");
+        selfdestruct(payable(owner));
+    }
+
+    function retire() public {
+        if (msg.sender != owner) {
+            return;
+        }
+        selfdestruct(payable(owner));
+    }
+
+    function close() public {
+        if (msg.sender == owner) {
+            closes += 1;
+        } else {
+            return;
+        }
+        selfdestruct(payable(owner));
+    }
+}
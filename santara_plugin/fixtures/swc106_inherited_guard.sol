@@ -0,0 +1,40 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+abstract contract Context {
+    function _msgSender() internal view returns (address) {
+        return msg.sender;
+    }
+}
+
+abstract contract Ownable is Context {
+    address private _owner = _msgSender();
+
+    error NotOwner(address account);
+
+    modifier onlyOwner() {
+        _checkOwner();
+        _;
+    }
+
+    function owner() public view returns (address) {
+        return _owner;
+    }
+
+    function _checkOwner() internal view {
+        if (owner() != _msgSender()) {
+            revert NotOwner(_msgSender());
+        }
+    }
+}
+
+contract InheritedGuard is Ownable {
+    function shutdown() external onlyOwner {
+        selfdestruct(payable(owner()));
+    }
+
+    function emergency() external {
+        _checkOwner();
+        selfdestruct(payable(owner()));
+    }
+}
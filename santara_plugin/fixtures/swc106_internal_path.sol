@@ -0,0 +1,19 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract InternalPath {
+    address public owner = msg.sender;
+
+    function close() external {
+        _destroy();
+    }
+
+    function closeAsOwner() external {
+        require(msg.sender == owner);
+        _destroy();
+    }
+
+    function _destroy() internal {
+        selfdestruct(payable(owner));
+    }
+}
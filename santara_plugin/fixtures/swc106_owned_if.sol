@@ -0,0 +1,18 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract OwnedIf {
+    address public owner = msg.sender;
+
+    modifier onlyOwner() {
+        if (msg.sender == owner) _;
+    }
+
+    function kill() public onlyOwner {
+        selfdestruct(payable(owner));
+    }
+
+    function close() public {
+        if (msg.sender == owner) selfdestruct(payable(owner));
+    }
+}
@@ -0,0 +1,8 @@
+// SPDX-License-Identifier: MIT
+pragma solidity 0.8.19;
+
+contract UnprotectedKill {
+    function kill() public {
+        selfdestruct(payable(msg.sender));
+    }
+}
@@ -0,0 +1,336 @@
+"""
+Call-graph and access-control index over Slither's IR, shared by
+santara_plugin detectors.
+
+For one compilation unit the index records, once:
+
+* the internal call graph (internal and library calls, both directions),
+* the sinks (selfdestruct/suicide, delegatecall) each function executes,
+* which nodes check ``msg.sender`` (directly or through helpers such as
+  ``_msgSender()``/``_checkOwner()``) and which modifiers do so before ``_``.
+  A check is a require/assert, or an ``if`` with a branch that always
+  reverts, throws or returns; code inside a branch of an ``if`` on
+  ``msg.sender`` is guarded by it as well.
+
+Reachability is then answered on demand and memoized: a sink is protected
+on a path when a sender check, a call to a checking helper or a checking
+modifier dominates the node leading to it.
+"""
+
+from weakref import WeakKeyDictionary
+
+from slither.core.cfg.node import NodeType
+from slither.core.declarations import Function, Modifier, SolidityVariableComposed
+from slither.slithir.operations import InternalCall, LibraryCall, LowLevelCall, SolidityCall
+
+SINK_CALLS = {  # Solidity builtins -> sink kind
+    "selfdestruct(address)": "selfdestruct",
+    "suicide(address)": "selfdestruct",
+}
+SINK_LOW_LEVEL_CALLS = {"delegatecall": "delegatecall"}  # Low-level call name -> sink kind
+
+MSG_SENDER = SolidityVariableComposed("msg.sender")
+
+
+def _stops(node):
+    """True if ``node`` ends execution: a return, a throw or a revert."""
+    if node.type in (NodeType.RETURN, NodeType.THROW):
+        return True
+    return any(isinstance(ir, SolidityCall) and ir.function.name.startswith("revert") for ir in node.irs)
+
+
+def _branch_stops(start):
+    """
+    True if every path from ``start``, the first node of an ``if`` branch,
+    reverts, throws or returns before leaving the branch.
+    """
+    # An empty branch goes straight to the END_IF
+    if start is None or start.type == NodeType.ENDIF:
+        return False
+    seen, pending = {start}, [start]
+    while pending:
+        node = pending.pop()
+        if _stops(node):
+            continue
+        if not node.sons:
+            return False
+        for son in node.sons:
+            # Nodes outside the branch are not dominated by its first node
+            if start not in son.dominators:
+                return False
+            if son not in seen:
+                seen.add(son)
+                pending.append(son)
+    return True
+
+
+class AnalysisIndex:
+    """
+    Per-compilation-unit facts about calls, sinks and msg.sender guards.
+
+    Functions are keyed by their Slither objects, so inherited copies are
+    analyzed in the contract they belong to.
+    """
+
+    def __init__(self, compilation_unit):
+        """
+        Args:
+            compilation_unit (SlitherCompilationUnit): Unit being analyzed
+        """
+        self.compilation_unit = compilation_unit
+        self.call_sites = {}  # function -> [(node, callee)]
+        self.callers = {}  # function -> set of calling functions
+        self.sink_nodes = {}  # function -> [(node, sink kind)]
+        self.sender_nodes = {}  # function -> nodes reading msg.sender
+        self._stopping_ifs = {}  # if node -> True if one of its branches always stops
+        self._reads_sender = {}
+        self._checks_sender = {}
+        self._guard_modifier = {}
+        self._reachable = {}
+        self._unprotected = {}
+
+        functions = set()
+        for contract in compilation_unit.contracts:
+            functions.update(contract.functions_and_modifiers)
+        for function in functions:
+            self._index_function(function)
+
+    def _index_function(self, function):
+        call_sites, sinks, sender_nodes = [], [], []
+        for node in function.nodes:
+            if MSG_SENDER in node.solidity_variables_read:
+                sender_nodes.append(node)
+            for ir in node.irs:
+                if isinstance(ir, SolidityCall):
+                    kind = SINK_CALLS.get(ir.function.name)
+                    if kind:
+                        sinks.append((node, kind))
+                elif isinstance(ir, LowLevelCall):
+                    kind = SINK_LOW_LEVEL_CALLS.get(str(ir.function_name))
+                    if kind:
+                        sinks.append((node, kind))
+                elif isinstance(ir, (InternalCall, LibraryCall)):
+                    # Modifier invocations are covered by function.modifiers
+                    if isinstance(ir.function, Function) and not isinstance(ir.function, Modifier):
+                        call_sites.append((node, ir.function))
+                        self.callers.setdefault(ir.function, set()).add(function)
+        self.call_sites[function] = call_sites
+        self.sink_nodes[function] = sinks
+        self.sender_nodes[function] = sender_nodes
+
+    def callees(self, function):
+        """Functions called internally (or through a library) by ``function``."""
+        return {callee for _, callee in self.call_sites.get(function, ())}
+
+    def callers_of(self, function):
+        """Functions that call ``function`` internally."""
+        return set(self.callers.get(function, ()))
+
+    def _memoized(self, cache, function, stack, compute, cut):
+        """
+        Depth-first evaluation of a transitive property over the call graph.
+
+        ``compute(function, stack)`` returns (result, complete). A call back
+        into a function still on the stack yields ``cut`` and marks the
+        results on the cycle incomplete; only complete results (and the
+        outermost one) are cached.
+        """
+        if function in cache:
+            return cache[function], True
+        if function in stack:
+            return cut, False
+        stack.append(function)
+        result, complete = compute(function, stack)
+        stack.pop()
+        if complete or not stack:
+            cache[function] = result
+        return result, complete
+
+    def reads_sender(self, function):
+        """True if ``function`` reads msg.sender itself or through a callee (e.g. ``_msgSender()``)."""
+        return self._memoized(self._reads_sender, function, [], self._compute_reads_sender, False)[0]
+
+    def _compute_reads_sender(self, function, stack):
+        if self.sender_nodes.get(function):
+            return True, True
+        complete = True
+        for callee in self.callees(function):
+            result, done = self._memoized(self._reads_sender, callee, stack, self._compute_reads_sender, False)
+            if result:
+                return True, True
+            complete = complete and done
+        return False, complete
+
+    def is_check(self, node):
+        """True if ``node`` can stop execution: a require/assert, or an ``if`` with a branch that always stops."""
+        if not node.contains_if(include_loop=False):
+            return node.contains_require_or_assert()
+        if node not in self._stopping_ifs:
+            self._stopping_ifs[node] = _branch_stops(node.son_true) or _branch_stops(node.son_false)
+        return self._stopping_ifs[node]
+
+    def _node_reads_sender(self, node):
+        """True if ``node`` reads msg.sender itself or through a call it makes."""
+        if MSG_SENDER in node.solidity_variables_read:
+            return True
+        return any(self.reads_sender(callee) for site, callee in self.call_sites.get(node.function, ())
+                   if site is node)
+
+    def is_sender_check(self, node):
+        """True if ``node`` is an if/require whose condition involves msg.sender."""
+        return self.is_check(node) and self._node_reads_sender(node)
+
+    def _gates(self, if_node, node):
+        """True if ``node`` lies inside a branch of ``if_node`` whose condition involves msg.sender."""
+        if not if_node.contains_if(include_loop=False):
+            return False
+        # The first node of a branch dominates the whole branch; an empty branch starts at the END_IF
+        inside = any(start is not None and start.type != NodeType.ENDIF and start in node.dominators
+                     for start in (if_node.son_true, if_node.son_false))
+        return inside and self._node_reads_sender(if_node)
+
+    def _guards_node(self, node):
+        """True if ``node`` checks msg.sender or calls a helper that always does."""
+        if self.is_sender_check(node):
+            return True
+        return any(self.checks_sender(callee) for site, callee in self.call_sites.get(node.function, ())
+                   if site is node)
+
+    def is_guarded(self, node):
+        """
+        True if a msg.sender check inside the node's function dominates it, or
+        the node sits in a branch of an ``if`` on msg.sender, as in
+        ``if (msg.sender == owner) _;``.
+        """
+        return any(self._guards_node(dominator) or self._gates(dominator, node)
+                   for dominator in node.dominators if dominator is not node)
+
+    def checks_sender(self, function):
+        """
+        True if every path through ``function`` checks msg.sender, like
+        ``Ownable._checkOwner()``, so calling it protects what follows.
+        """
+        return self._memoized(self._checks_sender, function, [], self._compute_checks_sender, False)[0]
+
+    def _compute_checks_sender(self, function, stack):
+        if any(self.is_guard_modifier(modifier) for modifier in function.modifiers):
+            return True, True
+        exits = [node for node in function.nodes if not node.sons or node.type == NodeType.RETURN]
+        if not exits:
+            return False, True
+        complete = True
+
+        def checks(node):
+            nonlocal complete
+            if self.is_sender_check(node):
+                return True
+            for site, callee in self.call_sites.get(function, ()):
+                if site is node:
+                    result, done = self._memoized(self._checks_sender, callee, stack,
+                                                  self._compute_checks_sender, False)
+                    complete = complete and done
+                    if result:
+                        return True
+            return False
+
+        return all(any(checks(dominator) for dominator in node.dominators) for node in exits), complete
+
+    def is_guard_modifier(self, modifier):
+        """True if the modifier checks msg.sender before every ``_`` placeholder."""
+        if modifier not in self._guard_modifier:
+            self._guard_modifier[modifier] = False  # Recursive modifiers are not guards
+            placeholders = [node for node in modifier.nodes if node.type == NodeType.PLACEHOLDER]
+            self._guard_modifier[modifier] = bool(placeholders) and all(
+                self.is_guarded(node) for node in placeholders)
+        return self._guard_modifier[modifier]
+
+    def guard_modifiers(self, function):
+        """Names of the modifiers of ``function`` that check msg.sender."""
+        return [modifier.name for modifier in function.modifiers if self.is_guard_modifier(modifier)]
+
+    def reachable_sinks(self, function):
+        """Sink kinds ``function`` can execute, directly or through internal calls, protected or not."""
+        return self._memoized(self._reachable, function, [], self._compute_reachable, frozenset())[0]
+
+    def _compute_reachable(self, function, stack):
+        result = {kind for _, kind in self.sink_nodes.get(function, ())}
+        complete = True
+        for callee in self.callees(function):
+            sinks, done = self._memoized(self._reachable, callee, stack, self._compute_reachable, frozenset())
+            result |= sinks
+            complete = complete and done
+        return frozenset(result), complete
+
+    def unprotected_sinks(self, function):
+        """
+        Sinks reachable from the start of ``function`` without passing a msg.sender check.
+
+        Args:
+            function (Function): Entry point or internal function
+
+        Returns:
+            dict: {sink kind: call path}, the path being the list of functions
+                from ``function`` to the one executing the sink
+        """
+        return self._memoized(self._unprotected, function, [], self._compute_unprotected, {})[0]
+
+    def _compute_unprotected(self, function, stack):
+        if any(self.is_guard_modifier(modifier) for modifier in function.modifiers):
+            return {}, True
+        result, complete = {}, True
+        for node, kind in self.sink_nodes.get(function, ()):
+            if kind not in result and not self.is_guarded(node):
+                result[kind] = [function]
+        for node, callee in self.call_sites.get(function, ()):
+            if self.is_guarded(node):
+                continue
+            sinks, done = self._memoized(self._unprotected, callee, stack, self._compute_unprotected, {})
+            complete = complete and done
+            for kind, path in sinks.items():
+                result.setdefault(kind, [function] + path)
+        return result, complete
+
+    def is_protected(self, function, kind=None):
+        """True if no sink (or no sink of ``kind``) is reachable from ``function`` unprotected."""
+        unprotected = self.unprotected_sinks(function)
+        return not unprotected if kind is None else kind not in unprotected
+
+    def exposed_entry_points(self, kind=None):
+        """
+        Public/external functions reaching a sink without a msg.sender guard.
+
+        Args:
+            kind (str): Only this sink kind, e.g. "selfdestruct" (None = any)
+
+        Returns:
+            list: (function, sink kind, call path) tuples
+        """
+        exposed = []
+        for contract in self.compilation_unit.contracts_derived:
+            for function in contract.functions_entry_points:
+                if function.is_constructor:
+                    continue
+                for sink, path in self.unprotected_sinks(function).items():
+                    if kind is None or sink == kind:
+                        exposed.append((function, sink, path))
+        return exposed
+
+
+_indexes = WeakKeyDictionary()  # compilation unit -> AnalysisIndex
+
+
+def get_analysis_index(compilation_unit):
+    """
+    Return the shared AnalysisIndex of a compilation unit, building it on first use.
+
+    Args:
+        compilation_unit (SlitherCompilationUnit): Unit being analyzed, e.g. ``detector.compilation_unit``
+
+    Returns:
+        AnalysisIndex: Index shared by every detector run on this unit
+    """
+    index = _indexes.get(compilation_unit)
+    if index is None:
+        index = AnalysisIndex(compilation_unit)
+        _indexes[compilation_unit] = index
+    return index
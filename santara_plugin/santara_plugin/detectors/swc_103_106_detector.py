@@ -1,5 +1,7 @@
 from slither.detectors.abstract_detector import AbstractDetector, DetectorClassification
-import re
+
+from ..analysis_index import get_analysis_index
+from ..source_scan import get_source_scan, is_floating
 
 class SWC103106Detector(AbstractDetector):
     ARGUMENT = 'swc103106'
@@ -15,21 +17,19 @@ class SWC103106Detector(AbstractDetector):
 
     def _detect(self):
         results = []
+        # Every source unit is scanned once and shared with the other detectors
+        scan = get_source_scan(self.compilation_unit)
         for contract in self.compilation_unit.contracts_derived:
-            source_code = contract.source_code
-            # SWC-103: Floating pragma detection
-            pragma_matches = re.findall(r'pragma solidity\s*([\^~><=]*[\d\.*]+)', source_code)
-            for pragma in pragma_matches:
-                if any(x in pragma for x in ['^', '>', '<', '*', '~']) or 'pragma solidity' in source_code and not re.search(r'pragma solidity\s*=?\s*\d+\.\d+\.\d+;', source_code):
-                    info = [f"SWC-103: Floating pragma detected in contract {contract.name}", contract]
-                    results.append(self.generate_result(info))
-            # SWC-106: Unprotected selfdestruct/suicide detection
-            for function in contract.functions:
-                function_code = function.source_code
-                if function_code:
-                    if re.search(r'selfdestruct\s*\(', function_code) or re.search(r'suicide\s*\(', function_code):
-                        # Check for access control (very basic: look for onlyOwner or similar)
-                        if not re.search(r'onlyOwner|onlyAdmin|require\s*\(', function_code):
-                            info = [f"SWC-106: Unprotected selfdestruct/suicide detected in function {function.name} of contract {contract.name}", function]
-                            results.append(self.generate_result(info))
+            # SWC-103: Floating pragma detection, from the pragmas of the contract's file
+            filename = contract.source_mapping.filename.absolute
+            if any(is_floating(version) for version in scan.pragmas(filename)):
+                info = [f"SWC-103: Floating pragma detected in contract {contract.name}", contract]
+                results.append(self.generate_result(info))
+        # SWC-106: Unprotected selfdestruct/suicide, from the shared call-graph index
+        index = get_analysis_index(self.compilation_unit)
+        for function, _, path in index.exposed_entry_points('selfdestruct'):
+            via = f" via {' -> '.join(f.name for f in path[1:])}" if len(path) > 1 else ""
+            info = [f"SWC-106: Unprotected selfdestruct/suicide reachable from function {function.name} "
+                    f"of contract {function.contract.name}{via}", function]
+            results.append(self.generate_result(info))
         return results
@@ -0,0 +1,107 @@
+"""
+Shared source scanning for santara_plugin detectors.
+
+Each source unit of a compilation unit is scanned once with a single
+precompiled pattern that recognises every token the detectors care about.
+Matches are stored as byte offsets, the same coordinates Slither uses in
+``source_mapping``, so a detector can ask "which pragmas does this file
+declare?" with a binary search instead of running regexes over the source
+text again. Questions about calls and control flow go to analysis_index.
+"""
+
+import re
+from bisect import bisect_left
+from collections import namedtuple
+from weakref import WeakKeyDictionary
+
+# Comments and string literals are matched first so tokens inside them are skipped
+TOKEN_PATTERN = re.compile(
+    rb"(?P<comment>//[^\n]*|/\*.*?\*/)"
+    rb"|(?P<string>\"(?:\\.|[^\"\\\n])*\"|'(?:\\.|[^'\\\n])*')"
+    rb"|(?P<pragma>\bpragma\s+solidity\s*(?P<version>[^;]+);)",
+    re.DOTALL,
+)
+KINDS = ("pragma",)  # Match kinds recorded for detectors
+EXACT_VERSION = re.compile(r"=?\s*\d+\.\d+\.\d+$")
+
+Match = namedtuple("Match", ["kind", "start", "end", "text"])
+
+
+class SourceScan:
+    """
+    Token matches for the source units of one compilation unit.
+
+    Files are scanned lazily on first query and never again.
+    """
+
+    def __init__(self, source_code):
+        """
+        Args:
+            source_code (dict): {absolute filename: source text}, as in ``SlitherCore.source_code``
+        """
+        self.source_code = source_code
+        self.files = {}  # filename -> {kind: (starts, matches)}
+
+    def _scan(self, filename):
+        scanned = self.files.get(filename)
+        if scanned is not None:
+            return scanned
+        found = {kind: [] for kind in KINDS}
+        source = self.source_code.get(filename)
+        if source:
+            for match in TOKEN_PATTERN.finditer(source.encode("utf8")):
+                kind = match.lastgroup if match.lastgroup != "version" else "pragma"
+                if kind not in found:
+                    continue
+                text = match.group("version") if kind == "pragma" else match.group(kind)
+                found[kind].append(Match(kind, match.start(), match.end(), text.decode("utf8").strip()))
+        scanned = {kind: ([m.start for m in matches], matches) for kind, matches in found.items()}
+        self.files[filename] = scanned
+        return scanned
+
+    def matches(self, filename, kind, start=0, end=None):
+        """
+        Matches of one kind starting inside a byte range of a file.
+
+        Args:
+            filename (str): Absolute filename, e.g. ``function.source_mapping.filename.absolute``
+            kind (str): One of KINDS
+            start (int): First byte of the range
+            end (int): Byte after the range (None = end of file)
+
+        Returns:
+            list: Match tuples in source order
+        """
+        starts, matches = self._scan(filename)[kind]
+        first = bisect_left(starts, start)
+        last = len(starts) if end is None else bisect_left(starts, end)
+        return matches[first:last]
+
+    def pragmas(self, filename):
+        """Solidity version constraints declared in a file."""
+        return [match.text for match in self.matches(filename, "pragma")]
+
+
+def is_floating(version):
+    """True unless a pragma version pins one exact compiler release (e.g. ``0.8.19`` or ``=0.8.19``)."""
+    return not EXACT_VERSION.match(version)
+
+
+_scans = WeakKeyDictionary()  # compilation unit -> SourceScan
+
+
+def get_source_scan(compilation_unit):
+    """
+    Return the shared SourceScan of a compilation unit, creating it on first use.
+
+    Args:
+        compilation_unit (SlitherCompilationUnit): Unit being analyzed, e.g. ``detector.compilation_unit``
+
+    Returns:
+        SourceScan: Scan shared by every detector run on this unit
+    """
+    scan = _scans.get(compilation_unit)
+    if scan is None:
+        scan = SourceScan(compilation_unit.core.source_code)
+        _scans[compilation_unit] = scan
+    return scan
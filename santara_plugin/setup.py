@@ -6,7 +6,7 @@ setup(
     packages=find_packages(),
     install_requires=["slither-analyzer"],
     entry_points={
-        "slither_plugins": [
+        "slither_analyzer.plugin": [
             "santara_plugin = santara_plugin:make_plugin"
         ]
     },
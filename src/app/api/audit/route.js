@@ -18,25 +18,20 @@ async function runSlitherAnalysis(chain, tokenAddress) {
   // Create output directory if it doesn't exist
   await fs.mkdir(outputDir, { recursive: true });
 
-  let chainName = '';
-  switch (chain) {
-    case "base":
-      chainName = "base";
-      break;
-    case "ethereum":
-      chainName = "mainnet";
-      break;
-    default:
-      chainName = "base";
-  }
-
-  const slitherCommand = `slither ${chainName}:${tokenAddress} --etherscan-apikey NCUY8QN5NU14K513XD4D6KN6DCU63B6NAR --json ${outputPath}`;
+  // audit_batch.py serves clones of already audited contracts from the result
+  // store and otherwise runs Slither with the santara_plugin detectors
+  const pythonCmd = process.env.PYTHON_COMMAND || "python3";
+  const slitherCommand = `${pythonCmd} audit_batch.py ${chain}:${tokenAddress} --workers 1 --timeout 300`;
 
   try {
     console.log(`Running Slither analysis: ${slitherCommand}`);
     const { stdout, stderr } = await execAsync(slitherCommand, {
-      cwd: process.cwd(),
-      timeout: 300000, // 5 minutes timeout
+      cwd: path.join(process.cwd(), "python"),
+      env: {
+        ...process.env,
+        ETHERSCAN_API_KEY: process.env.ETHERSCAN_API_KEY || "NCUY8QN5NU14K513XD4D6KN6DCU63B6NAR",
+      },
+      timeout: 310000, // 5 minutes for the job plus startup
       maxBuffer: 1024 * 1024 * 10, // 10MB buffer for large outputs
     });
 
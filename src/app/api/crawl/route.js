@@ -4,8 +4,8 @@ import { promisify } from "util";
 const execAsync = promisify(exec);
 
 const runPython = async () => {
-  const slitherCommand = `cd python && python crawler.py https://swcregistry.io/ https://swcregistry.io/docs/ --max-depth=2 --output=swc`;
-  const slitherCommand2 = `cd python && python crawler.py https://scs.owasp.org/SCWE/ https://scs.owasp.org/SCWE/ --max-depth=2 --output=swce`;
+  const slitherCommand = `cd python && python crawler.py https://swcregistry.io/ https://swcregistry.io/docs/ --max-depth=2 --output=swc --concurrency=4 --parse-workers=2 --delay=0.5 --resume --ingest`;
+  const slitherCommand2 = `cd python && python crawler.py https://scs.owasp.org/SCWE/ https://scs.owasp.org/SCWE/ --max-depth=2 --output=swce --concurrency=4 --parse-workers=2 --delay=0.5 --resume --ingest`;
   await Promise.all([
     execAsync(slitherCommand, {
       cwd: process.cwd(),
@@ -1,6 +1,7 @@
 import { NextResponse } from "next/server";
 import chains from "@/lib/chains";
 import { setCache, getCache } from "@/lib/cache";
+import { callHoneypotService, SCRIPT_TIMEOUT_MS } from "@/lib/honeypotService";
 
 const defaultChain = chains.filter((chain) => chain.name === "base");
 
@@ -23,20 +24,25 @@ export async function GET(request) {
   // Cache helpers
 
   const cacheDir = path.join(process.cwd(), "results", "honeypot", "getpairs");
-  const cacheKey = tokenAddress;
+  const cacheKey = `${tokenAddress}_${chain}`;
   const cached = getCache(cacheDir, cacheKey);
 
   if (cached) {
     return NextResponse.json(cached);
   }
 
-  let result = {};
+  let result = await callHoneypotService("get_pairs", { address: tokenAddress, chain_id: chain });
+  if (result) {
+    if (!result.error) setCache(cacheDir, cacheKey, result);
+    return NextResponse.json(result);
+  }
+
   try {
-    // Use bash.exe compatible command
+    // Service not running: use bash.exe compatible command
     const pyPath = path.join(process.cwd(), "python", "get_pairs_api.py");
     const pythonCmd = process.env.PYTHON_COMMAND || "python3";
     const cmd = `${pythonCmd} "${pyPath}" "${tokenAddress}" "${chain}"`;
-    const output = execSync(cmd, { encoding: "utf8" });
+    const output = execSync(cmd, { encoding: "utf8", timeout: SCRIPT_TIMEOUT_MS });
 
     result = JSON.parse(output);
     setCache(cacheDir, cacheKey, result);
@@ -1,6 +1,7 @@
 import { NextResponse } from "next/server";
 import chains from "@/lib/chains";
 import { setCache, getCache } from "@/lib/cache";
+import { callHoneypotService, SCRIPT_TIMEOUT_MS } from "@/lib/honeypotService";
 
 const defaultChain = chains.filter((chain) => chain.name === "base")?.[0];
 
@@ -37,14 +38,22 @@ export async function GET(request) {
     return NextResponse.json(cached);
   }
 
-  let result = {};
+  let result = await callHoneypotService("is_honeypot", { address, pair, chain_id: chain });
+  if (result) {
+    if (result.error) {
+      return NextResponse.json({ error: result.error }, { status: 500 });
+    }
+    setCache(cacheDir, cacheKey, result);
+    return NextResponse.json(result);
+  }
+
   try {
-    // Use bash.exe compatible command
+    // Service not running: use bash.exe compatible command
     const pyPath = path.join(process.cwd(), "python", "is_honey_pot.py");
     const pythonCmd = process.env.PYTHON_COMMAND || "python3";
     const cmd = `${pythonCmd} "${pyPath}" "${address}" "${pair}" "${chain}"`;
     console.log("Running command:", cmd);
-    const output = execSync(cmd, { encoding: "utf8" });
+    const output = execSync(cmd, { encoding: "utf8", timeout: SCRIPT_TIMEOUT_MS });
     result = JSON.parse(output);
 
     console.log("Python script output:", result);
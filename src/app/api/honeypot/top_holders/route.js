@@ -1,13 +1,14 @@
 import { NextResponse } from "next/server";
 import chains from "@/lib/chains";
 import { setCache, getCache } from "@/lib/cache";
+import { callHoneypotService, SCRIPT_TIMEOUT_MS } from "@/lib/honeypotService";
 
 const defaultChain = chains.filter((chain) => chain.name === "base");
 
 export async function GET(request) {
   const { searchParams } = new URL(request.url);
   const address = searchParams.get("tokenAddress");
-  const chain = searchParams.get("chain") ?? defaultChain?.id;
+  const chain = searchParams.get("chain") ? chains.find(c => c.name === searchParams.get("chain"))?.id : defaultChain[0]?.id;
 
   if (!address) {
     return NextResponse.json(
@@ -29,13 +30,18 @@ export async function GET(request) {
     return NextResponse.json(cached);
   }
 
-  let result = {};
+  let result = await callHoneypotService("top_holders", { address, chain_id: chain });
+  if (result) {
+    if (!result.error) setCache(cacheDir, cacheKey, result);
+    return NextResponse.json(result);
+  }
+
   try {
-    // Use bash.exe compatible command
+    // Service not running: use bash.exe compatible command
     const pyPath = path.join(process.cwd(), "python", "top_holders.py");
     const pythonCmd = process.env.PYTHON_COMMAND || "python3";
-    const cmd = `${pythonCmd} "${pyPath}" "${address}"`;
-    const output = execSync(cmd, { encoding: "utf8" });
+    const cmd = `${pythonCmd} "${pyPath}" "${address}" "${chain}"`;
+    const output = execSync(cmd, { encoding: "utf8", timeout: SCRIPT_TIMEOUT_MS });
     result = JSON.parse(output);
     setCache(cacheDir, cacheKey, result);
   } catch (err) {
@@ -63,7 +63,7 @@ export const vectorReadFile = {
     console.log(`Reading file from vector database: ${file}`);
     let result_path = file;
     // Normalize Windows absolute path to POSIX for Node.js if needed
-    if (result_path.startsWith("..\\")) {
+    if (result_path.startsWith("..\\") || result_path.startsWith("../")) {
       result_path = result_path.substring(3);
       result_path = './' + result_path;
     }
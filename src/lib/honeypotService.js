@@ -0,0 +1,28 @@
+// Client for python/honeypot_service.py, the long-running honeypot.is helper.
+// Routes try it first and fall back to spawning the python scripts.
+const SERVICE_URL = process.env.HONEYPOT_SERVICE_URL || "http://127.0.0.1:8787";
+const SERVICE_TIMEOUT_MS = 60 * 1000;
+// Upper bound for the python script fallback; the scripts retry slow or throttled calls themselves
+export const SCRIPT_TIMEOUT_MS = 3 * 60 * 1000;
+
+/**
+ * Call a honeypot service method.
+ * @param {string} method - "get_pairs", "top_holders" or "is_honeypot".
+ * @param {object} params - Query parameters (address, pair, chain_id).
+ * @returns {Promise<object|null>} - The method result, or null if the service is not running.
+ */
+export async function callHoneypotService(method, params) {
+  const query = new URLSearchParams();
+  for (const [key, value] of Object.entries(params)) {
+    if (value !== undefined && value !== null) query.set(key, String(value));
+  }
+  try {
+    const res = await fetch(`${SERVICE_URL}/${method}?${query}`, {
+      cache: "no-store",
+      signal: AbortSignal.timeout(SERVICE_TIMEOUT_MS),
+    });
+    return await res.json();
+  } catch (e) {
+    return null;
+  }
+}
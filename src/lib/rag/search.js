@@ -1,15 +1,52 @@
 import { PrismaClient } from "@prisma/client";
+import { execFile } from "child_process";
+import path from "path";
+import { promisify } from "util";
 
 const prisma = new PrismaClient();
+const execFileAsync = promisify(execFile);
+const SEARCH_TIMEOUT_MS = 10 * 1000;
+
+/**
+ * BM25 top-k search over crawl_vectors.db through python/crawl_search.py.
+ * @param {string} query - One or more search terms.
+ * @param {number} k - The number of documents to return.
+ * @returns {Promise<Array>} - Matching documents shaped like file vector records, best first.
+ */
+export async function searchBM25(query, k = 5) {
+  const pythonCmd = process.env.PYTHON_COMMAND || "python3";
+  const { stdout } = await execFileAsync(
+    pythonCmd,
+    ["crawl_search.py", query, "-k", String(k), "--json"],
+    { cwd: path.join(process.cwd(), "python"), timeout: SEARCH_TIMEOUT_MS }
+  );
+  return JSON.parse(stdout).map((doc) => ({
+    id: doc.id,
+    filePath: doc.file_path,
+    fileName: doc.file_path.split(/[\\/]/).pop(),
+    title: doc.title,
+    source: doc.url,
+    snippet: doc.snippet,
+    value: doc.score,
+  }));
+}
 
 
 /**
  * Search for markdown files whose vectors contain a given word, returning the top-k by value (e.g., tfidf).
+ * Uses the BM25 index in crawl_vectors.db and falls back to scanning the stored vectors
+ * when the index is unavailable or has no match.
  * @param {string} word - The word to search for in the vectors.
  * @param {number} k - The number of top results to return.
  * @returns {Promise<Array>} - Array of top-k matching file vector records, each with the value for the word.
  */
 export async function searchTopKByWord(word, k = 5) {
+  try {
+    const results = await searchBM25(word, k);
+    if (results.length > 0) return results;
+  } catch (e) {
+    console.error("BM25 search failed, scanning file vectors:", e.message);
+  }
   const lowerWord = word.toLowerCase();
   const all = await prisma.fileVector.findMany();
   // Collect files with the word and their value (e.g., tfidf)
@@ -47,6 +47,15 @@ async function processDir(DIR) {
   const files = fs.readdirSync(DIR).filter(f => f.endsWith(".md"));
   for (const fileName of files) {
     const filePath = path.join(DIR, fileName);
+    // The crawler leaves unchanged pages untouched, so skip files that are
+    // older than their stored vector
+    const existing = await prisma.fileVector.findUnique({
+      where: { filePath },
+      select: { updatedAt: true },
+    });
+    if (existing && existing.updatedAt >= fs.statSync(filePath).mtime) {
+      continue;
+    }
     const text = fs.readFileSync(filePath, "utf-8");
     const title = extractTitle(text);
     const vectors = vectorizeText(text);